@@ -37,6 +37,13 @@ UNDEFINED = Undefined()
 
 
 class Card(_Verify):
+    # Cards are by far the most numerous objects created when reading headers,
+    # so they do not have an instance __dict__
+    __slots__ = ('_keyword', '_value', '_comment', '_image', '_verified',
+                 '_hierarch', '_invalid', '_field_specifier', '_rawkeyword',
+                 '_rawvalue', '_modified', '_valuestring', '_valuemodified',
+                 '_value_indicator')
+
     length = CARD_LENGTH
     """The length of a Card image; should always be 80 for valid FITS files."""
 
@@ -144,10 +151,6 @@ class Card(_Verify):
 
     _commentary_keywords = set(['', 'COMMENT', 'HISTORY', 'END'])
 
-    # The default value indicator; may be changed if required by a convention
-    # (namely HIERARCH cards)
-    _value_indicator = VALUE_INDICATOR
-
     def __init__(self, keyword=None, value=None, comment=None, **kwargs):
         # For backwards compatibility, support the 'key' keyword argument:
         if keyword is None and 'key' in kwargs:
@@ -172,6 +175,10 @@ class Card(_Verify):
         # any recognized non-standard conventions, this will be True
         self._invalid = False
 
+        # The default value indicator; may be changed if required by a
+        # convention (namely HIERARCH cards)
+        self._value_indicator = VALUE_INDICATOR
+
         self._field_specifier = None
 
         # These are used primarily only by RVKCs
@@ -206,6 +213,14 @@ class Card(_Verify):
     def __getitem__(self, index):
         return (self.keyword, self.value, self.comment)[index]
 
+    def __getstate__(self):
+        # Required for pickling with protocols < 2, since there is no __dict__
+        return dict((attr, getattr(self, attr)) for attr in self.__slots__)
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     @property
     def keyword(self):
         """Returns the keyword name parsed from the card image."""
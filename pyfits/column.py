@@ -507,6 +507,13 @@ class Column(NotifierMixin):
             scaling has already been applied (the array stored on the column
             object will then be converted back to its storage values).
 
+            The data for a variable-length array (P or Q format) column may
+            also be given as a ``(values, offsets)`` tuple of arrays (as
+            returned by `FITS_rec.ragged_field`), where the array in row
+            ``i`` is ``values[offsets[i]:offsets[i + 1]]``.  This avoids
+            creating an array object for each row, and the arrays are then
+            written to the heap all at once.
+
         ascii : bool, optional
             set `True` if this describes a column for an ASCII table; this
             may be required to disambiguate the column format
@@ -554,6 +561,12 @@ class Column(NotifierMixin):
         # pseudo-unsigned int data
         self._pseudo_unsigned_ints = False
 
+        if isinstance(recformat, _FormatP) and _is_ragged_pair(array):
+            if recformat.dtype == 'a':
+                raise ValueError('Character array columns can not be given '
+                                 'as (values, offsets) pairs.')
+            array = _RaggedVLF(array[0], array[1], dtype=recformat.dtype)
+
         # if the column data is not ndarray, make it to be one, i.e.
         # input arrays can be just list or tuple, not required to be ndarray
         # does not include Object array because there is no guarantee
@@ -1106,7 +1119,10 @@ class Column(NotifierMixin):
                         fsize = dims[-1]
                     else:
                         fsize = np.dtype(format.recformat).itemsize
-                    return chararray.array(array, itemsize=fsize)
+                    # Like the other formats, an array that already has the
+                    # right type is not copied
+                    return chararray.array(array, itemsize=fsize,
+                                           copy=False)
                 else:
                     return _convert_array(array, np.dtype(format.recformat))
             elif 'L' in format:
@@ -1117,6 +1133,14 @@ class Column(NotifierMixin):
                     return np.where(array == 0, ord('F'), ord('T'))
             elif 'X' in format:
                 return _convert_array(array, np.dtype('uint8'))
+            elif (array.dtype.kind == 'f' and
+                    np.dtype(format.recformat).kind in 'iu' and
+                    (self.bscale not in (None, 1) or
+                     self.bzero not in (None, 0))):
+                # Floating point physical values of a scaled integer column
+                # would be truncated by converting them to the integer type;
+                # they are only scaled to integers when the table is written
+                return array
             else:
                 # Preserve byte order of the original array for now; see #77
                 numpy_format = array.dtype.byteorder + format.recformat
@@ -1822,6 +1846,238 @@ class _VLF(np.ndarray):
         self.max = max(self.max, len(value))
 
 
+class _PackedBits(np.ndarray):
+    """
+    Bit array (X format) column that is kept packed, eight bits to a byte, as
+    it is stored in the table.
+
+    The array itself is a view of the raw bytes of the column; indexing it
+    returns the bits of the requested rows unpacked to a Boolean array, so
+    that only the rows that are accessed are ever unpacked.  Likewise,
+    assigning to it packs the new bits directly into the table.  Note that
+    this means that modifying an unpacked row returned by indexing does not
+    modify the table; assign to ``column[row, bit]`` instead.
+
+    Its ``shape`` is that of the unpacked bits, and ufuncs (including
+    comparisons) operate on the unpacked bits, so that it behaves like the
+    Boolean array of an unpacked column; use ``column[:]`` to get that array
+    itself.
+    """
+
+    def __new__(cls, field, repeat):
+        self = field.view(cls)
+        self.repeat = repeat
+        return self
+
+    def __array_finalize__(self, obj):
+        self.repeat = getattr(obj, 'repeat', None)
+
+    @property
+    def shape(self):
+        shape = np.ndarray.shape.__get__(self)
+        if self.repeat is None:
+            return shape
+        return shape[:-1] + (self.repeat,)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(arr[:] if isinstance(arr, _PackedBits) else arr
+                       for arr in inputs)
+
+        # Results for packed outputs (as from in-place operators) are packed
+        # back into them once computed
+        outputs = kwargs.get('out', ())
+        if any(isinstance(arr, _PackedBits) for arr in outputs):
+            kwargs['out'] = tuple(None if isinstance(arr, _PackedBits)
+                                  else arr for arr in outputs)
+            if all(arr is None for arr in kwargs['out']):
+                del kwargs['out']
+
+        results = getattr(ufunc, method)(*inputs, **kwargs)
+        if not outputs:
+            return results
+
+        if not isinstance(results, tuple):
+            results = (results,)
+        for out, result in zip(outputs, results):
+            if isinstance(out, _PackedBits):
+                out[...] = result
+        results = tuple(result if out is None else out
+                        for out, result in zip(outputs, results))
+        return results[0] if len(results) == 1 else results
+
+    def __getitem__(self, key):
+        rows, bits = self._split_key(key)
+        packed = self.view(np.ndarray)[rows]
+        unpacked = np.unpackbits(packed, axis=-1)[..., :self.repeat]
+        unpacked = unpacked.view(np.bool_)
+        if bits:
+            return unpacked[(Ellipsis,) + bits]
+        return unpacked
+
+    def __setitem__(self, key, value):
+        rows, bits = self._split_key(key)
+        unpacked = self[rows]
+        unpacked[(Ellipsis,) + bits] = value
+        self.view(np.ndarray)[rows] = np.packbits(unpacked, axis=-1)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__,
+                           np.array2string(self[:], separator=', '))
+
+    @staticmethod
+    def _split_key(key):
+        """
+        Split an index into the part selecting rows, and any part selecting
+        bits within a row.
+        """
+
+        if isinstance(key, tuple):
+            return key[0], key[1:]
+        return key, ()
+
+
+class _RaggedVLF(np.ndarray):
+    """
+    Variable length field object whose arrays are slices of a single flat
+    array of values, rather than separate array objects.
+
+    The array itself holds the start and stop indices into ``values`` of the
+    array in each row.
+    """
+
+    def __new__(cls, values, offsets, dtype):
+        """
+        Parameters
+        ----------
+        values
+            a flat array of the arrays of all the rows, end to end
+
+        offsets
+            the offset of each row's array into ``values``, followed by the
+            end of the last row's array
+        """
+
+        values = np.asarray(values)
+        offsets = np.asarray(offsets, dtype=np.int64)
+
+        if (values.ndim != 1 or offsets.ndim != 1 or not len(offsets) or
+                offsets[0] < 0 or offsets[-1] > len(values) or
+                (offsets[1:] < offsets[:-1]).any()):
+            raise ValueError(
+                'Inconsistent variable length array values and offsets: '
+                'offsets must be increasing indices into a flat array of '
+                'values, with one more offset than there are rows.')
+
+        bounds = np.empty((len(offsets) - 1, 2), dtype=np.int64)
+        bounds[:, 0] = offsets[:-1]
+        bounds[:, 1] = offsets[1:]
+
+        self = bounds.view(cls)
+        self.values = values
+        self.element_dtype = dtype
+        self.max = int(self._lengths().max()) if len(self) else 0
+        return self
+
+    def __array_finalize__(self, obj):
+        if obj is None:
+            return
+        self.values = getattr(obj, 'values', None)
+        self.element_dtype = getattr(obj, 'element_dtype', None)
+        self.max = getattr(obj, 'max', 0)
+
+    def __getitem__(self, key):
+        if _is_int(key):
+            start, stop = self.view(np.ndarray)[key]
+            return self.values[start:stop]
+
+        return np.ndarray.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        """
+        The arrays in each row share the same flat array, so they may only be
+        assigned to element by element, without changing their length.
+        """
+
+        if not _is_int(key):
+            raise ValueError('Rows of a variable length array column given '
+                             'as values and offsets must be assigned to one '
+                             'at a time.')
+
+        row = self[key]
+        value = np.asarray(value)
+        if value.shape != row.shape:
+            raise ValueError('Rows of a variable length array column given '
+                             'as values and offsets can not be resized.')
+        row[:] = value
+
+    def __iter__(self):
+        for start, stop in np.ndarray.tolist(self):
+            yield self.values[start:stop]
+
+    def __repr__(self):
+        if len(self) > 6:
+            rows = ([repr(row) for row in self[:3]] + ['...'] +
+                    [repr(row) for row in self[-3:]])
+        else:
+            rows = [repr(row) for row in self]
+        return '%s([%s])' % (self.__class__.__name__, ', '.join(rows))
+
+    def __deepcopy__(self, memo):
+        values, offsets = self._flatten()
+        return _RaggedVLF(values.copy(), offsets, dtype=self.element_dtype)
+
+    def _lengths(self):
+        """The length of the array in each row."""
+
+        bounds = self.view(np.ndarray)
+        return bounds[:, 1] - bounds[:, 0]
+
+    def _flatten(self):
+        """
+        Return the arrays of all the rows end to end in a single flat array,
+        and the offsets of each row's array into it (with a final offset
+        giving its total length).
+
+        The flat array is a view of ``values`` if the rows are already stored
+        in it one after the other.
+        """
+
+        bounds = self.view(np.ndarray)
+        lengths = bounds[:, 1] - bounds[:, 0]
+        offsets = np.zeros(len(bounds) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        if not offsets[-1]:
+            return self.values[:0], offsets
+
+        if (bounds[1:, 0] == bounds[:-1, 1]).all():
+            start = bounds[0, 0]
+            return self.values[start:start + offsets[-1]], offsets
+
+        index = np.repeat(bounds[:, 0] - offsets[:-1], lengths)
+        index += np.arange(offsets[-1])
+        return self.values[index], offsets
+
+
+def _is_ragged_pair(array):
+    """
+    Whether ``array`` is the ``(values, offsets)`` form of a variable length
+    array column.
+    """
+
+    return (isinstance(array, tuple) and len(array) == 2 and
+            all(isinstance(arr, np.ndarray) for arr in array) and
+            array[1].dtype.kind in 'iu')
+
+
 def _get_index(names, key):
     """
     Get the index of the ``key`` in the ``names`` list.
@@ -1884,13 +2140,7 @@ def _unwrapx(input, output, repeat):
         number of bits
     """
 
-    pow2 = np.array([128, 64, 32, 16, 8, 4, 2, 1], dtype='uint8')
-    nbytes = ((repeat - 1) // 8) + 1
-    for i in range(nbytes):
-        _min = i * 8
-        _max = min((i + 1) * 8, repeat)
-        for j in range(_min, _max):
-            output[..., j] = np.bitwise_and(input[..., i], pow2[j - i * 8])
+    output[...] = np.unpackbits(input, axis=-1)[..., :repeat]
 
 
 def _wrapx(input, output, repeat):
@@ -1909,19 +2159,8 @@ def _wrapx(input, output, repeat):
         number of bits
     """
 
-    output[...] = 0  # reset the output
-    nbytes = ((repeat - 1) // 8) + 1
-    unused = nbytes * 8 - repeat
-    for i in range(nbytes):
-        _min = i * 8
-        _max = min((i + 1) * 8, repeat)
-        for j in range(_min, _max):
-            if j != _min:
-                np.left_shift(output[..., i], 1, output[..., i])
-            np.add(output[..., i], input[..., j], output[..., i])
-
-    # shift the unused bits
-    np.left_shift(output[..., i], unused, output[..., i])
+    # packbits pads the unused bits at the end of the last byte with zeros
+    output[...] = np.packbits(np.asarray(input)[..., :repeat], axis=-1)
 
 
 def _makep(array, descr_output, format, nrows=None):
@@ -1959,6 +2198,9 @@ def _makep(array, descr_output, format, nrows=None):
         nrows = len(array)
     n = min(len(array), nrows)
 
+    if isinstance(array, _RaggedVLF):
+        return _makep_ragged(array[:n], descr_output, format, nrows)
+
     data_output = _VLF([None] * nrows, dtype=format.dtype)
 
     if format.dtype == 'a':
@@ -2317,3 +2559,32 @@ def _convert_ascii_format(format, reverse=False):
             recformat += str(width)
 
         return recformat
+
+
+def _makep_ragged(array, descr_output, format, nrows):
+    """
+    Construct the P (or Q) format column array for input given as a
+    `_RaggedVLF`; see `_makep`.  The arrays of all the rows are copied into
+    a single new flat array of values, and the descriptors for all the rows
+    are filled in at once.
+    """
+
+    values, offsets = array._flatten()
+    values = np.array(values, dtype=format.dtype)
+    lengths = offsets[1:] - offsets[:-1]
+
+    if nrows > len(array):
+        # Rows below the input data are filled with zeros, as many as the
+        # longest input array
+        nfill = nrows - len(array)
+        fill = int(lengths.max()) if len(lengths) else 0
+        values = np.concatenate(
+            [values, np.zeros(nfill * fill, dtype=values.dtype)])
+        lengths = np.concatenate([lengths, np.repeat(np.int64(fill), nfill)])
+        offsets = np.zeros(nrows + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+    descr_output[:nrows, 0] = lengths
+    descr_output[:nrows, 1] = offsets[:-1] * values.dtype.itemsize
+
+    return _RaggedVLF(values, offsets, dtype=format.dtype)
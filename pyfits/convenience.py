@@ -52,23 +52,30 @@ explanation of all the different formats.
 """
 
 
+import fnmatch
+import glob
 import os
+import warnings
 
 import numpy as np
 
 from .extern.six import string_types
 
+from .card import Card
 from .file import FILE_MODES, _File
 from .hdu.base import _BaseHDU, _ValidHDU
-from .hdu.hdulist import fitsopen
+from .hdu.hdulist import fitsopen, _HDU_INDEX_CACHE
 from .hdu.image import PrimaryHDU, ImageHDU
-from .hdu.table import BinTableHDU
-from .header import Header
-from .util import fileobj_closed, fileobj_name, fileobj_mode, _is_int
+from .hdu.table import BinTableHDU, _TableBaseHDU
+from .header import Header, _parse_selected_cards
+from .py3compat import OrderedDict
+from .util import (fileobj_closed, fileobj_name, fileobj_mode, _is_int,
+                   _pad_length, _map_parallel)
 
 
-__all__ = ['getheader', 'getdata', 'getval', 'setval', 'delval', 'writeto',
-           'append', 'update', 'info', 'tabledump', 'tableload']
+__all__ = ['getheader', 'scanheader', 'harvest_headers', 'getdata', 'getval',
+           'setval', 'delval', 'writeto', 'append', 'update', 'info',
+           'build_hdu_index', 'tabledump', 'tableload']
 
 
 def getheader(filename, *args, **kwargs):
@@ -101,6 +108,192 @@ def getheader(filename, *args, **kwargs):
     return header
 
 
+def scanheader(filename, *args, **kwargs):
+    """
+    Get the header from an extension of a FITS file by scanning the file's
+    header blocks directly, rather than opening the file as an `HDUList`.
+
+    Only the header blocks of each HDU up to and including the requested HDU
+    are read; the data of the preceding HDUs is skipped over without being
+    read, and no HDU objects are created.  This is much faster than
+    `getheader` when reading the headers of a large number of files.
+
+    Unlike `getheader` the header is returned exactly as it is stored in the
+    file.  For example, for a compressed image HDU this is the header of the
+    binary table containing the compressed image, and the ``EXTEND`` keyword
+    is not added to primary headers that lack it.
+
+    Parameters
+    ----------
+    filename : file path, file object, or file like object
+        File to get header from.  If an opened file object, its mode
+        must be one of the following rb, rb+, or ab+).
+
+    ext, extname, extver
+        The rest of the arguments are for extension specification.  See the
+        `getdata` documentation for explanations/examples.  If more than one
+        extension matches the given name (and version), the first one is
+        used.
+
+    keywords : iterable of str, optional
+        If given, the returned header contains only the cards with these
+        keywords (including all cards with a repeated keyword such as
+        ``HISTORY``), and the other cards in the header are not parsed.
+
+    ignore_missing_end : bool, optional
+        Do not raise an exception if a header is missing its END card
+        (default: `False`).
+
+    Returns
+    -------
+    header : `Header` object
+    """
+
+    keywords = kwargs.pop('keywords', None)
+    ignore_missing_end = kwargs.pop('ignore_missing_end', False)
+    ext = _parse_ext_args(args, kwargs)
+
+    if kwargs:
+        raise TypeError('scanheader() got unexpected keyword argument(s): %s'
+                        % ', '.join(sorted(kwargs)))
+
+    if isinstance(keywords, string_types):
+        keywords = [keywords]
+
+    mode, closed = _get_file_mode(filename)
+    fileobj = _File(filename, mode=mode)
+
+    try:
+        header_str = _scan_header_string(fileobj, ext, ignore_missing_end)
+    finally:
+        if closed:
+            fileobj.close()
+
+    if keywords is None:
+        return Header.fromstring(header_str)
+    else:
+        return Header._fromcards(_parse_selected_cards(header_str, keywords))
+
+
+def harvest_headers(filenames, keywords, ext=0, jobs=1):
+    """
+    Read the values of a set of keywords from the headers of many FITS files,
+    optionally processing the files in parallel, and return the values as
+    columns (one row per file and extension, one column per keyword).
+
+    The headers are read with `scanheader`, so only the header blocks up to
+    each requested extension are read, and only the requested keywords are
+    parsed.  As with `scanheader` the headers are returned as they are stored
+    in the file (e.g. the binary table header for compressed image HDUs).
+
+    Parameters
+    ----------
+    filenames : str or list of str
+        Paths of the FITS files to read; each path may also be a glob-style
+        pattern matching any number of files.
+
+    keywords : list of str
+        The keywords to read.  If a keyword occurs more than once in a header
+        only its first value is returned.
+
+    ext : int, str, tuple, or list, optional
+        The extension(s) to read from each file, each given as an extension
+        number, an extension name, or an ``(extname, extver)`` tuple.  A list
+        may be given to read multiple extensions from each file (default: the
+        primary HDU).  Extensions not found in a file are skipped with a
+        warning.
+
+    jobs : int, optional
+        The number of worker processes to read the files with; by default
+        (``jobs=1``) the files are read in the current process.  If `None` or
+        0 the number of CPUs is used.  The usual restrictions of the
+        `multiprocessing` module apply, e.g. on Windows this must be called
+        from a script guarded by ``if __name__ == '__main__'``.
+
+    Returns
+    -------
+    columns : `~collections.OrderedDict`
+        A mapping of column names to lists of values.  The ``'FILENAME'`` and
+        ``'EXT'`` columns give the file and extension of each row, followed by
+        one column for each keyword (using the upper-case keyword as the
+        column name).  The values of keywords missing from a header are
+        `None`.
+
+    Examples
+    --------
+    >>> cols = pyfits.harvest_headers('/data/*.fits', ['OBJECT', 'EXPTIME'],
+    ...                               ext=[0, ('SCI', 1)], jobs=8)
+    >>> cols['OBJECT']
+    """
+
+    if isinstance(filenames, string_types):
+        filenames = [filenames]
+
+    paths = []
+    for filename in filenames:
+        if glob.has_magic(filename):
+            paths.extend(sorted(glob.glob(filename)))
+        else:
+            paths.append(filename)
+
+    if not isinstance(ext, list):
+        ext = [ext]
+
+    exts = [_parse_ext_args((key,), {}) for key in ext]
+    keywords = [Card.normalize_keyword(keyword) for keyword in keywords]
+
+    columns = OrderedDict()
+    columns['FILENAME'] = []
+    columns['EXT'] = []
+    for keyword in keywords:
+        columns[keyword] = []
+
+    results = _map_parallel(_harvest_file,
+                            ((path, exts, keywords) for path in paths),
+                            jobs=jobs, chunksize=16)
+
+    for rows, messages in results:
+        for message in messages:
+            warnings.warn(message)
+
+        for row in rows:
+            for column, value in zip(columns.values(), row):
+                column.append(value)
+
+    return columns
+
+
+def _harvest_file(args):
+    """
+    Implements `harvest_headers` for a single file; this is a separate
+    module-level function so that it can be called in worker processes.
+
+    Returns a list of rows for each extension found in the file, and a list
+    of warning messages.
+    """
+
+    filename, exts, keywords = args
+    rows = []
+    messages = []
+
+    for ext in exts:
+        try:
+            header = scanheader(filename, ext, keywords=keywords)
+        except (KeyError, IndexError):
+            messages.append('%s: Extension %r not found.' % (filename, ext))
+            continue
+        except (IOError, ValueError) as exc:
+            messages.append('%s: %s' % (filename, exc))
+            break
+
+        row = [filename, ext]
+        for keyword in keywords:
+            row.append(header.get(keyword))
+        rows.append(row)
+
+    return rows, messages
+
+
 def getdata(filename, *args, **kwargs):
     """
     Get the data from an extension of a FITS file (and optionally the
@@ -159,6 +352,13 @@ def getdata(filename, *args, **kwargs):
 
            data.view(view)
 
+    columns : sequence of str, optional
+        When given, the extension must be a table, and only the named columns
+        of the table are read and returned (see
+        `BinTableHDU.read_columns`)::
+
+            >>> getdata('in.fits', 1, columns=['ra', 'dec'])
+
     kwargs
         Any additional keyword arguments to be passed to `pyfits.open`.
 
@@ -176,14 +376,15 @@ def getdata(filename, *args, **kwargs):
     lower = kwargs.pop('lower', None)
     upper = kwargs.pop('upper', None)
     view = kwargs.pop('view', None)
+    columns = kwargs.pop('columns', None)
 
     hdulist, extidx = _getext(filename, mode, *args, **kwargs)
     hdu = hdulist[extidx]
-    data = hdu.data
+    data = _read_data(hdu, columns)
     if data is None and extidx == 0:
         try:
             hdu = hdulist[1]
-            data = hdu.data
+            data = _read_data(hdu, columns)
         except IndexError:
             raise IndexError('No data in this HDU.')
     if data is None:
@@ -244,6 +445,12 @@ def getval(filename, keyword, *args, **kwargs):
     Returns
     -------
     keyword value : string, integer, or float
+
+    See Also
+    --------
+    scanheader : Faster when reading values from a large number of files;
+        ``scanheader(filename, ext, keywords=[keyword])[keyword]`` reads only
+        the header blocks up to the requested HDU.
     """
 
     if 'do_not_scale_image_data' not in kwargs:
@@ -558,6 +765,74 @@ def info(filename, output=None, **kwargs):
     return ret
 
 
+def build_hdu_index(path, pattern='*.fits', **kwargs):
+    """
+    Build, or refresh, the in-memory index of HDU offsets for a FITS file, or
+    for all FITS files in a directory.
+
+    The index records the header offset, data offset, data size, name, version
+    and ``XTENSION`` of each HDU in a file, keyed on the file's path,
+    modification time and size.  When the file is later opened with
+    `pyfits.open` (with the default ``lazy_load_hdus=True``), HDUs may be
+    accessed by index or name (for example ``hdul['SCI', 417]``) by seeking
+    directly to them, without reading any of the preceding headers.  An index
+    is also recorded automatically whenever all the HDUs in a file have been
+    read, so this function is only needed to build indices ahead of time.
+    Only the indices of the ``pyfits.HDU_INDEX_CACHE_SIZE`` most recently
+    used files are kept (0 disables the index altogether).
+
+    Parameters
+    ----------
+    path : str
+        Path to a FITS file, or to a directory containing FITS files.
+
+    pattern : str, optional
+        If ``path`` is a directory, only the files in that directory whose
+        names match this glob-style pattern are indexed (default:
+        ``'*.fits'``).
+
+    kwargs
+        Any additional keyword arguments to be passed to `pyfits.open`.
+
+    Returns
+    -------
+    filenames : list
+        The paths of all files that were successfully indexed.
+    """
+
+    if os.path.isdir(path):
+        filenames = [os.path.join(path, name)
+                     for name in sorted(os.listdir(path))
+                     if fnmatch.fnmatch(name, pattern)]
+        filenames = [f for f in filenames if os.path.isfile(f)]
+        single = False
+    else:
+        filenames = [path]
+        single = True
+
+    kwargs['lazy_load_hdus'] = False
+
+    indexed = []
+
+    for filename in filenames:
+        _HDU_INDEX_CACHE.pop(os.path.abspath(filename), None)
+
+        try:
+            with fitsopen(filename, **kwargs):
+                pass
+        except (IOError, ValueError) as exc:
+            if single:
+                raise
+            warnings.warn('Could not build an HDU index for %s: %s' %
+                          (filename, exc))
+            continue
+
+        if os.path.abspath(filename) in _HDU_INDEX_CACHE:
+            indexed.append(filename)
+
+    return indexed
+
+
 def tabledump(filename, datafile=None, cdfile=None, hfile=None, ext=1,
               clobber=False):
     """
@@ -669,6 +944,22 @@ def _getext(filename, mode, *args, **kwargs):
     :func:`getdata()` documentation for the different possibilities.
     """
 
+    ext = _parse_ext_args(args, kwargs)
+    hdulist = fitsopen(filename, mode=mode, **kwargs)
+
+    return hdulist, ext
+
+
+def _parse_ext_args(args, kwargs):
+    """
+    Returns the extension selected by the extension arguments of the
+    convenience functions (see :func:`getdata()`) as either an HDU index or an
+    ``(extname, extver)`` tuple.
+
+    The ``ext``, ``extname``, and ``extver`` keyword arguments are removed
+    from ``kwargs``.
+    """
+
     ext = kwargs.pop('ext', None)
     extname = kwargs.pop('extname', None)
     extver = kwargs.pop('extver', None)
@@ -730,9 +1021,99 @@ def _getext(filename, mode, *args, **kwargs):
     elif extver and extname is None:
         raise TypeError('extver alone cannot specify an extension.')
 
-    hdulist = fitsopen(filename, mode=mode, **kwargs)
+    return ext
 
-    return hdulist, ext
+
+# The keywords needed by _scan_header_string to find an HDU and skip its data
+_SCAN_KEYWORDS = (['BITPIX', 'NAXIS', 'PCOUNT', 'GCOUNT', 'GROUPS', 'EXTNAME',
+                   'EXTVER'] + ['NAXIS%d' % (axis + 1) for axis in range(9)])
+
+
+def _scan_header_string(fileobj, ext, ignore_missing_end=False):
+    """
+    Implements `scanheader`: reads the headers of the HDUs in a `_File`,
+    skipping over their data, until the HDU selected by ``ext`` (an HDU index
+    or an ``(extname, extver)`` tuple) is found, and returns its header
+    string.
+    """
+
+    def block_iter(nbytes):
+        while True:
+            data = fileobj.read(nbytes)
+
+            if data:
+                yield data
+            else:
+                break
+
+    if isinstance(ext, tuple):
+        extname = ext[0].strip().upper()
+        extver = ext[1]
+    elif ext < 0:
+        # Negative indices require scanning all HDUs
+        header_strs = []
+
+    idx = 0
+    while True:
+        try:
+            header_str = Header._read_header_string(
+                block_iter, True, '', not ignore_missing_end, True)
+        except EOFError:
+            break
+
+        values = _header_values(header_str, _SCAN_KEYWORDS)
+
+        if isinstance(ext, tuple):
+            name = values.get('EXTNAME', '')
+            if isinstance(name, string_types):
+                name = name.strip().upper()
+            # 'PRIMARY' should always work as a reference to the first HDU
+            if ((name == extname or (extname == 'PRIMARY' and idx == 0)) and
+                    values.get('EXTVER', 1) == extver):
+                return header_str
+        elif ext < 0:
+            header_strs.append(header_str)
+        elif idx == ext:
+            return header_str
+
+        # Skip over the data to the next header
+        naxis = values.get('NAXIS', 0)
+        if naxis > 9:
+            values.update(_header_values(
+                header_str, ['NAXIS%d' % (axis + 1)
+                             for axis in range(9, naxis)]))
+        if naxis:
+            size = 1
+            for axis in range(naxis):
+                if (axis == 0 and values.get('GROUPS') and
+                        values.get('NAXIS1') == 0):
+                    # Random groups HDUs have NAXIS1 = 0
+                    continue
+                size *= values.get('NAXIS%d' % (axis + 1), 0)
+            size = (abs(values.get('BITPIX', 8)) * values.get('GCOUNT', 1) *
+                    (values.get('PCOUNT', 0) + size) // 8)
+            fileobj.seek(size + _pad_length(size), os.SEEK_CUR)
+
+        idx += 1
+
+    if isinstance(ext, tuple):
+        raise KeyError('Extension %s not found.' % repr(ext))
+    elif ext < 0 and -ext <= len(header_strs):
+        return header_strs[ext]
+    else:
+        raise IndexError('Extension %d out of range.' % ext)
+
+
+def _header_values(header_str, keywords):
+    """
+    Returns a dict mapping each of the given keywords to its (first) value
+    in the given header string, for those keywords present in the header.
+    """
+
+    values = {}
+    for card in _parse_selected_cards(header_str, keywords):
+        values.setdefault(card.keyword, card.value)
+    return values
 
 
 def _makehdu(data, header):
@@ -752,6 +1133,22 @@ def _makehdu(data, header):
     return hdu
 
 
+def _read_data(hdu, columns):
+    """
+    Returns the data of an HDU for `getdata`, reading only the given columns
+    if ``columns`` is not `None`.
+    """
+
+    if columns is None:
+        return hdu.data
+    elif isinstance(hdu, _TableBaseHDU) and not hdu.is_image:
+        return hdu.read_columns(columns)
+    elif hdu.data is None:
+        return None
+    else:
+        raise TypeError('Columns can only be read from table extensions.')
+
+
 def _stat_filename_or_fileobj(filename):
     closed = fileobj_closed(filename)
     name = fileobj_name(filename) or ''
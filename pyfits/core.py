@@ -51,6 +51,7 @@ from .fitsrec import FITS_record, FITS_rec
 from .hdu import *
 from .util import PyfitsDeprecationWarning, PyfitsPendingDeprecationWarning
 
+from .hdu.compressed import CompImageSection
 from .hdu.hdulist import fitsopen as open
 from .hdu.image import Section
 from .hdu.table import new_table
@@ -70,21 +71,27 @@ GLOBALS = [
     ('EXTENSION_NAME_CASE_SENSITIVE',      False),
     ('STRIP_HEADER_WHITESPACE',            True),
     ('USE_MEMMAP',                         True),
-    ('ENABLE_UINT',                        True)
+    ('ENABLE_UINT',                        True),
+    ('LAZY_LOAD_HDUS',                     True),
+    ('HDU_INDEX_CACHE_SIZE',               1000),
+    ('COMPRESSION_THREADS',                1),
+    ('COMPRESSION_TILE_CACHE_SIZE',        0),
+    ('PACK_BIT_COLUMNS',                   False)
 ]
 
 for varname, default in GLOBALS:
     try:
-        locals()[varname] = bool(int(os.environ.get('PYFITS_' + varname,
-                                                    default)))
+        locals()[varname] = type(default)(int(os.environ.get('PYFITS_' +
+                                                             varname,
+                                                             default)))
     except ValueError:
         locals()[varname] = default
 
 
 __all__ = (card.__all__ + column.__all__ + convenience.__all__ + diff.__all__ +
            hdu.__all__ +
-           ['FITS_record', 'FITS_rec', 'open', 'Section', 'new_table',
-            'Header', 'VerifyError', 'PyfitsDeprecationWarning',
+           ['FITS_record', 'FITS_rec', 'open', 'Section', 'CompImageSection',
+            'new_table', 'Header', 'VerifyError', 'PyfitsDeprecationWarning',
             'PyfitsPendingDeprecationWarning', 'ignore_deprecation_warnings',
             'TRUE', 'FALSE'] + [g[0] for g in GLOBALS])
 
@@ -65,6 +65,10 @@ GZIP_MAGIC = b('\x1f\x8b\x08')
 PKZIP_MAGIC = b('\x50\x4b\x03\x04')
 BZIP2_MAGIC = b('\x42\x5a')
 
+# Default number of bytes read at a time by _File.readchunks; a whole number
+# of FITS blocks (and hence of 32-bit words)
+_CHUNK_SIZE = 2880 * 1024
+
 
 class _File(object):
     """
@@ -272,6 +276,42 @@ class _File(object):
             self._file.seek(pos)
             return data
 
+    def readchunks(self, size, offset=0, chunksize=_CHUNK_SIZE):
+        """
+        Iterate over ``size`` bytes of the file starting at ``offset`` as a
+        sequence of uint8 arrays of at most ``chunksize`` bytes each.
+
+        Unlike `readarray` this never holds more than one chunk in memory at
+        a time, and compressed files are decompressed as they are read, so
+        it can be used to scan over arbitrarily large regions of a file.  The
+        file position is restored once iteration is complete.
+        """
+
+        if not hasattr(self._file, 'read'):
+            raise EOFError
+
+        if self.memmap:
+            for idx in range(0, size, chunksize):
+                yield self.readarray(offset=offset + idx, dtype=np.uint8,
+                                     shape=min(chunksize, size - idx))
+            return
+
+        dtype = np.dtype(np.uint8)
+        pos = self._file.tell()
+        self.seek(offset)
+        try:
+            remaining = size
+            while remaining > 0:
+                chunk = _array_from_file(self._file, dtype,
+                                         min(chunksize, remaining), '')
+                if not len(chunk):
+                    # The file was truncated
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            self.seek(pos)
+
     def writable(self):
         if self.readonly:
             return False
@@ -11,13 +11,19 @@ from .extern.six import string_types
 from .extern.six.moves import xrange, range, reduce
 
 from .column import (ASCIITNULL, FITS2NUMPY, ASCII2NUMPY, ASCII2STR, ColDefs,
-                     _AsciiColDefs, _FormatX, _FormatP, _VLF, _get_index,
-                     _wrapx, _unwrapx, _makep, Delayed)
+                     _AsciiColDefs, _FormatX, _FormatP, _VLF, _RaggedVLF,
+                     _PackedBits, _get_index, _wrapx, _unwrapx, _makep,
+                     Delayed)
 from .py3compat import ignored
 from .util import encode_ascii, decode_ascii, lazyproperty
 from ._compat.weakref import WeakSet
 
 
+# The number of bytes of rows of a new table to copy all the columns into at a
+# time in FITS_rec.from_columns; small enough to stay in cache
+_FILL_BLOCK_SIZE = 2 ** 19
+
+
 class FITS_record(object):
     """
     FITS record class.
@@ -325,8 +331,15 @@ class FITS_rec(np.recarray):
                 if dim > nrows:
                     nrows = dim
 
-        raw_data = np.empty(columns.dtype.itemsize * nrows, dtype=np.uint8)
-        raw_data.fill(ord(columns._padding_byte))
+        if columns._padding_byte == '\x00':
+            # Let numpy hand back zeroed memory directly rather than filling
+            # an empty buffer one byte at a time
+            raw_data = np.zeros(columns.dtype.itemsize * nrows,
+                                dtype=np.uint8)
+        else:
+            raw_data = np.empty(columns.dtype.itemsize * nrows,
+                                dtype=np.uint8)
+            raw_data.fill(ord(columns._padding_byte))
         data = np.recarray(nrows, dtype=columns.dtype, buf=raw_data).view(cls)
 
         # Make sure the data is a listener for changes to the columns
@@ -347,8 +360,22 @@ class FITS_rec(np.recarray):
         if fill:
             return data
 
+        # If the column arrays are all just the fields of a single record
+        # array already laid out like the new table (the common case of a
+        # table created from an existing structured array) the whole buffer
+        # can be copied at once rather than one column at a time
+        base = _common_record_array(columns)
+        if base is not None:
+            n = min(len(base), nrows)
+            data.view(np.ndarray)[:n] = base[:n]
+            for idx in range(len(columns)):
+                columns._arrays[idx] = data.field(idx)
+            return data
+
         # Otherwise we have to fill the recarray with data from the input
-        # columns
+        # columns; those that are copied as they are get copied together
+        # afterwards
+        copies = []
         for idx, column in enumerate(columns):
             # For each column in the ColDef object, determine the number of
             # rows in that column.  This will be either the number of rows in
@@ -384,7 +411,11 @@ class FITS_rec(np.recarray):
 
             if isinstance(recformat, _FormatX):
                 # Data is a bit array
-                if inarr.shape[-1] == recformat.repeat:
+                if isinstance(inarr, _PackedBits):
+                    # The bits are already packed as in the table
+                    outarr[:] = inarr.view(np.ndarray)
+                    continue
+                elif inarr.shape[-1] == recformat.repeat:
                     _wrapx(inarr, outarr, recformat.repeat)
                     continue
             elif isinstance(recformat, _FormatP):
@@ -418,6 +449,18 @@ class FITS_rec(np.recarray):
                     field[n:] = -bzero
 
                 inarr = inarr - bzero
+            elif (columns[idx]._physical_values and
+                    not isinstance(columns, _AsciiColDefs) and
+                    field.dtype.kind in 'iu' and inarr.dtype.kind == 'f' and
+                    (column.bscale not in (None, 1) or
+                     column.bzero not in (None, 0))):
+                # Scaled floating point values can't be stored in the integer
+                # field as they are; keep them in data._converted, from which
+                # _scale_back will scale them into the field
+                converted = np.zeros(field.shape, dtype=inarr.dtype)
+                converted[:n] = inarr
+                data._cache_field(name, converted)
+                continue
             elif isinstance(columns, _AsciiColDefs):
                 # Regardless whether the format is character or numeric, if the
                 # input array contains characters then it's already in the raw
@@ -461,7 +504,16 @@ class FITS_rec(np.recarray):
                     # strings
                     outarr[:n] = inarr.ravel()
             else:
-                outarr[:] = inarr
+                copies.append((outarr, inarr))
+
+        # Copying whole columns one after the other writes to every row of the
+        # table once for each column; instead copy all the columns into one
+        # block of rows at a time, while the block stays in cache
+        block_rows = max(_FILL_BLOCK_SIZE // max(data.itemsize, 1), 1)
+        for start in range(0, nrows, block_rows):
+            stop = start + block_rows
+            for outarr, inarr in copies:
+                outarr[start:stop] = inarr[start:stop]
 
         # Now replace the original column array references with the new
         # fields
@@ -490,6 +542,12 @@ class FITS_rec(np.recarray):
             subtype = type(self)
             out = self.view(np.recarray).__getitem__(key).view(subtype)
             out._coldefs = ColDefs(self._coldefs)
+            # The slice is still a view of the same raw data, so its heap (if
+            # any) is found at the same offset into it
+            out._heapoffset = self._heapoffset
+            out._heapsize = self._heapsize
+            out._gap = self._gap
+            out._uint = self._uint
             arrays = []
             out._converted = {}
             for idx, name in enumerate(self._coldefs.names):
@@ -691,17 +749,7 @@ class FITS_rec(np.recarray):
                 'indicating an empty field.' % key)
             return np.array([], dtype=format.dtype)
 
-        # If field's base is a FITS_rec, we can run into trouble because it
-        # contains a reference to the ._coldefs object of the original data;
-        # this can lead to a circular reference; see ticket #49
-        base = self
-        while (isinstance(base, FITS_rec) and
-                isinstance(base.base, np.recarray)):
-            base = base.base
-        # base could still be a FITS_rec in some cases, so take care to
-        # use rec.recarray.field to avoid a potential infinite
-        # recursion
-        field = _get_recarray_field(base, name)
+        field = self._get_raw_field(name)
 
         if name not in self._converted:
             recformat = format.recformat
@@ -724,6 +772,85 @@ class FITS_rec(np.recarray):
 
         return self._converted[name]
 
+    def ragged_field(self, key):
+        """
+        The data of a variable-length array (P or Q format) column as a pair
+        ``(values, offsets)`` of flat arrays, rather than as an object array
+        of one array per row.
+
+        ``values`` holds the arrays of all the rows joined end to end, with
+        any scaling of the column applied, and the array in row ``i`` is
+        ``values[offsets[i]:offsets[i + 1]]``; ``offsets`` has one more
+        element than the table has rows.  Unless the column has already been
+        accessed with `field` its arrays are read from the heap in bulk,
+        without creating an array object for each row.
+        """
+
+        column = self.columns[key]
+        name = column.name
+        recformat = column.format.recformat
+
+        if not isinstance(recformat, _FormatP):
+            raise TypeError('Column %r is not a variable-length array '
+                            'column.' % name)
+
+        if recformat.dtype == 'a':
+            raise TypeError('Character array column %r can not be returned '
+                            'as flat arrays.' % name)
+
+        if isinstance(self._converted.get(name), _RaggedVLF):
+            return self._converted[name]._flatten()
+
+        if name in self._converted:
+            arrays = self._converted[name]
+            offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+            np.cumsum([len(arr) for arr in arrays], out=offsets[1:])
+            if len(arrays):
+                values = np.concatenate(arrays)
+            else:
+                values = np.array([], dtype=recformat.dtype)
+            return values, offsets
+
+        raw_data = self._get_raw_data()
+        if raw_data is None:
+            raise IOError(
+                "Could not find heap data for the %r variable-length "
+                "array column." % name)
+
+        values, offsets = self._get_p_values(self._get_raw_field(name),
+                                             np.dtype(recformat.dtype),
+                                             raw_data)
+        if column._dims:
+            # TDIMn applies to each array separately
+            if len(offsets) > 1:
+                values = np.concatenate([
+                    self._convert_other(column, values[start:stop],
+                                        recformat).ravel()
+                    for start, stop in zip(offsets[:-1].tolist(),
+                                           offsets[1:].tolist())])
+        else:
+            values = self._convert_other(column, values, recformat)
+
+        return values, offsets
+
+    def _get_raw_field(self, name):
+        """
+        The raw field for the column named ``name`` in the recarray
+        underlying this table.
+        """
+
+        # If field's base is a FITS_rec, we can run into trouble because it
+        # contains a reference to the ._coldefs object of the original data;
+        # this can lead to a circular reference; see ticket #49
+        base = self
+        while (isinstance(base, FITS_rec) and
+                isinstance(base.base, np.recarray)):
+            base = base.base
+        # base could still be a FITS_rec in some cases, so take care to
+        # use rec.recarray.field to avoid a potential infinite
+        # recursion
+        return _get_recarray_field(base, name)
+
     def _cache_field(self, name, field):
         """
         Do not store fields in _converted if one of its bases is self,
@@ -780,6 +907,12 @@ class FITS_rec(np.recarray):
         FITS X format.
         """
 
+        from pyfits import PACK_BIT_COLUMNS
+
+        if PACK_BIT_COLUMNS:
+            # Only unpack the bits of rows as they are accessed
+            return _PackedBits(field, recformat.repeat)
+
         dummy = np.zeros(self.shape + (recformat.repeat,), dtype=np.bool_)
         _unwrapx(field, dummy, recformat.repeat)
         return dummy
@@ -797,35 +930,99 @@ class FITS_rec(np.recarray):
                 "Could not find heap data for the %r variable-length "
                 "array column." % column.name)
 
-        for idx in range(len(self)):
-            offset = field[idx, 1] + self._heapoffset
-            count = field[idx, 0]
-
-            if recformat.dtype == 'a':
-                dt = np.dtype(recformat.dtype + str(1))
+        if recformat.dtype == 'a':
+            dt = np.dtype(recformat.dtype + str(1))
+            for idx in range(len(self)):
+                offset = field[idx, 1] + self._heapoffset
+                count = field[idx, 0]
                 arr_len = count * dt.itemsize
                 da = raw_data[offset:offset + arr_len].view(dt)
                 da = np.char.array(da.view(dtype=dt), itemsize=count)
                 dummy[idx] = decode_ascii(da)
-            else:
-                dt = np.dtype(recformat.dtype)
-                arr_len = count * dt.itemsize
-                dummy[idx] = raw_data[offset:offset + arr_len].view(dt)
-                dummy[idx].dtype = dummy[idx].dtype.newbyteorder('>')
-                # Each array in the field may now require additional
-                # scaling depending on the other scaling parameters
-                # TODO: The same scaling parameters apply to every
-                # array in the column so this is currently very slow; we
-                # really only need to check once whether any scaling will
-                # be necessary and skip this step if not
-                # TODO: Test that this works for X format; I don't think
-                # that it does--the recformat variable only applies to the P
-                # format not the X format
-                dummy[idx] = self._convert_other(column, dummy[idx],
-                                                 recformat)
+
+            return dummy
+
+        values, offsets = self._get_p_values(field,
+                                             np.dtype(recformat.dtype),
+                                             raw_data)
+        bounds = list(zip(offsets[:-1].tolist(), offsets[1:].tolist()))
+
+        if column._dims:
+            # TDIMn applies to each array separately
+            # TODO: Test that this works for X format; I don't think
+            # that it does--the recformat variable only applies to the P
+            # format not the X format
+            arrays = [self._convert_other(column, values[start:stop],
+                                          recformat)
+                      for start, stop in bounds]
+            lengths = [len(arr) for arr in arrays]
+        else:
+            # The same scaling parameters apply to every array in the column,
+            # so any scaling is applied to all of them at once
+            values = self._convert_other(column, values, recformat)
+            arrays = [values[start:stop] for start, stop in bounds]
+            lengths = offsets[1:] - offsets[:-1]
+
+        # The arrays already have the column's type, so bypass the checks in
+        # _VLF.__setitem__
+        for idx, arr in enumerate(arrays):
+            np.ndarray.__setitem__(dummy, idx, arr)
+
+        if len(arrays):
+            dummy.max = int(max(lengths))
 
         return dummy
 
+    def _get_p_values(self, field, dtype, raw_data):
+        """
+        Gather the arrays in the heap for all the rows of the P or Q format
+        descriptors ``field`` into a single flat array of ``dtype`` (in
+        big-endian byte order).
+
+        Returns the flat array and the offset of each row's array into it,
+        with a final offset giving its total length.  When the arrays are
+        stored one after the other in the heap, as PyFITS writes them, the
+        flat array is a view of the heap rather than a copy.
+        """
+
+        dtype = dtype.newbyteorder('>')
+        itemsize = dtype.itemsize
+        raw_data = raw_data.view(np.ubyte)
+
+        counts = field[:, 0].astype(np.int64)
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        # The heap offsets of empty arrays are meaningless
+        nonempty = counts > 0
+        counts = counts[nonempty]
+        starts = field[:, 1][nonempty].astype(np.int64) + self._heapoffset
+
+        if not len(starts):
+            return np.array([], dtype=dtype), offsets
+
+        align = starts[0] % itemsize
+        if (starts % itemsize == align).all():
+            nitems = (len(raw_data) - align) // itemsize
+            heap = raw_data[align:align + nitems * itemsize].view(dtype)
+            starts = (starts - align) // itemsize
+
+            if (starts[1:] == starts[:-1] + counts[:-1]).all():
+                values = heap[starts[0]:starts[0] + offsets[-1]]
+            else:
+                index = np.repeat(starts - offsets[:-1][nonempty], counts)
+                index += np.arange(offsets[-1])
+                values = heap[index]
+        else:
+            # The arrays are not all aligned alike with respect to the items
+            # of dtype, so the heap can't be viewed as a single array
+            ends = starts + counts * itemsize
+            values = np.concatenate(
+                [raw_data[start:end] for start, end in
+                 zip(starts.tolist(), ends.tolist())]).view(dtype)
+
+        return values, offsets
+
     def _convert_ascii(self, column, field):
         """
         Special handling for ASCII table columns to convert columns containing
@@ -839,19 +1036,47 @@ class FITS_rec(np.recarray):
         if len(nullval) > format.width:
             nullval = nullval[:format.width]
 
-        dummy = np.char.ljust(field, format.width)
-        dummy = np.char.replace(dummy, encode_ascii('D'), encode_ascii('E'))
+        # Work on the characters of the column as a 2-D array of bytes,
+        # padded with blanks to the column width
+        chars = _ascii_chars(field, format.width)
+        chars[chars == ord('D')] = ord('E')
+
         null_fill = encode_ascii(str(ASCIITNULL).rjust(format.width))
-        dummy = np.where(np.char.strip(dummy) == nullval, null_fill, dummy)
+        null = _match_ascii_value(chars, nullval)
+        if null.any():
+            chars[null] = ord(' ')
+            chars[null, -len(null_fill):] = np.frombuffer(null_fill,
+                                                          dtype=np.uint8)
+
+        dummy = None
+        if recformat[0] == 'i':
+            # Integers are parsed directly from the bytes; only values not
+            # in the plain [sign]digits form are left to the string
+            # conversion below
+            dummy, parsed = _parse_ascii_ints(chars)
+            info = np.iinfo(recformat)
+            parsed &= (dummy >= info.min) & (dummy <= info.max)
+            dummy = dummy.astype(recformat)
+            if not parsed.all():
+                chars = chars[~parsed]
+            else:
+                chars = None
 
-        try:
-            dummy = np.array(dummy, dtype=recformat)
-        except ValueError as exc:
-            indx = self._coldefs.names.index(column.name)
-            raise ValueError(
-                '%s; the header may be missing the necessary TNULL%d '
-                'keyword or the table contains invalid data' %
-                (exc, indx + 1))
+        if chars is not None:
+            strings = chars.view('S%d' % chars.shape[1]).ravel()
+            try:
+                values = np.array(strings, dtype=recformat)
+            except ValueError as exc:
+                indx = self._coldefs.names.index(column.name)
+                raise ValueError(
+                    '%s; the header may be missing the necessary TNULL%d '
+                    'keyword or the table contains invalid data' %
+                    (exc, indx + 1))
+
+            if dummy is None:
+                dummy = values
+            else:
+                dummy[~parsed] = values
 
         return dummy
 
@@ -1012,7 +1237,9 @@ class FITS_rec(np.recarray):
         the stated criteria can be found.
         """
 
-        raw_data_bytes = self.nbytes + self._heapsize
+        # The heap offset is relative to the start of the raw data, which
+        # for a slice of a table lies before the slice's own first row
+        raw_data_bytes = max(self.nbytes, self._heapoffset) + self._heapsize
         base = self
         while hasattr(base, 'base') and base.base is not None:
             base = base.base
@@ -1079,7 +1306,11 @@ class FITS_rec(np.recarray):
                     # The VLA has potentially been updated, so we need to
                     # update the array descriptors
                     raw_field[:] = 0  # reset
-                    npts = [len(arr) for arr in self._converted[name]]
+                    converted = self._converted[name]
+                    if isinstance(converted, _RaggedVLF):
+                        npts = converted._lengths()
+                    else:
+                        npts = [len(arr) for arr in converted]
 
                     raw_field[:len(npts), 0] = npts
                     raw_field[1:, 1] = (np.add.accumulate(raw_field[:-1, 0]) *
@@ -1091,6 +1322,10 @@ class FITS_rec(np.recarray):
                 # include the size of its constituent arrays in the heap size
                 # total
 
+                if isinstance(self._converted.get(name), _RaggedVLF):
+                    # The flat array of values is written to the heap as is
+                    continue
+
             if isinstance(recformat, _FormatX) and name in self._converted:
                 _wrapx(self._converted[name], raw_field, recformat.repeat)
                 continue
@@ -1103,11 +1338,13 @@ class FITS_rec(np.recarray):
             # conversion for both ASCII and binary tables
             if _number or _str:
                 if _number and (_scale or _zero) and column._physical_values:
-                    dummy = field.copy()
+                    # Not done in place, since the raw values may need a
+                    # wider (floating point) type than the field
+                    dummy = field
                     if _zero:
-                        dummy -= bzero
+                        dummy = dummy - bzero
                     if _scale:
-                        dummy /= bscale
+                        dummy = dummy / bscale
                     # This will set the raw values in the recarray back to
                     # their non-physical storage values, so the column should
                     # be mark is not scaled
@@ -1248,19 +1485,40 @@ class FITS_rec(np.recarray):
 
         # not using numarray.strings's num2char because the
         # result is not allowed to expand (as C/Python does).
-        for jdx, value in enumerate(input_field):
-            value = fmt % value
-            if len(value) > starts[col_idx + 1] - starts[col_idx]:
-                raise ValueError(
-                    "Value %r does not fit into the output's itemsize of "
-                    "%s." % (value, spans[col_idx]))
+        if not len(input_field):
+            return
 
-            if trailing_decimal and value[0] == ' ':
-                # We have some extra space in the field for the trailing
-                # decimal point
-                value = value[1:] + '.'
+        values = None
+        if (format.format in ('I', 'J') and
+                np.can_cast(input_field.dtype, np.int64)):
+            values = _format_ascii_ints(input_field, format.width,
+                                        max(trail, 0))
 
-            output_field[jdx] = value
+        if values is None:
+            values = np.char.mod(fmt, input_field)
+
+        lengths = np.char.str_len(values)
+        too_long = lengths > starts[col_idx + 1] - starts[col_idx]
+        if too_long.any():
+            raise ValueError(
+                "Value %r does not fit into the output's itemsize of "
+                "%s." % (values[too_long.argmax()].item(), spans[col_idx]))
+
+        if trailing_decimal:
+            # Where there is some extra space in the field, shift the value
+            # left to make room for the trailing decimal point; such values
+            # all have exactly the formatted width
+            width = format.width + max(trail, 0)
+            if values.dtype.kind == 'U':
+                chars = values.view(np.uint32)
+            else:
+                chars = values.view(np.uint8)
+            chars = chars.reshape((len(values), -1))
+            shift = chars[:, 0] == ord(' ')
+            chars[shift, :width - 1] = chars[shift, 1:width]
+            chars[shift, width - 1] = ord('.')
+
+        output_field[:] = values
 
         # Replace exponent separator in floating point numbers
         if 'D' in format:
@@ -1284,6 +1542,63 @@ def _get_recarray_field(array, key):
     return field
 
 
+def _common_record_array(columns):
+    """
+    If every array in ``columns`` is a plain field of one buffer of records
+    laid out exactly as ``columns.dtype``, return an `~numpy.ndarray` of
+    those records.  Otherwise returns `None`.
+
+    Such an array can be copied into a new table wholesale, since none of its
+    columns need any conversion on the way in.
+    """
+
+    if not len(columns) or isinstance(columns, _AsciiColDefs):
+        return None
+
+    arrays = columns._arrays
+    if any(arr is None for arr in arrays):
+        return None
+
+    first = arrays[0]
+    if not isinstance(first, np.ndarray):
+        return None
+
+    # Find the array owning the memory the first column points into
+    owner = first
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+
+    if not owner.flags.c_contiguous:
+        return None
+
+    dtype = columns.dtype
+    address = (first.__array_interface__['data'][0] -
+               dtype.fields[columns[0].name][1])
+    offset = address - owner.__array_interface__['data'][0]
+    if offset < 0 or offset + len(first) * dtype.itemsize > owner.nbytes:
+        return None
+
+    base = np.ndarray(len(first), dtype=dtype, buffer=owner.view(np.ndarray),
+                      offset=offset)
+
+    for column, arr in zip(columns, arrays):
+        recformat = column.format.recformat
+        if (isinstance(recformat, (_FormatX, _FormatP)) or
+                column._pseudo_unsigned_ints):
+            return None
+
+        field_dtype, field_offset = dtype.fields[column.name][:2]
+        if (not isinstance(arr, np.ndarray) or
+                arr.dtype != field_dtype.base or
+                arr.shape != base.shape + field_dtype.shape or
+                arr.strides[0] != dtype.itemsize or
+                arr.__array_interface__['data'][0] !=
+                address + field_offset):
+            return None
+
+    return base
+
+
 def _rstrip_inplace(array, chars=None):
     """
     Performs an in-place rstrip operation on string arrays.
@@ -1341,6 +1656,124 @@ def _ascii_encode(inarray, out=None):
     return it.operands[1]
 
 
+def _ascii_chars(field, width):
+    """
+    Returns the characters of an ASCII table string column as a new
+    ``uint8`` array of shape (``nrows``, ``width``) or wider, with any
+    trailing NULs replaced with blanks.
+    """
+
+    nbytes = max(field.itemsize, width)
+    chars = np.array(field, dtype='S%d' % nbytes).view(np.uint8)
+    chars = chars.reshape((len(field), nbytes))
+    chars[chars == 0] = ord(' ')
+    return chars
+
+
+def _match_ascii_value(chars, value):
+    """
+    Given the characters of an ASCII table column as returned by
+    `_ascii_chars`, returns a boolean array that is `True` for each row
+    whose value, with leading and trailing blanks stripped, is ``value``.
+    """
+
+    nrows, width = chars.shape
+    if not value:
+        return (chars == ord(' ')).all(axis=1)
+    elif len(value) > width:
+        return np.zeros(nrows, dtype=bool)
+
+    value = np.frombuffer(value, dtype=np.uint8)
+    nonblank = chars != ord(' ')
+    first = nonblank.argmax(axis=1)
+    last = width - 1 - nonblank[:, ::-1].argmax(axis=1)
+    match = nonblank.any(axis=1) & (last - first + 1 == len(value))
+
+    index = np.minimum(first[:, np.newaxis] + np.arange(len(value)),
+                       width - 1)
+    match &= (chars[np.arange(nrows)[:, np.newaxis], index] == value).all(
+        axis=1)
+    return match
+
+
+# Powers of ten for each digit of an int64; the longest integers that can be
+# parsed without the risk of overflow have 18 digits
+_INT_DIGIT_POWERS = 10 ** np.arange(18, dtype=np.int64)
+
+# The smallest unsigned 64-bit integers with two, three, ..., twenty digits
+_UINT_DIGIT_POWERS = 10 ** np.arange(1, 20, dtype=np.uint64)
+
+
+def _parse_ascii_ints(chars):
+    """
+    Parses the integer values in the characters of an ASCII table column as
+    returned by `_ascii_chars`.
+
+    Returns an ``int64`` array of the values, and a boolean array that is
+    `False` for any rows that are not simply a run of digits with an optional
+    sign and surrounding blanks (including rows that are blank); the values
+    for those rows are meaningless.
+    """
+
+    digits = chars - ord('0')
+    isdigit = digits < 10
+    minus = chars == ord('-')
+    sign = minus | (chars == ord('+'))
+    blank = chars == ord(' ')
+
+    # The digits must form a single run, preceded immediately by the sign if
+    # there is one, with nothing but blanks around them
+    runs = isdigit.copy()
+    runs[:, 1:] &= ~isdigit[:, :-1]
+    ndigits = isdigit.sum(axis=1)
+    parsed = ((isdigit | sign | blank).all(axis=1) &
+              (runs.sum(axis=1) == 1) & (sign.sum(axis=1) <= 1) &
+              (ndigits <= len(_INT_DIGIT_POWERS)))
+    signed = sign.any(axis=1)
+    parsed[signed] &= (sign[signed].argmax(axis=1) ==
+                       isdigit[signed].argmax(axis=1) - 1)
+
+    # The power of ten for each digit is the number of digits after it
+    place = np.cumsum(isdigit[:, ::-1], axis=1)[:, ::-1] - isdigit
+    place = np.minimum(place, len(_INT_DIGIT_POWERS) - 1)
+    values = (np.where(isdigit, digits, 0) * _INT_DIGIT_POWERS[place]).sum(
+        axis=1)
+    values[minus.any(axis=1)] *= -1
+    return values, parsed
+
+
+def _format_ascii_ints(values, width, trail):
+    """
+    Formats integer values for an ASCII table column as ``'%<width>d'``
+    followed by ``trail`` blanks, returning a string array.
+
+    Returns `None` if any value is too long for the width, in which case the
+    values should be formatted individually.
+    """
+
+    values = np.asarray(values, dtype=np.int64)
+    negative = values < 0
+    # np.abs of the most negative int64 wraps around, but is still correct
+    # when viewed as unsigned
+    mags = np.abs(values).astype(np.uint64)
+    ndigits = 1 + np.searchsorted(_UINT_DIGIT_POWERS, mags, side='right')
+
+    if (ndigits + negative > width).any():
+        return None
+
+    chars = np.empty((len(values), width + trail), dtype=np.uint8)
+    chars.fill(ord(' '))
+    for pos in range(width - 1, -1, -1):
+        digits = (mags % 10).astype(np.uint8) + ord('0')
+        inside = width - 1 - pos < ndigits
+        chars[inside, pos] = digits[inside]
+        mags //= 10
+
+    rows = np.nonzero(negative)[0]
+    chars[rows, width - 1 - ndigits[rows]] = ord('-')
+    return chars.view('S%d' % (width + trail)).ravel()
+
+
 def _has_unicode_fields(array):
     """
     Returns True if any fields in a structured array have Unicode dtype.
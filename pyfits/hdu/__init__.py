@@ -5,10 +5,12 @@ from .groups import GroupsHDU, GroupData, Group
 from .hdulist import HDUList
 from .image import PrimaryHDU, ImageHDU
 from .nonstandard import FitsHDU
-from .streaming import StreamingHDU
+from .streaming import (StreamingHDU, StreamingCompImageHDU,
+                        StreamingTableHDU)
 from .table import TableHDU, BinTableHDU
 
 __all__ = ['HDUList', 'PrimaryHDU', 'ImageHDU', 'TableHDU', 'BinTableHDU',
            'GroupsHDU', 'GroupData', 'Group', 'CompImageHDU', 'FitsHDU',
-           'StreamingHDU', 'register_hdu', 'unregister_hdu', 'DELAYED',
-           'BITPIX2DTYPE', 'DTYPE2BITPIX']
+           'StreamingHDU', 'StreamingCompImageHDU', 'StreamingTableHDU',
+           'register_hdu', 'unregister_hdu', 'DELAYED', 'BITPIX2DTYPE',
+           'DTYPE2BITPIX']
@@ -21,6 +21,11 @@ from ..util import (first, lazyproperty, _is_int, _is_pseudo_unsigned,
 from ..verify import _Verify, _ErrList
 
 
+# Number of 32-bit words summed per reduction when computing checksums; small
+# enough that the uint64 accumulator can never overflow
+_CHECKSUM_CHUNK_WORDS = 1 << 24
+
+
 class _Delayed(object):
     pass
 DELAYED = _Delayed()
@@ -1492,12 +1497,21 @@ class _ValidHDU(_BaseHDU, _Verify):
 
         if not self._data_loaded:
             # This is the case where the data has not been read from the file
-            # yet.  We find the data in the file, read it, and calculate the
-            # datasum.
+            # yet.  We find the data in the file and calculate the datasum,
+            # reading it a chunk at a time so that the memory used does not
+            # depend on the size of the data.
             if self.size > 0:
-                raw_data = self._get_raw_data(self._data_size, 'ubyte',
-                                              self._data_offset)
-                return self._compute_checksum(raw_data, blocking=blocking)
+                if self._buffer or not self._file:
+                    raw_data = self._get_raw_data(self._data_size, 'ubyte',
+                                                  self._data_offset)
+                    return self._compute_checksum(raw_data, blocking=blocking)
+
+                datasum = 0
+                for chunk in self._file.readchunks(self._data_size,
+                                                   self._data_offset):
+                    datasum = self._compute_checksum(chunk, datasum,
+                                                     blocking=blocking)
+                return datasum
             else:
                 return 0
         elif self.data is not None:
@@ -1555,20 +1569,44 @@ class _ValidHDU(_BaseHDU, _Verify):
         ones complement checksum
         """
 
-        blocklen = {'standard': 2880,
-                    'nonstandard': len(data),
-                    'either': 2880,  # do standard first
-                    True: 2880}[blocking]
+        if blocking not in ('standard', 'nonstandard', 'either', True):
+            raise KeyError(blocking)
+
+        # The per-block carry folding done by _compute_hdu_checksum is just
+        # 32-bit ones-complement addition of the data taken as big-endian
+        # 32-bit words, which is associative.  So the whole buffer can be
+        # summed in a single pass, folding the carries once at the end.
+        # Since every block but the last is a whole number of words this
+        # gives bit-identical results for either blocking.
+        data = np.ascontiguousarray(data).view(np.uint8).ravel()
+        nbytes = len(data)
+        nwords = nbytes // 4
+
+        total = int(np.uint32(sum32))
+        words = data[:nwords * 4].view('>u4')
+        for idx in range(0, nwords, _CHECKSUM_CHUNK_WORDS):
+            chunk = words[idx:idx + _CHECKSUM_CHUNK_WORDS]
+            total += int(np.add.reduce(chunk, dtype=np.uint64))
+
+        if nbytes % 4:
+            # Pad the trailing partial word with zeros
+            tail = np.zeros(4, dtype=np.uint8)
+            tail[:nbytes % 4] = data[nwords * 4:]
+            total += int(tail.view('>u4')[0])
+
+        # Fold the carries; a ones-complement sum is only ever zero if
+        # everything summed was zero, otherwise it is represented in the
+        # range [1, 0xFFFFFFFF]
+        if total:
+            total = (total - 1) % 0xFFFFFFFF + 1
 
-        sum32 = np.uint32(sum32)
-        for i in range(0, len(data), blocklen):
-            length = min(blocklen, len(data) - i)   # ????
-            sum32 = self._compute_hdu_checksum(data[i:i + length], sum32)
-        return sum32
+        return np.uint32(total)
 
     def _compute_hdu_checksum(self, data, sum32=0):
         """
         Translated from FITS Checksum Proposal by Seaman, Pence, and Rots.
+        This is the block-at-a-time reference implementation; in practice
+        `_compute_checksum` sums whole buffers at once.
         Use uint32 literals as a hedge against type promotion to int64.
 
         This code should only be called with blocks of 2880 bytes
@@ -1,9 +1,13 @@
 import ctypes
 import gc
 import math
+import itertools
 import re
+import threading
 import time
 import warnings
+import weakref
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -11,11 +15,11 @@ from ..extern.six import string_types, iteritems
 from ..extern.six.moves import range
 
 from ..card import Card
-from ..column import Column, ColDefs, TDEF_RE
+from ..column import Column, ColDefs, TDEF_RE, _FormatP
 from ..column import KEYWORD_NAMES as TABLE_KEYWORD_NAMES
 from ..fitsrec import FITS_rec
 from ..header import Header
-from ..py3compat import ignored
+from ..py3compat import ignored, OrderedDict
 from ..util import (lazyproperty, _is_pseudo_unsigned, _unsigned_zero,
                     deprecated, _is_int, _get_array_mmap,
                     PyfitsPendingDeprecationWarning)
@@ -55,6 +59,10 @@ DEFAULT_BYTE_PIX = 4
 
 CMTYPE_ALIASES = {}
 
+# The maximum size in bytes of the raw (unscaled) data decompressed at once
+# when decompressing images that need scaling
+_DECOMPRESS_CHUNK_SIZE = 1 << 24
+
 # CFITSIO version-specific features
 if COMPRESSION_SUPPORTED:
     try:
@@ -1371,37 +1379,11 @@ class CompImageHDU(BinTableHDU):
     @lazyproperty
     def data(self):
         # The data attribute is the image data (not the table data).
-        data = compression.decompress_hdu(self)
+        data = self._decompress_data()
 
         if data is None:
             return data
 
-        # Scale the data if necessary
-        if (self._orig_bzero != 0 or self._orig_bscale != 1):
-            new_dtype = self._dtype_for_bitpix()
-            data = np.array(data, dtype=new_dtype)
-
-            zblank = None
-
-            if 'ZBLANK' in self.compressed_data.columns.names:
-                zblank = self.compressed_data['ZBLANK']
-            else:
-                if 'ZBLANK' in self._header:
-                    zblank = np.array(self._header['ZBLANK'], dtype='int32')
-                elif 'BLANK' in self._header:
-                    zblank = np.array(self._header['BLANK'], dtype='int32')
-
-            if zblank is not None:
-                blanks = (data == zblank)
-
-            if self._bscale != 1:
-                np.multiply(data, self._bscale, data)
-            if self._bzero != 0:
-                data += self._bzero
-
-            if zblank is not None:
-                data = np.where(blanks, np.nan, data)
-
         # Right out of _ImageBaseHDU.data
         self._update_header_scale_info(data.dtype)
 
@@ -1415,6 +1397,233 @@ class CompImageHDU(BinTableHDU):
                             'dtype.fields = %s' %
                             (type(data), data.dtype.fields))
 
+    @property
+    def section(self):
+        """
+        Access a section of the image array without decompressing the entire
+        array.  The :class:`CompImageSection` object returned by this
+        attribute is not meant to be used directly by itself.  Rather, slices
+        of the section return the appropriate slice of the data, and only the
+        tiles of the compressed image that overlap the slice are decompressed.
+
+        If the image data has already been loaded, slices of the section are
+        just slices of ``self.data``.
+        """
+
+        return CompImageSection(self)
+
+    @property
+    def tile_cache_size(self):
+        """
+        The maximum total size, in bytes, of the decompressed tiles kept in
+        this HDU's tile cache.
+
+        When this is non-zero slices of `section` decompress the image tile
+        by tile, keeping recently used tiles in a cache so that overlapping
+        slices do not decompress the same tiles again; the least recently
+        used tiles are discarded when the cache is full.  The cache is cleared
+        whenever ``compressed_data`` changes.  This defaults to
+        ``pyfits.COMPRESSION_TILE_CACHE_SIZE`` (0, disabling the cache, unless
+        set otherwise).
+        """
+
+        return self._tile_cache.max_bytes
+
+    @tile_cache_size.setter
+    def tile_cache_size(self, value):
+        self._tile_cache.resize(value)
+
+    @lazyproperty
+    def _tile_cache(self):
+        from pyfits import COMPRESSION_TILE_CACHE_SIZE
+
+        return _TileCache(COMPRESSION_TILE_CACHE_SIZE)
+
+    def decompress_data(self, out=None):
+        """
+        Decompress the image data, applying any BSCALE/BZERO scaling and
+        replacing ZBLANK pixels with NaN, without storing the result as
+        `data`.
+
+        Parameters
+        ----------
+        out : `numpy.ndarray`, optional
+            A writeable, C-contiguous array with the same shape as the image
+            and the same dtype as the scaled image data (``hdu.data.dtype``),
+            for example a slice of a preallocated cube or an array in shared
+            memory.  The image is decompressed and scaled directly into
+            ``out`` without allocating a separate array for the whole image.
+
+        Returns
+        -------
+        data : `numpy.ndarray`
+            The image data (``out``, if it was given).
+
+        Notes
+        -----
+        If `data` has already been loaded (and possibly modified) it is
+        copied instead of decompressing the image again.
+        """
+
+        if self._data_loaded:
+            data = self.data
+            if data is None:
+                return data
+            dtype = data.dtype
+            shape = data.shape
+        else:
+            dtype = self._scaled_dtype()
+            shape = self.shape
+
+        if out is not None:
+            if not isinstance(out, np.ndarray) or out.dtype != dtype:
+                raise TypeError('out must be an array with dtype %s' % dtype)
+            if out.shape != shape:
+                raise ValueError('out must have the same shape as the image '
+                                 '%s; got %s' % (shape, out.shape))
+            if not (out.flags.c_contiguous and out.flags.writeable):
+                raise ValueError('out must be a writeable C-contiguous array')
+
+        if self._data_loaded:
+            if out is None:
+                return data.copy()
+            out[...] = data
+            return out
+
+        return self._decompress_data(out)
+
+    def _decompress_data(self, out=None):
+        """
+        Decompress the whole image, returning the scaled image data.  If
+        ``out`` is given the data are decompressed and scaled into it.
+
+        If ``pyfits.COMPRESSION_THREADS`` is greater than one the image is
+        split into bands of whole tiles along its last axis, which are
+        decompressed concurrently directly into the output array.  Images that
+        need scaling are also decompressed in bands, so that the raw data for
+        only a part of the image is held in memory at a time.
+        """
+
+        from pyfits import COMPRESSION_THREADS
+
+        # The compressed data must be loaded before starting any threads, as
+        # the compression module does not hold a reference to it while
+        # decompressing
+        compressed_data = self.compressed_data
+        shape = self.shape
+        scaled = self._orig_bzero != 0 or self._orig_bscale != 1
+
+        if (compressed_data is None or not len(compressed_data) or
+                0 in shape or
+                (scaled and 'ZBLANK' in compressed_data.columns.names)):
+            data = compression.decompress_hdu(self)
+            if data is None:
+                return data
+            return self._scale_data(data, out)
+
+        if out is None and not scaled and COMPRESSION_THREADS < 2:
+            return compression.decompress_hdu(self)
+
+        nbands = COMPRESSION_THREADS
+        if scaled:
+            raw_nbytes = (np.dtype(BITPIX2DTYPE[self._header['ZBITPIX']])
+                          .itemsize * int(np.prod(shape)))
+            nbands = max(nbands, raw_nbytes // _DECOMPRESS_CHUNK_SIZE)
+        bands = self._tile_bands(nbands) or [(0, shape[0])]
+
+        if out is None:
+            out = np.empty(shape, dtype=self._scaled_dtype())
+
+        naxis = len(shape)
+
+        def decompress_band(band):
+            start, stop = band
+            # CFITSIO uses the FITS (Fortran) axis order
+            first = [1] * naxis
+            last = list(reversed(shape))
+            first[-1] = start + 1
+            last[-1] = stop
+            if scaled:
+                data = compression.decompress_hdu_section(
+                    self, first, last, [1] * naxis)
+                self._scale_data(data, out[start:stop])
+            else:
+                compression.decompress_hdu_section(self, first, last,
+                                                   [1] * naxis,
+                                                   out[start:stop])
+
+        # Multiple bands from _tile_bands can always be decompressed in
+        # separate threads
+        if COMPRESSION_THREADS > 1 and len(bands) > 1:
+            pool = ThreadPool(min(COMPRESSION_THREADS, len(bands)))
+            try:
+                pool.map(decompress_band, bands)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for band in bands:
+                decompress_band(band)
+
+        return out
+
+    def _scale_data(self, data, out=None):
+        """
+        Apply the BSCALE/BZERO (and ZBLANK) of the image to raw decompressed
+        image data, returning the scaled data.  If ``out`` is given (with the
+        dtype returned by `_scaled_dtype`) the scaled data are written into it
+        instead of a new array.
+        """
+
+        if self._orig_bzero == 0 and self._orig_bscale == 1:
+            if out is None:
+                return data
+            out[...] = data
+            return out
+
+        zblank = self._zblank()
+        if out is None:
+            out = np.empty(data.shape, dtype=self._scaled_dtype())
+        out[...] = data
+
+        if self._bscale != 1:
+            np.multiply(out, self._bscale, out)
+        if self._bzero != 0:
+            out += self._bzero
+
+        if zblank is not None:
+            out[data == zblank] = np.nan
+
+        return out
+
+    def _scaled_dtype(self):
+        """
+        The dtype of the image data after applying any BSCALE/BZERO scaling.
+        """
+
+        dtype = np.dtype(BITPIX2DTYPE[self._header['ZBITPIX']])
+        if self._orig_bzero == 0 and self._orig_bscale == 1:
+            return dtype
+
+        dtype = self._dtype_for_bitpix() or dtype
+        if dtype.kind != 'f' and self._zblank() is not None:
+            # Blank pixels are replaced with NaN
+            dtype = np.dtype('float64')
+        return dtype
+
+    def _zblank(self):
+        """
+        The value (or for each tile, the values) of the blank pixels in the
+        raw image data, or `None`.
+        """
+
+        if 'ZBLANK' in self.compressed_data.columns.names:
+            return self.compressed_data['ZBLANK']
+        elif 'ZBLANK' in self._header:
+            return np.array(self._header['ZBLANK'], dtype='int32')
+        elif 'BLANK' in self._header:
+            return np.array(self._header['BLANK'], dtype='int32')
+
     @lazyproperty
     def compressed_data(self):
         # First we will get the table data (the compressed
@@ -1669,7 +1878,7 @@ class CompImageHDU(BinTableHDU):
             # self.compressed_data, and writes directly to it
             # compress_hdu returns the size of the heap for the written
             # compressed image table
-            heapsize, self.compressed_data = compression.compress_hdu(self)
+            heapsize, self.compressed_data = self._compress_data()
         finally:
             # if data was byteswapped return it to its original order
             if should_swap:
@@ -1686,6 +1895,149 @@ class CompImageHDU(BinTableHDU):
         self.compressed_data._heapoffset = self._theap
         self.compressed_data._heapsize = heapsize
 
+    def _compress_data(self):
+        """
+        Compress the image data, returning the size of the heap and a byte
+        array containing the compressed data table followed by its heap.
+
+        If ``pyfits.COMPRESSION_THREADS`` is greater than one the image is
+        split into bands of whole tiles along its last axis, which are
+        compressed concurrently.  The compressed bands are then joined back
+        together, giving exactly the same result as compressing the whole
+        image at once.
+        """
+
+        from pyfits import COMPRESSION_THREADS
+
+        bands = self._compression_bands(COMPRESSION_THREADS)
+        if len(bands) < 2:
+            return compression.compress_hdu(self)
+
+        pool = ThreadPool(min(COMPRESSION_THREADS, len(bands)))
+        try:
+            results = pool.map(compression.compress_hdu, bands)
+        finally:
+            pool.close()
+            pool.join()
+
+        rowlen = self._header['NAXIS1']
+        tbsize = rowlen * self._header['NAXIS2']
+        heapsize = sum(int(band_heapsize) for band_heapsize, _ in results)
+        buf = np.empty(tbsize + heapsize, dtype=np.uint8)
+
+        dtype = self.columns.dtype.newbyteorder('>')
+        descriptors = [name for name, recformat in
+                       zip(self.columns.names, self.columns._recformats)
+                       if isinstance(recformat, _FormatP)]
+
+        table_offset = 0
+        heap_offset = 0
+        for band, (band_heapsize, band_buf) in zip(bands, results):
+            band_tbsize = rowlen * band._header['NAXIS2']
+            table = buf[table_offset:table_offset + band_tbsize]
+            table[:] = band_buf[:band_tbsize]
+
+            # The heap offsets in the array descriptors of each band are
+            # relative to the start of that band's heap
+            table = table.view(dtype)
+            for name in descriptors:
+                offsets = table[name][:, 1]
+                offsets[table[name][:, 0] > 0] += heap_offset
+
+            heap_start = tbsize + heap_offset
+            buf[heap_start:heap_start + band_heapsize] = \
+                band_buf[band_tbsize:band_tbsize + band_heapsize]
+
+            table_offset += band_tbsize
+            heap_offset += band_heapsize
+
+        return heapsize, buf
+
+    def _tile_shape(self):
+        """
+        The shape of the image tiles, in the same (numpy) axis order as
+        ``self.shape``.
+        """
+
+        naxis = self._header['ZNAXIS']
+        # Tiles default to one row of the image
+        return tuple(
+            self._header.get('ZTILE%d' % idx,
+                             self._header['ZNAXIS1'] if idx == 1 else 1)
+            for idx in range(naxis, 0, -1))
+
+    def _tile_bands(self, nbands):
+        """
+        Split the image into up to ``nbands`` bands of whole tiles along its
+        last axis (the first axis of ``self.data``) which can be compressed or
+        decompressed independently of each other, returned as a list of
+        ``(start, stop)`` ranges of indices into the first axis of the data.
+
+        Returns an empty list if the image can't or needn't be split.
+        """
+
+        naxis = self._header.get('ZNAXIS', 0)
+        if nbands < 2 or naxis < 1 or not self._header.get('NAXIS2'):
+            return []
+
+        length = self._header['ZNAXIS%d' % naxis]
+        tile_length = self._tile_shape()[0]
+        nslabs = (length + tile_length - 1) // tile_length
+
+        if (nslabs < 2 or
+                # CFITSIO's HCOMPRESS implementation is not thread-safe
+                self._header.get('ZCMPTYPE') == 'HCOMPRESS_1'):
+            return []
+
+        nbands = min(nbands, nslabs)
+        bands = []
+        for idx in range(nbands):
+            start = nslabs * idx // nbands
+            stop = nslabs * (idx + 1) // nbands
+            bands.append((start * tile_length,
+                          min(stop * tile_length, length)))
+
+        return bands
+
+    def _compression_bands(self, nbands):
+        """
+        Split the image into bands of whole tiles with `_tile_bands`, returning
+        for each band an object with the header and data needed to compress it
+        with ``compression.compress_hdu``.
+        """
+
+        bands = self._tile_bands(nbands)
+        if not bands:
+            return []
+
+        # The quantization dither of each tile depends on its tile number,
+        # so each band's dither seed is offset by the number of tiles
+        # preceding it
+        dither = self._header.get('ZQUANTIZ', '').startswith('SUBTRACTIVE')
+        if dither and 'ZDITHER0' not in self._header:
+            return []
+
+        naxis = self._header['ZNAXIS']
+        tile_length = self._tile_shape()[0]
+        nslabs = ((self._header['ZNAXIS%d' % naxis] + tile_length - 1) //
+                  tile_length)
+        tiles_per_slab = self._header['NAXIS2'] // nslabs
+
+        compression_bands = []
+        for start, stop in bands:
+            first_tile = (start // tile_length) * tiles_per_slab
+            header = self._header.copy()
+            header['NAXIS2'] = (((stop - start + tile_length - 1) //
+                                 tile_length) * tiles_per_slab)
+            header['ZNAXIS%d' % naxis] = stop - start
+            if dither:
+                header['ZDITHER0'] = ((header['ZDITHER0'] - 1 + first_tile) %
+                                      10000) + 1
+            compression_bands.append(
+                _CompressionBand(header, self.data[start:stop]))
+
+        return compression_bands
+
     @deprecated('3.2', alternative='(refactor your code)')
     def updateCompressedData(self):
         self._update_compressed_data()
@@ -1931,25 +2283,7 @@ class CompImageHDU(BinTableHDU):
                 "image tile (got %s)" % seed)
 
         if seed == DITHER_SEED_CHECKSUM:
-            # Determine the tile dimensions from the ZTILEn keywords
-            naxis = self._header['ZNAXIS']
-            tile_dims = [self._header['ZTILE%d' % (idx + 1)]
-                         for idx in range(naxis)]
-            tile_dims.reverse()
-
-            # Get the first tile by using the tile dimensions as the end
-            # indices of slices (starting from 0)
-            first_tile = self.data[tuple(slice(d) for d in tile_dims)]
-
-            # The checksum algorithm used is literally just the sum of the bytes
-            # of the tile data (not its actual floating point values).  Integer
-            # overflow is irrelevant.
-            csum = first_tile.view(dtype='uint8').sum()
-
-            # Since CFITSIO uses an unsigned long (which may be different on
-            # different platforms) go ahead and truncate the sum to its
-            # unsigned long value and take the result modulo 10000
-            return (ctypes.c_ulong(csum).value % 10000) + 1
+            return _checksum_dither_seed(self._header, self.data)
         elif seed == DITHER_SEED_CLOCK:
             # This isn't exactly the same algorithm as CFITSIO, but that's okay
             # since the result is meant to be arbitrary. The primary difference
@@ -1961,3 +2295,254 @@ class CompImageHDU(BinTableHDU):
                     10000) + 1
         else:
             return seed
+
+
+def _checksum_dither_seed(header, data):
+    """
+    Generate a dither seed from a checksum of the first tile of the image
+    ``data``, with the tile dimensions given by the ``ZTILEn`` keywords of the
+    compressed image table ``header``.
+    """
+
+    # Determine the tile dimensions from the ZTILEn keywords
+    naxis = header['ZNAXIS']
+    tile_dims = [header['ZTILE%d' % (idx + 1)] for idx in range(naxis)]
+    tile_dims.reverse()
+
+    # Get the first tile by using the tile dimensions as the end
+    # indices of slices (starting from 0)
+    first_tile = data[tuple(slice(d) for d in tile_dims)]
+
+    # The checksum algorithm used is literally just the sum of the bytes
+    # of the tile data (not its actual floating point values).  Integer
+    # overflow is irrelevant.
+    csum = np.ascontiguousarray(first_tile).view(dtype='uint8').sum()
+
+    # Since CFITSIO uses an unsigned long (which may be different on
+    # different platforms) go ahead and truncate the sum to its
+    # unsigned long value and take the result modulo 10000
+    return (ctypes.c_ulong(csum).value % 10000) + 1
+
+
+class _CompressionBand(object):
+    """
+    A band of whole tiles of a `CompImageHDU` to be compressed on its own;
+    this has just the attributes of the HDU used by
+    ``compression.compress_hdu``.
+    """
+
+    def __init__(self, header, data):
+        self._header = header
+        self.data = data
+
+
+class CompImageSection(object):
+    """
+    Compressed image section.
+
+    Slices of this object decompress only the tiles of a compressed image
+    that overlap the slice, and apply any BSCALE/BZERO factors.  This makes it
+    possible to read small cutouts of very large compressed images without
+    decompressing the whole image.
+
+    Section slices cannot be assigned to, and modifications to a section are
+    not saved back to the underlying file.
+    """
+
+    def __init__(self, hdu):
+        self.hdu = hdu
+
+    def __getitem__(self, key):
+        if self.hdu._data_loaded:
+            return self.hdu.data[key]
+
+        shape = self.hdu.shape
+        naxis = len(shape)
+
+        if not isinstance(key, tuple):
+            key = (key,)
+        ellipsis_count = len([k for k in key if k is Ellipsis])
+        if len(key) - ellipsis_count > naxis or ellipsis_count > 1:
+            raise IndexError('too many indices for array')
+        if not ellipsis_count:
+            key += (Ellipsis,)
+        # Replace the ellipsis with as many full slices as needed
+        idx = next(i for i, k in enumerate(key) if k is Ellipsis)
+        key = (key[:idx] + (slice(None),) * (naxis - len(key) + 1) +
+               key[idx + 1:])
+
+        # For each axis determine the bounding range of pixels to decompress
+        # (in the FITS convention of one-based inclusive ranges) and the
+        # index into the decompressed bounding box that gives the result
+        first = []
+        last = []
+        inc = []
+        box_shape = []
+        box_key = []
+        for k, axis in zip(key, shape):
+            if _is_int(k):
+                if k < 0:
+                    k += axis
+                if not 0 <= k < axis:
+                    raise IndexError('index %d is out of bounds for axis '
+                                     'with size %d' % (k, axis))
+                start, stop, step = k, k, 1
+                box_key.append(0)
+            elif isinstance(k, slice):
+                indices = range(*k.indices(axis))
+                if len(indices) > 1 and indices[1] < indices[0]:
+                    # Decompress in increasing order and then reverse
+                    start, stop = indices[-1], indices[0]
+                    step = indices[0] - indices[1]
+                    box_key.append(slice(None, None, -1))
+                else:
+                    if len(indices):
+                        start, stop = indices[0], indices[-1]
+                    else:
+                        start, stop = 0, -1
+                    step = indices[1] - indices[0] if len(indices) > 1 else 1
+                    box_key.append(slice(None))
+            else:
+                # Integer or boolean array indices
+                indices = np.arange(axis)[k]
+                if indices.size:
+                    start = indices.min()
+                    stop = indices.max()
+                else:
+                    start, stop = 0, -1
+                step = 1
+                box_key.append(indices - start)
+
+            first.append(start + 1)
+            last.append(stop + 1)
+            inc.append(step)
+            box_shape.append(max(0, (stop - start) // step + 1))
+
+        if 0 in box_shape:
+            # Nothing to decompress; just return an empty array of the
+            # appropriate type
+            dtype = BITPIX2DTYPE[self.hdu._orig_bitpix]
+            data = self.hdu._scale_data(np.empty(box_shape, dtype=dtype))
+        else:
+            if self.hdu.tile_cache_size > 0:
+                data = self._decompress_tiles(first, last, inc, box_shape)
+            else:
+                # CFITSIO uses the FITS (Fortran) axis order
+                data = compression.decompress_hdu_section(
+                    self.hdu, first[::-1], last[::-1], inc[::-1])
+            if data is None:
+                return data
+            data = self.hdu._scale_data(data)
+
+        return data[tuple(box_key)]
+
+    def _decompress_tiles(self, first, last, inc, box_shape):
+        """
+        Decompress the pixels from ``first`` to ``last`` (one-based and
+        inclusive) with step ``inc`` along each axis one tile at a time,
+        taking the decompressed tiles from the HDU's tile cache where
+        possible.
+        """
+
+        hdu = self.hdu
+        cache = hdu._tile_cache
+        cache.validate(hdu.compressed_data)
+
+        # For each axis list the tiles that contain any of the selected
+        # pixels, with the slice of the selected pixels within the tile and
+        # the corresponding slice of the output
+        axes = []
+        for start, stop, step, length, tile_length in zip(
+                first, last, inc, hdu.shape, hdu._tile_shape()):
+            start -= 1
+            stop -= 1
+            tiles = []
+            for idx in range(start // tile_length, stop // tile_length + 1):
+                tile_start = idx * tile_length
+                tile_stop = min(tile_start + tile_length, length)
+                # The first selected pixel in the tile (if any)
+                pix_start = start + max(0, -((start - tile_start) // step) *
+                                        step)
+                pix_stop = min(stop, tile_stop - 1)
+                if pix_start > pix_stop:
+                    continue
+                tiles.append((idx, tile_start, tile_stop,
+                              slice(pix_start - tile_start,
+                                    pix_stop - tile_start + 1, step),
+                              slice((pix_start - start) // step,
+                                    (pix_stop - start) // step + 1)))
+            axes.append(tiles)
+
+        naxis = len(axes)
+        data = np.empty(box_shape, dtype=BITPIX2DTYPE[hdu._header['ZBITPIX']])
+        for tiles in itertools.product(*axes):
+            key = tuple(tile[0] for tile in tiles)
+            tile_data = cache.get(key)
+            if tile_data is None:
+                # CFITSIO uses the FITS (Fortran) axis order
+                tile_data = compression.decompress_hdu_section(
+                    hdu, [tile[1] + 1 for tile in reversed(tiles)],
+                    [tile[2] for tile in reversed(tiles)], [1] * naxis)
+                if tile_data is None:
+                    return None
+                cache.add(key, tile_data)
+            data[tuple(tile[4] for tile in tiles)] = \
+                tile_data[tuple(tile[3] for tile in tiles)]
+
+        return data
+
+
+class _TileCache(object):
+    """
+    A least recently used cache of the decompressed tiles of a
+    `CompImageHDU`, keyed on tile indices and limited to a maximum total size
+    in bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._tiles = OrderedDict()
+        self._source = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def validate(self, compressed_data):
+        """
+        Clear the cache if its tiles were decompressed from compressed data
+        other than ``compressed_data``.
+        """
+
+        with self._lock:
+            if self._source is None or self._source() is not compressed_data:
+                self._tiles.clear()
+                self.nbytes = 0
+                self._source = weakref.ref(compressed_data)
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.pop(key, None)
+            if tile is not None:
+                # Move the tile to the most recently used end
+                self._tiles[key] = tile
+            return tile
+
+    def add(self, key, tile):
+        with self._lock:
+            if key in self._tiles or tile.nbytes > self.max_bytes:
+                return
+            self._tiles[key] = tile
+            self.nbytes += tile.nbytes
+            self._evict()
+
+    def resize(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes:
+            _, tile = self._tiles.popitem(last=False)
+            self.nbytes -= tile.nbytes
@@ -2,10 +2,14 @@ import gzip
 import os
 import shutil
 import sys
+import threading
 import warnings
 
+from collections import namedtuple
+
 from ..extern.six import print_, string_types
 from ..file import _File
+from ..py3compat import OrderedDict
 from ..util import (_is_int, _tmp_name, _pad_length, ignore_sigint,
                     _get_array_mmap, indent, fileobj_closed,
                     PyfitsDeprecationWarning)
@@ -16,6 +20,81 @@ from .groups import GroupsHDU
 from .image import PrimaryHDU, ImageHDU
 
 
+# Index entry recording where an HDU is located in a file, along with enough
+# information to look it up by name without reading its header
+_HDUIndexEntry = namedtuple('_HDUIndexEntry',
+                            ['header_offset', 'data_offset', 'data_size',
+                             'name', 'ver', 'xtension'])
+
+# In-memory cache of HDU offset indices, keyed on the absolute path of each
+# file; each value is a ``((mtime, size), entries)`` tuple, and the index is
+# only used if the file's current modification time and size still match.
+# Only the indices of the ``pyfits.HDU_INDEX_CACHE_SIZE`` most recently used
+# files are kept.
+_HDU_INDEX_CACHE = OrderedDict()
+_HDU_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def _hdu_index_key(fileobj):
+    """
+    Returns the ``(path, (mtime, size))`` key used to look up the HDU offset
+    index of the given `_File` in the index cache, or `None` if the file does
+    not have a usable index (for example if it is not a plain file on disk).
+    """
+
+    if fileobj.compression is not None or fileobj.mode == 'ostream':
+        return None
+
+    name = fileobj.name
+    if not isinstance(name, string_types) or not os.path.isfile(name):
+        return None
+
+    try:
+        stat = os.stat(name)
+    except OSError:
+        return None
+
+    return os.path.abspath(name), (stat.st_mtime, stat.st_size)
+
+
+def _get_hdu_index(key):
+    """
+    Returns the cached HDU offset index for the given key (as returned by
+    `_hdu_index_key`), or `None` if there is no index or it is stale.
+    """
+
+    if key is None:
+        return None
+
+    path, stamp = key
+    with _HDU_INDEX_CACHE_LOCK:
+        cached = _HDU_INDEX_CACHE.pop(path, None)
+        if cached is None or cached[0] != stamp:
+            return None
+
+        # Move the index to the most recently used end
+        _HDU_INDEX_CACHE[path] = cached
+
+    return cached[1]
+
+
+def _add_hdu_index(path, stamp, entries):
+    """
+    Records the HDU offset index of the file at ``path`` in the index cache,
+    discarding the least recently used indices beyond
+    ``pyfits.HDU_INDEX_CACHE_SIZE``.
+    """
+
+    from pyfits import HDU_INDEX_CACHE_SIZE
+
+    with _HDU_INDEX_CACHE_LOCK:
+        _HDU_INDEX_CACHE.pop(path, None)
+        if HDU_INDEX_CACHE_SIZE > 0:
+            _HDU_INDEX_CACHE[path] = (stamp, entries)
+        while len(_HDU_INDEX_CACHE) > max(HDU_INDEX_CACHE_SIZE, 0):
+            _HDU_INDEX_CACHE.popitem(last=False)
+
+
 def fitsopen(name, mode='readonly', memmap=None, save_backup=False, **kwargs):
     """Factory function to open a FITS file and return an `HDUList` object.
 
@@ -93,6 +172,15 @@ def fitsopen(name, mode='readonly', memmap=None, save_backup=False, **kwargs):
             if scaling back to integer values after performing floating point
             operations on the data.
 
+        - **lazy_load_hdus** : bool
+
+            If `True` (the default is taken from ``pyfits.LAZY_LOAD_HDUS``)
+            only the first HDU is read when the file is opened; the headers
+            of subsequent HDUs are read on demand as they are accessed by
+            index, name, or iteration.  Operations that need the whole list,
+            such as ``len()``, ``info()``, or modifying the list, read all
+            remaining HDUs.  If `False` all HDUs are read immediately.
+
     Returns
     -------
         hdulist : an `HDUList` object
@@ -118,6 +206,10 @@ def fitsopen(name, mode='readonly', memmap=None, save_backup=False, **kwargs):
         from pyfits import ENABLE_UINT
         kwargs['uint'] = ENABLE_UINT
 
+    if 'lazy_load_hdus' not in kwargs:
+        from pyfits import LAZY_LOAD_HDUS
+        kwargs['lazy_load_hdus'] = LAZY_LOAD_HDUS
+
     if not name:
         raise ValueError('Empty filename: %s' % repr(name))
 
@@ -147,6 +239,24 @@ class HDUList(list, _Verify):
         self._file = file
         self._save_backup = False
 
+        # The keyword arguments passed to fitsopen/HDUList.fromstring, and the
+        # remaining unread buffer in the fromstring case; both are needed to
+        # read further HDUs on demand when lazy loading
+        self._open_kwargs = {}
+        self._data = None
+        self._in_read_next_hdu = False
+
+        # The offset index for the associated file (if any), used to seek
+        # directly to HDUs without reading the headers preceding them; HDUs
+        # that have not been read yet are represented by `None` in the list
+        self._hdu_index_key = None
+        self._hdu_index = None
+
+        # Whether or not all HDUs have been read from the associated file (if
+        # any); this is only set to False by HDUList._readfrom, when there are
+        # actually more HDUs to read on demand
+        self._read_all = True
+
         if hdus is None:
             hdus = []
 
@@ -165,9 +275,26 @@ class HDUList(list, _Verify):
 
         self.update_extend()
 
+    def __len__(self):
+        if not self._in_read_next_hdu:
+            self._read_all_hdus()
+
+        return super(HDUList, self).__len__()
+
+    def __repr__(self):
+        self._read_all_hdus()
+        return super(HDUList, self).__repr__()
+
     def __iter__(self):
-        for idx in range(len(self)):
-            yield self[idx]
+        # Don't use len() here, since that would defeat lazy loading of HDUs
+        idx = 0
+        while True:
+            try:
+                hdu = self[idx]
+            except IndexError:
+                break
+            yield hdu
+            idx += 1
 
     def __getitem__(self, key):
         """
@@ -175,10 +302,34 @@ class HDUList(list, _Verify):
         """
 
         if isinstance(key, slice):
+            start, stop = key.start, key.stop
+            if key.step is not None and key.step < 0:
+                # A negative step runs down from start to stop, so start is
+                # the highest index in the slice
+                if start is None or start < 0:
+                    start, stop = stop, None
+                else:
+                    start, stop = stop, start + 1
+
+            if (stop is None or stop < 0 or
+                    (start is not None and start < 0)):
+                self._read_all_hdus()
+            else:
+                self._read_hdus_until(stop - 1)
+                nhdus = super(HDUList, self).__len__()
+                for idx in range(*key.indices(nhdus)):
+                    self._read_hdu_at(idx)
             hdus = super(HDUList, self).__getitem__(key)
             return HDUList(hdus)
 
         idx = self.index_of(key)
+
+        if idx < 0:
+            self._read_all_hdus()
+        else:
+            self._read_hdus_until(idx)
+            self._read_hdu_at(idx)
+
         return super(HDUList, self).__getitem__(idx)
 
     def __contains__(self, item):
@@ -196,6 +347,7 @@ class HDUList(list, _Verify):
         Set an HDU to the `HDUList`, indexed by number or name.
         """
 
+        self._read_all_hdus()
         _key = self.index_of(key)
         if isinstance(hdu, (slice, list)):
             if _is_int(_key):
@@ -220,6 +372,8 @@ class HDUList(list, _Verify):
         Delete an HDU from the `HDUList`, indexed by number or name.
         """
 
+        self._read_all_hdus()
+
         if isinstance(key, slice):
             end_index = len(self)
         else:
@@ -378,6 +532,7 @@ class HDUList(list, _Verify):
         if not isinstance(hdu, _BaseHDU):
             raise ValueError('%s is not an HDU.' % hdu)
 
+        self._read_all_hdus()
         num_hdus = len(self)
 
         if index == 0 or num_hdus == 0:
@@ -440,6 +595,9 @@ class HDUList(list, _Verify):
         if not isinstance(hdu, _BaseHDU):
             raise ValueError('HDUList can only append an HDU.')
 
+        if not self._in_read_next_hdu:
+            self._read_all_hdus()
+
         if len(self) > 0:
             if isinstance(hdu, GroupsHDU):
                 raise ValueError(
@@ -474,6 +632,17 @@ class HDUList(list, _Verify):
         # make sure the EXTEND keyword is in primary HDU if there is extension
         self.update_extend()
 
+    def pop(self, index=-1):
+        """
+        Remove and return the HDU at the given index (the last HDU by
+        default), similar to `list.pop`.
+        """
+
+        self._read_all_hdus()
+        hdu = self[index]
+        del self[index]
+        return hdu
+
     def index_of(self, key):
         """
         Get the index of an HDU from the `HDUList`.
@@ -489,6 +658,15 @@ class HDUList(list, _Verify):
         -------
         index : int
            The index of the HDU in the `HDUList`.
+
+        Notes
+        -----
+        When HDUs are lazy-loaded, only the HDUs read so far are checked for
+        duplicate matches; if none of them match, further HDUs are read from
+        the file only until the first match is found.  If an HDU offset index
+        is available for the file (see `pyfits.build_hdu_index`) the
+        unread HDUs are instead looked up in the index, without reading any
+        of their headers.
         """
 
         if _is_int(key):
@@ -503,15 +681,36 @@ class HDUList(list, _Verify):
             raise KeyError(key)
         _key = (_key.strip()).upper()
 
-        nfound = 0
-        found = None
-        for idx, hdu in enumerate(self):
+        def match(idx, hdu):
             name = hdu.name
             if isinstance(name, string_types):
                 name = name.strip().upper()
             # 'PRIMARY' should always work as a reference to the first HDU
-            if ((name == _key or (_key == 'PRIMARY' and idx == 0)) and
-                (_ver is None or _ver == hdu.ver)):
+            return ((name == _key or (_key == 'PRIMARY' and idx == 0)) and
+                    (_ver is None or _ver == hdu.ver))
+
+        nfound = 0
+        found = None
+        hdus = list.__iter__(self)
+        for idx, hdu in enumerate(hdus):
+            if hdu is not None and match(idx, hdu):
+                found = idx
+                nfound += 1
+
+        if self._hdu_index is not None and not self._read_all:
+            # Check the HDUs that have not been read yet against the index
+            nhdus = super(HDUList, self).__len__()
+            for idx, entry in enumerate(self._hdu_index):
+                if (idx < nhdus and
+                        super(HDUList, self).__getitem__(idx) is not None):
+                    continue
+                if match(idx, entry):
+                    found = idx
+                    nfound += 1
+
+        while nfound == 0 and self._read_next_hdu():
+            idx = super(HDUList, self).__len__() - 1
+            if match(idx, super(HDUList, self).__getitem__(idx)):
                 found = idx
                 nfound += 1
 
@@ -532,6 +731,53 @@ class HDUList(list, _Verify):
             if hdu.data is not None:
                 continue
 
+    def _read_all_hdus(self):
+        """
+        Read the headers of all HDUs that have not yet been lazily loaded from
+        the associated file.
+        """
+
+        while self._read_next_hdu():
+            pass
+
+        for idx in range(super(HDUList, self).__len__()):
+            self._read_hdu_at(idx)
+
+    def _read_hdus_until(self, index):
+        """
+        Lazily read HDUs until the HDU at the given (non-negative) index has
+        been read, or until there are no more HDUs in the file.
+
+        If the HDU offset index for the file covers the requested HDU it is
+        read directly, and the HDUs preceding it that have not been read yet
+        are left as placeholders to be read on demand.
+        """
+
+        nhdus = super(HDUList, self).__len__()
+
+        if (nhdus <= index and nhdus > 0 and not self._read_all and
+                self._hdu_index is not None and
+                index < len(self._hdu_index)):
+            list.extend(self, [None] * (index - nhdus + 1))
+            self._read_hdu_at(index)
+            return
+
+        while (super(HDUList, self).__len__() <= index and
+               self._read_next_hdu()):
+            pass
+
+    def _read_hdu_at(self, index):
+        """
+        If the HDU at the given index is a placeholder for an HDU that has not
+        been read yet, read it from the offset recorded in the HDU index.
+        """
+
+        if (index >= super(HDUList, self).__len__() or
+                super(HDUList, self).__getitem__(index) is not None):
+            return
+
+        self._read_hdu(index)
+
     @ignore_sigint
     def flush(self, output_verify='fix', verbose=False):
         """
@@ -704,11 +950,16 @@ class HDUList(list, _Verify):
                 self.flush(output_verify=output_verify, verbose=verbose)
 
             if closed and hasattr(self._file, 'close'):
+                # HDUs that were not lazily loaded yet can't be read once the
+                # file is closed, so read them now to leave a complete list
+                self._read_all_hdus()
                 self._file.close()
 
-        # Give individual HDUs an opportunity to do on-close cleanup
-        for hdu in self:
-            hdu._close(closed=closed)
+        # Give individual HDUs an opportunity to do on-close cleanup; only the
+        # HDUs that were actually read need this
+        for hdu in list.__iter__(self):
+            if hdu is not None:
+                hdu._close(closed=closed)
 
     def info(self, output=None):
         """
@@ -802,66 +1053,172 @@ class HDUList(list, _Verify):
             # _BaseHDU.fromstring call.
 
         hdulist._save_backup = save_backup
+        hdulist._open_kwargs = kwargs
+        lazy_load_hdus = kwargs.pop('lazy_load_hdus', False)
+
+        if fileobj is not None and ffo.writeonly:
+            # Output stream--not interested in reading/parsing
+            # the HDUs--just writing to the output file
+            return hdulist
+
+        if fileobj is None:
+            hdulist._data = data
+        elif lazy_load_hdus and mode in ('readonly', 'denywrite'):
+            hdulist._hdu_index_key = _hdu_index_key(ffo)
+            hdulist._hdu_index = _get_hdu_index(hdulist._hdu_index_key)
+        elif mode in ('readonly', 'denywrite'):
+            # The index can still be recorded once all HDUs have been read
+            hdulist._hdu_index_key = _hdu_index_key(ffo)
+
+        hdulist._read_all = False
+
+        # Read the first HDU (or all HDUs if not lazy loading)
+        hdulist._read_next_hdu()
+        if not lazy_load_hdus:
+            hdulist._read_all_hdus()
+
+        # If we're trying to read only and no header units were found,
+        # raise and exception
+        if (mode in ('readonly', 'denywrite') and
+                super(HDUList, hdulist).__len__() == 0):
+            raise IOError('Empty or corrupt FITS file')
+
+        # initialize/reset attributes to be used in "update/append" mode
+        hdulist._resize = False
+        hdulist._truncate = False
+
+        return hdulist
+
+    def _read_next_hdu(self):
+        """
+        Read the next HDU from the file or data buffer the `HDUList` was
+        opened from, unless all HDUs have already been read.
+
+        Returns `True` if a new HDU was read, or `False` otherwise.
+        """
+
+        if self._read_all:
+            return False
+
+        return self._read_hdu(super(HDUList, self).__len__())
+
+    def _read_hdu(self, index):
+        """
+        Read the HDU at the given index, which must either be the index of a
+        placeholder for an unread HDU, or the index following the last HDU
+        read so far.
+
+        Returns `True` if the HDU was read, or `False` otherwise.
+        """
+
+        fileobj, data, kwargs = self._file, self._data, self._open_kwargs
+
+        if fileobj is not None and fileobj.closed:
+            return False
+
+        nhdus = super(HDUList, self).__len__()
+        placeholder = index < nhdus
+        index_entries = self._hdu_index
 
         saved_compression_enabled = compressed.COMPRESSION_ENABLED
+        # Reading an HDU is not a modification of the HDUList
+        saved_resize = getattr(self, '_resize', False)
+        saved_truncate = getattr(self, '_truncate', False)
 
         try:
+            self._in_read_next_hdu = True
+
             if ('disable_image_compression' in kwargs and
                 kwargs['disable_image_compression']):
                 compressed.COMPRESSION_ENABLED = False
 
-            # read all HDUs
-            while True:
-                try:
-                    if fileobj is not None:
-                        if ffo.writeonly:
-                            # Output stream--not interested in reading/parsing
-                            # the HDUs--just writing to the output file
-                            return hdulist
-
-                        try:
-                            hdu = _BaseHDU.readfrom(ffo, **kwargs)
-                        except EOFError:
-                            break
-                        except IOError:
-                            if ffo.writeonly:
-                                break
-                            else:
-                                raise
-                    else:
-                        if not data:
-                            break
-                        hdu = _BaseHDU.fromstring(data)
-                        data = data[hdu._data_offset + hdu._data_size:]
-                    hdulist.append(hdu)
-                    hdu._new = False
-                    if 'checksum' in kwargs:
-                        hdu._output_checksum = kwargs['checksum']
-                # check in the case there is extra space after the last HDU or
-                # corrupted HDU
-                except (VerifyError, ValueError) as exc:
-                    warnings.warn(
-                        'Error validating header for HDU #%d (note: PyFITS '
-                        'uses zero-based indexing).\n%s\n'
-                        'There may be extra bytes after the last HDU or the '
-                        'file is corrupted.' %
-                        (len(hdulist), indent(str(exc))), VerifyWarning)
-                    del exc
-                    break
-
-            # If we're trying to read only and no header units were found,
-            # raise and exception
-            if mode in ('readonly', 'denywrite') and len(hdulist) == 0:
-                raise IOError('Empty or corrupt FITS file')
-
-            # initialize/reset attributes to be used in "update/append" mode
-            hdulist._resize = False
-            hdulist._truncate = False
+            try:
+                if fileobj is not None:
+                    # Make sure we're at the start of the HDU, since the file
+                    # may have been read from since the last HDU was read
+                    if (index_entries is not None and
+                            index < len(index_entries)):
+                        fileobj.seek(index_entries[index].header_offset,
+                                     os.SEEK_SET)
+                    elif nhdus > 0:
+                        last = super(HDUList, self).__getitem__(-1)
+                        if last._data_offset is not None:
+                            fileobj.seek(last._data_offset + last._data_size,
+                                         os.SEEK_SET)
 
+                    try:
+                        hdu = _BaseHDU.readfrom(fileobj, **kwargs)
+                    except EOFError:
+                        if placeholder:
+                            raise
+                        self._read_all = True
+                        self._save_hdu_index()
+                        return False
+                    except IOError:
+                        if fileobj.writeonly and not placeholder:
+                            self._read_all = True
+                            return False
+                        else:
+                            raise
+                else:
+                    if not data:
+                        self._read_all = True
+                        return False
+                    hdu = _BaseHDU.fromstring(data)
+                    self._data = data[hdu._data_offset + hdu._data_size:]
+
+                if placeholder:
+                    super(HDUList, self).__setitem__(index, hdu)
+                    self.update_extend()
+                else:
+                    self.append(hdu)
+                hdu._new = False
+                if 'checksum' in kwargs:
+                    hdu._output_checksum = kwargs['checksum']
+            # check in the case there is extra space after the last HDU or
+            # corrupted HDU
+            except (VerifyError, ValueError) as exc:
+                if placeholder:
+                    raise
+                warnings.warn(
+                    'Error validating header for HDU #%d (note: PyFITS '
+                    'uses zero-based indexing).\n%s\n'
+                    'There may be extra bytes after the last HDU or the '
+                    'file is corrupted.' %
+                    (nhdus, indent(str(exc))), VerifyWarning)
+                del exc
+                self._read_all = True
+                return False
         finally:
             compressed.COMPRESSION_ENABLED = saved_compression_enabled
+            self._in_read_next_hdu = False
+            self._resize = saved_resize
+            self._truncate = saved_truncate
 
-        return hdulist
+        return True
+
+    def _save_hdu_index(self):
+        """
+        Record the offsets of all HDUs read from the file in the HDU index
+        cache, once the end of the file has been reached.
+        """
+
+        if self._hdu_index_key is None or self._hdu_index is not None:
+            return
+
+        entries = []
+        for hdu in list.__iter__(self):
+            if hdu is None or hdu._header_offset is None:
+                return
+
+            xtension = hdu._header.get('XTENSION')
+            entries.append(_HDUIndexEntry(hdu._header_offset,
+                                          hdu._data_offset, hdu._data_size,
+                                          hdu.name, hdu.ver, xtension))
+
+        path, stamp = self._hdu_index_key
+        _add_hdu_index(path, stamp, entries)
+        self._hdu_index = entries
 
     def _verify(self, option='warn'):
         text = ''
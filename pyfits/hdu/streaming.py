@@ -1,11 +1,27 @@
 import gzip
 import os
+import shutil
+import tempfile
+from multiprocessing.pool import ThreadPool
 
+import numpy as np
+
+from ..extern.six.moves import range
+
+from ..column import (Column, ColDefs, KEYWORD_ATTRIBUTES, _FormatP,
+                      _FormatQ, _RaggedVLF)
 from ..file import _File
-from ..util import _pad_length, fileobj_name
+from ..fitsrec import FITS_rec, _get_recarray_field
+from ..util import _array_to_file, _pad_length, fileobj_name
 from .base import _BaseHDU, BITPIX2DTYPE
+from .compressed import (CompImageHDU, _CompressionBand,
+                         _checksum_dither_seed, DEFAULT_COMPRESSION_TYPE,
+                         DEFAULT_HCOMP_SCALE, DEFAULT_HCOMP_SMOOTH,
+                         DEFAULT_QUANTIZE_LEVEL, DEFAULT_QUANTIZE_METHOD,
+                         DEFAULT_DITHER_SEED, DITHER_SEED_CHECKSUM)
 from .hdulist import HDUList
 from .image import PrimaryHDU
+from .table import BinTableHDU, _binary_table_byte_swap
 
 
 class StreamingHDU(object):
@@ -109,7 +125,7 @@ class StreamingHDU(object):
                     self._header.set('GCOUNT', 1, 'number of groups',
                                      after='PCOUNT')
 
-        self._ffo = _File(name, 'append')
+        self._ffo = self._open_file(name)
 
         # TODO : Fix this once the HDU writing API is cleaned up
         tmp_hdu = _BaseHDU()
@@ -133,6 +149,13 @@ class StreamingHDU(object):
     def __exit__(self, type, value, traceback):
         self.close()
 
+    def _open_file(self, name):
+        """
+        Open the file to which the HDU is streamed, positioned at its end.
+        """
+
+        return _File(name, 'append')
+
     def write(self, data):
         """
         Write the given data to the stream.
@@ -223,3 +246,538 @@ class StreamingHDU(object):
         """
 
         self._ffo.close()
+
+
+class StreamingCompImageHDU(StreamingHDU):
+    """
+    A class that provides the capability to stream image data to a
+    tile-compressed image extension, instead of requiring the whole image to
+    be in memory to be compressed at once.
+
+    The image is written in strips of rows along its last (slowest varying)
+    axis, which is the first axis of the arrays passed to `write`.  Each time
+    the rows for a complete row of tiles have been written those tiles are
+    compressed and appended to the file, so at most one row of tiles of the
+    uncompressed image is held in memory.
+
+    The following pseudocode illustrates its use::
+
+        header = pyfits.Header()
+        header['BITPIX'] = 16
+        header['NAXIS'] = 2
+        header['NAXIS1'] = 4096
+        header['NAXIS2'] = 100000
+
+        shdu = pyfits.StreamingCompImageHDU('filename.fits', header,
+                                            tile_size=[4096, 16])
+
+        for each strip of rows of the image:
+            shdu.write(strip)
+
+        shdu.close()
+    """
+
+    def __init__(self, name, header,
+                 compression_type=DEFAULT_COMPRESSION_TYPE,
+                 tile_size=None,
+                 hcomp_scale=DEFAULT_HCOMP_SCALE,
+                 hcomp_smooth=DEFAULT_HCOMP_SMOOTH,
+                 quantize_level=DEFAULT_QUANTIZE_LEVEL,
+                 quantize_method=DEFAULT_QUANTIZE_METHOD,
+                 dither_seed=DEFAULT_DITHER_SEED):
+        """
+        Construct a `StreamingCompImageHDU` object given a file name and the
+        header of the image.
+
+        Parameters
+        ----------
+        name : file path, file object, or file like object
+            The file to which the compressed image will be streamed.  The
+            compressed data table and the heap size in the header are only
+            known once the whole image has been written, so they are written
+            last and the file must be seekable.  If opened, the file object
+            must be opened in a mode such as 'rb+' or 'wb+'.
+
+        header : `Header` instance
+            The header of the uncompressed image; its ``BITPIX`` and
+            ``NAXISn`` keywords give the type and shape of the image to be
+            written.
+
+        compression_type, tile_size, hcomp_scale, hcomp_smooth, \
+        quantize_level, quantize_method, dither_seed : optional
+            The compression parameters; see `CompImageHDU`.
+
+        Notes
+        -----
+        The header of the compressed image table is written to the end of
+        the file, which is created with a default Primary HDU first if it does
+        not already exist.  The ``PCOUNT`` keyword of that header and the
+        compressed data table itself are filled in when the last row of the
+        image is written.  ``CHECKSUM`` and ``DATASUM`` keywords are not
+        computed for streamed images.
+        """
+
+        if header.get('NAXIS', 0) < 1:
+            raise ValueError('StreamingCompImageHDU requires an image with '
+                             'at least one axis.')
+
+        naxis = header['NAXIS']
+        self._shape = tuple(header['NAXIS%d' % idx]
+                            for idx in range(naxis, 0, -1))
+        self._dtype = np.dtype(BITPIX2DTYPE[header['BITPIX']])
+
+        # Build the compressed image table header from a placeholder array
+        # with the shape and type of the image, but with storage for just one
+        # element.  With DITHER_SEED_CHECKSUM the seed is computed from the
+        # first tile once it is written.
+        placeholder = np.lib.stride_tricks.as_strided(
+            np.zeros(1, dtype=self._dtype), shape=self._shape,
+            strides=(0,) * naxis)
+        self._dither_seed = dither_seed
+        if dither_seed == DITHER_SEED_CHECKSUM:
+            dither_seed = 1
+        hdu = CompImageHDU(data=placeholder, header=header,
+                           compression_type=compression_type,
+                           tile_size=tile_size, hcomp_scale=hcomp_scale,
+                           hcomp_smooth=hcomp_smooth,
+                           quantize_level=quantize_level,
+                           quantize_method=quantize_method,
+                           dither_seed=dither_seed)
+
+        self._columns = hdu.columns
+        self._tile_shape = hdu._tile_shape()
+        tile_length = self._tile_shape[0]
+        nslabs = (self._shape[0] + tile_length - 1) // tile_length
+        self._tiles_per_slab = hdu._header['NAXIS2'] // nslabs
+
+        # The number of rows of the image compressed so far, and a buffer for
+        # the rows of an incomplete row of tiles
+        self._rows = 0
+        self._buffer = None
+        self._nbuffered = 0
+        self._heapsize = 0
+
+        super(StreamingCompImageHDU, self).__init__(name, hdu._header)
+
+        # Reserve the space for the compressed data table ahead of the heap
+        self._table = np.zeros(self._size, dtype=np.uint8)
+        self._ffo.writearray(self._table)
+        self._ffo.flush()
+
+    def _open_file(self, name):
+        ffo = _File(name, 'update')
+        ffo.seek(0, 2)
+        return ffo
+
+    def write(self, data):
+        """
+        Write the given rows of the image to the stream.
+
+        Parameters
+        ----------
+        data : ndarray
+            Rows of the image to stream to the file; the shape of the array
+            must match the shape of the image in all but its first axis.  A
+            single row may also be given without the first axis.
+
+        Returns
+        -------
+        writecomplete : int
+            Flag that when `True` indicates that the whole image has been
+            written to the stream.
+
+        Notes
+        -----
+        Rows that complete a row of tiles are compressed straight away;
+        any remaining rows are copied into a buffer until the rest of their
+        row of tiles is written.  Once the last row of the image has been
+        written the compressed data table and the final header are written
+        and no more data will be accepted.  An attempt to write more rows than
+        the header specified raises an `~.exceptions.IOError` exception and
+        the data is not written.  If the dtype of the input data does not
+        match what is expected by the header a `~.exceptions.TypeError`
+        exception is raised, and if its shape does not match a
+        `~.exceptions.ValueError` exception is raised.
+        """
+
+        rowshape = self._shape[1:]
+        if data.ndim == len(rowshape):
+            data = data[np.newaxis]
+
+        if data.shape[1:] != rowshape:
+            raise ValueError('Supplied data of shape %s does not match the '
+                             'shape of the image rows %s.' %
+                             (data.shape, rowshape))
+
+        if (self.writecomplete or
+                self._rows + self._nbuffered + len(data) > self._shape[0]):
+            raise IOError('Attempt to write more data to the stream than the '
+                          'header specified.')
+
+        if self._dtype.name != data.dtype.name:
+            raise TypeError('Supplied data does not match the type specified '
+                            'in the header.')
+
+        tile_length = self._tile_shape[0]
+        while len(data):
+            slab_length = min(tile_length, self._shape[0] - self._rows)
+            if not self._nbuffered and len(data) >= slab_length:
+                # Compress all the complete rows of tiles directly from the
+                # input
+                if self._rows + len(data) == self._shape[0]:
+                    nrows = len(data)
+                else:
+                    nrows = (len(data) // tile_length) * tile_length
+                self._compress_rows(data[:nrows])
+            else:
+                if self._buffer is None:
+                    self._buffer = np.empty((tile_length,) + rowshape,
+                                            dtype=self._dtype)
+                nrows = min(slab_length - self._nbuffered, len(data))
+                start = self._nbuffered
+                self._buffer[start:start + nrows] = data[:nrows]
+                self._nbuffered += nrows
+                if self._nbuffered == slab_length:
+                    self._nbuffered = 0
+                    self._compress_rows(self._buffer[:slab_length])
+            data = data[nrows:]
+
+        if self._rows == self._shape[0]:
+            self._write_table()
+
+        self._ffo.flush()
+
+        return self.writecomplete
+
+    def _compress_rows(self, rows):
+        """
+        Compress rows of the image spanning whole rows of tiles and append
+        the compressed data to the heap.
+
+        If ``pyfits.COMPRESSION_THREADS`` is greater than one the rows are
+        split into bands of whole tiles which are compressed concurrently, as
+        in `CompImageHDU`.
+        """
+
+        from pyfits import COMPRESSION_THREADS
+        from pyfits import compression
+
+        # CFITSIO expects native byte order, C-contiguous data
+        rows = np.ascontiguousarray(rows, dtype=self._dtype)
+
+        if (self._rows == 0 and self._dither_seed == DITHER_SEED_CHECKSUM and
+                'ZDITHER0' in self._header):
+            self._header['ZDITHER0'] = _checksum_dither_seed(self._header,
+                                                             rows)
+
+        tile_length = self._tile_shape[0]
+        nslabs = (len(rows) + tile_length - 1) // tile_length
+        nbands = min(COMPRESSION_THREADS, nslabs)
+        # CFITSIO's HCOMPRESS implementation is not thread-safe
+        if nbands < 1 or self._header.get('ZCMPTYPE') == 'HCOMPRESS_1':
+            nbands = 1
+
+        bands = []
+        for idx in range(nbands):
+            start = (nslabs * idx // nbands) * tile_length
+            stop = min((nslabs * (idx + 1) // nbands) * tile_length,
+                       len(rows))
+            bands.append(self._compression_band(rows[start:stop],
+                                                self._rows + start))
+
+        if len(bands) < 2:
+            results = [compression.compress_hdu(bands[0])]
+        else:
+            pool = ThreadPool(len(bands))
+            try:
+                results = pool.map(compression.compress_hdu, bands)
+            finally:
+                pool.close()
+                pool.join()
+
+        rowlen = self._header['NAXIS1']
+        dtype = self._columns.dtype.newbyteorder('>')
+        descriptors = [name for name, recformat in
+                       zip(self._columns.names, self._columns._recformats)
+                       if isinstance(recformat, _FormatP)]
+
+        table_offset = ((self._rows // tile_length) * self._tiles_per_slab *
+                        rowlen)
+        for band, (band_heapsize, band_buf) in zip(bands, results):
+            band_heapsize = int(band_heapsize)
+            band_tbsize = rowlen * band._header['NAXIS2']
+            table = self._table[table_offset:table_offset + band_tbsize]
+            table[:] = band_buf[:band_tbsize]
+
+            # The heap offsets in the array descriptors of each band are
+            # relative to the start of that band's heap
+            table = table.view(dtype)
+            for name in descriptors:
+                offsets = table[name][:, 1]
+                offsets[table[name][:, 0] > 0] += self._heapsize
+
+            self._ffo.writearray(
+                band_buf[band_tbsize:band_tbsize + band_heapsize])
+
+            table_offset += band_tbsize
+            self._heapsize += band_heapsize
+
+        self._rows += len(rows)
+
+    def _compression_band(self, rows, start):
+        """
+        Return an object with the header and data needed to compress the
+        given rows of the image, starting at row ``start``, with
+        ``compression.compress_hdu``.
+        """
+
+        tile_length = self._tile_shape[0]
+        naxis = self._header['ZNAXIS']
+
+        header = self._header.copy()
+        header['NAXIS2'] = (((len(rows) + tile_length - 1) // tile_length) *
+                            self._tiles_per_slab)
+        header['ZNAXIS%d' % naxis] = len(rows)
+        if 'ZDITHER0' in header:
+            # The quantization dither of each tile depends on its tile number,
+            # so the dither seed is offset by the number of preceding tiles
+            first_tile = (start // tile_length) * self._tiles_per_slab
+            header['ZDITHER0'] = ((header['ZDITHER0'] - 1 + first_tile) %
+                                  10000) + 1
+
+        return _CompressionBand(header, rows)
+
+    def _write_table(self):
+        """
+        Pad the heap to a whole FITS block, then go back and write the final
+        header, with the size of the heap, and the compressed data table.
+        """
+
+        self._ffo.write(_pad_length(self._size + self._heapsize) * '\0')
+        self._header['PCOUNT'] = self._heapsize
+
+        # Record the length of the longest compressed tile in the formats of
+        # the variable-length array columns, as CompImageHDU does
+        table = self._table.view(self._columns.dtype.newbyteorder('>'))
+        for idx, format in enumerate(self._columns._recformats):
+            if isinstance(format, _FormatP):
+                # May be either _FormatP or _FormatQ
+                lengths = table[self._columns.names[idx]][:, 0]
+                format = format.__class__(
+                    format.dtype, repeat=format.repeat,
+                    max=int(lengths.max()) if len(lengths) else 0)
+                self._header['TFORM' + str(idx + 1)] = format.tform
+
+        # The header is the same size as before; only values have changed
+        self._ffo.seek(self._header_offset)
+        self._header.tofile(self._ffo)
+        self._ffo.writearray(self._table)
+
+        self._buffer = None
+        self.writecomplete = True
+
+
+class StreamingTableHDU(StreamingHDU):
+    """
+    A class that provides the capability to stream rows to a binary table
+    extension, without knowing the final number of rows up front or holding
+    the whole table in memory.
+
+    Each block of rows passed to `write` is written to the file straight
+    away.  The arrays of variable-length array columns are spooled to a
+    temporary file, and when the stream is closed they are appended to the
+    file as the heap and the ``NAXIS2``, ``PCOUNT`` and variable-length array
+    ``TFORMn`` keywords are filled in.
+
+    The following pseudocode illustrates its use::
+
+        columns = [pyfits.Column(name='time', format='D'),
+                   pyfits.Column(name='energy', format='E'),
+                   pyfits.Column(name='trace', format='PI()')]
+
+        shdu = pyfits.StreamingTableHDU('filename.fits', columns)
+
+        for each block of events:
+            shdu.write({'time': times, 'energy': energies,
+                        'trace': traces})
+
+        shdu.close()
+    """
+
+    def __init__(self, name, columns, header=None):
+        """
+        Construct a `StreamingTableHDU` object given a file name and the
+        columns of the table.
+
+        Parameters
+        ----------
+        name : file path, file object, or file like object
+            The file to which the table will be streamed.  The header is
+            rewritten once the table is complete, so the file must be
+            seekable.  If opened, the file object must be opened in a mode
+            such as 'rb+' or 'wb+'.
+
+        columns : sequence of `Column` or a `ColDefs`
+            The definitions of the columns of the table; any data arrays of
+            the columns are ignored.
+
+        header : `Header` instance, optional
+            A header with any additional keywords for the table extension
+
+        Notes
+        -----
+        The table header is written to the end of the file, which is created
+        with a default Primary HDU first if it does not already exist.  The
+        table is only complete, and the file valid FITS, once `close` has
+        been called.  ``CHECKSUM`` and ``DATASUM`` keywords are not computed
+        for streamed tables.
+        """
+
+        self._columns = ColDefs([_copy_column(col) for col in columns])
+        hdu = BinTableHDU.from_columns(self._columns, header=header)
+
+        # The number of rows written, the size of the heap spooled so far, and
+        # the longest array written to each variable-length array column
+        self._nrows = 0
+        self._heapsize = 0
+        self._heap = tempfile.TemporaryFile()
+        self._vla_max = [0] * len(self._columns)
+
+        super(StreamingTableHDU, self).__init__(name, hdu._header)
+        self.writecomplete = False
+
+    def _open_file(self, name):
+        ffo = _File(name, 'update')
+        ffo.seek(0, 2)
+        return ffo
+
+    def write(self, data):
+        """
+        Write the given rows of the table to the stream.
+
+        Parameters
+        ----------
+        data : record array or dict
+            Rows to stream to the file, as any array with fields (such as a
+            `FITS_rec`), or a dict of arrays, with the names of the columns of
+            the table.  The values of each column are given as they would be
+            to `Column`.
+
+        Returns
+        -------
+        writecomplete : bool
+            Always `False`, since more rows may be written until the stream is
+            closed.
+
+        Notes
+        -----
+        An attempt to write rows after the stream has been closed raises an
+        `~.exceptions.IOError` exception.  If the columns of the data do not
+        all have the same number of rows, or if the heap would grow past the
+        offsets that can be stored in the 32-bit array descriptors of a P
+        format column (use the Q format for larger heaps), a
+        `~.exceptions.ValueError` exception is raised and the rows are not
+        written.
+        """
+
+        if self.writecomplete:
+            raise IOError('Attempt to write more data to the stream after it '
+                          'was closed.')
+
+        columns = ColDefs([_copy_column(col, data[col.name])
+                           for col in self._columns])
+        nrows = set(len(col.array) for col in columns)
+        if len(nrows) > 1:
+            raise ValueError('The columns of the supplied data do not all '
+                             'have the same number of rows.')
+
+        block = FITS_rec.from_columns(columns)
+        block._scale_back()
+
+        # The heap offsets in the array descriptors of the block are relative
+        # to the start of the block's arrays
+        vla_columns = [idx for idx, recformat in
+                       enumerate(self._columns._recformats)
+                       if isinstance(recformat, _FormatP)]
+        for idx in vla_columns:
+            descriptors = _get_recarray_field(block, idx)
+            if (not isinstance(self._columns._recformats[idx], _FormatQ) and
+                    len(descriptors) and
+                    int(descriptors[:, 1].max()) + self._heapsize >=
+                    2 ** 31):
+                raise ValueError(
+                    'The heap of the variable-length array column %r is too '
+                    'large for the 32-bit array descriptors of the P format; '
+                    'use the Q format instead.' % self._columns.names[idx])
+
+        for idx in vla_columns:
+            _get_recarray_field(block, idx)[:, 1] += self._heapsize
+
+        with _binary_table_byte_swap(block) as swapped:
+            self._ffo.writearray(swapped)
+
+            for idx in vla_columns:
+                field = swapped.field(idx)
+                self._vla_max[idx] = max(self._vla_max[idx], field.max)
+                if isinstance(field, _RaggedVLF):
+                    arrays = [field._flatten()[0]]
+                else:
+                    arrays = field
+                for arr in arrays:
+                    if len(arr):
+                        _array_to_file(arr, self._heap)
+                        self._heapsize += arr.nbytes
+
+        self._nrows += len(block)
+        self._ffo.flush()
+
+        return self.writecomplete
+
+    def close(self):
+        """
+        Write the heap and the final header, and close the physical FITS
+        file.
+        """
+
+        if not self.writecomplete:
+            self._write_heap()
+        self._heap.close()
+        super(StreamingTableHDU, self).close()
+
+    def _write_heap(self):
+        """
+        Append the heap after the rows written so far, pad it to a whole FITS
+        block, then go back and write the final header.
+        """
+
+        self._heap.seek(0)
+        shutil.copyfileobj(self._heap, self._ffo)
+
+        tbsize = self._nrows * self._header['NAXIS1']
+        self._ffo.write(_pad_length(tbsize + self._heapsize) * '\0')
+
+        self._header['NAXIS2'] = self._nrows
+        self._header['PCOUNT'] = self._heapsize
+        for idx, format in enumerate(self._columns._recformats):
+            if isinstance(format, _FormatP):
+                # May be either _FormatP or _FormatQ
+                format = format.__class__(format.dtype, repeat=format.repeat,
+                                          max=self._vla_max[idx])
+                self._header['TFORM' + str(idx + 1)] = format.tform
+
+        # The header is the same size as before; only values have changed
+        self._ffo.seek(self._header_offset)
+        self._header.tofile(self._ffo)
+        self._ffo.flush()
+        self.writecomplete = True
+
+
+def _copy_column(column, array=None):
+    """
+    Return a new `Column` with the same definition as ``column``, and with
+    the given data array.
+    """
+
+    kwargs = dict((attr, getattr(column, attr))
+                  for attr in KEYWORD_ATTRIBUTES)
+    return Column(array=array, **kwargs)
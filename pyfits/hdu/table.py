@@ -22,14 +22,25 @@ from ..column import (FITS2NUMPY, KEYWORD_NAMES, KEYWORD_TO_ATTRIBUTE,
                       ATTRIBUTE_TO_KEYWORD, TDEF_RE, Column, ColDefs,
                       _AsciiColDefs, _FormatP, _FormatQ, _makep,
                       _parse_tformat, _scalar_to_format, _convert_format,
-                      _cmp_recformats, _get_index)
-from ..fitsrec import FITS_rec, _get_recarray_field, _has_unicode_fields
+                      _cmp_recformats, _get_index, _RaggedVLF)
+from ..fitsrec import (FITS_rec, _get_recarray_field, _has_unicode_fields,
+                       _ascii_encode)
 from ..header import Header
 from ..py3compat import ignored
 from ..util import lazyproperty, _is_int, _str_to_num, _pad_length, deprecated
 from .base import DELAYED, _ValidHDU, ExtensionHDU
 
 
+# The number of bytes of table rows to read at a time when reading only some
+# columns of a table
+_READ_COLUMNS_BLOCK_SIZE = 2 ** 22
+
+# The number of bytes of table rows to byteswap at a time when writing a
+# table that is not already big-endian; small enough for the scratch buffer
+# to stay in cache
+_BYTESWAP_BLOCK_SIZE = 2 ** 18
+
+
 class FITSTableDumpDialect(csv.excel):
     """
     A CSV dialect for the PyFITS format of ASCII dumps of FITS tables.
@@ -458,6 +469,187 @@ class _TableBaseHDU(ExtensionHDU, _TableLikeHDU):
         # setting self.__dict__['data']
         return data
 
+    def read_columns(self, names):
+        """
+        Read only some columns of the table.
+
+        If the table's data has not already been read, the rows of the table
+        are read from the file a block at a time keeping only the bytes of the
+        requested columns (and the heap, if any of them are variable-length
+        array columns), so the whole table is never held in memory at once.
+        This works equally well for files that can not be memory mapped, such
+        as compressed files.  Only the requested columns are ever converted.
+
+        Parameters
+        ----------
+        names : sequence of str
+            The names of the columns to read
+
+        Returns
+        -------
+        data : `FITS_rec`
+            A new table containing only the requested columns, in the order
+            given
+        """
+
+        columns = self.columns
+        selected = self._columns_type([columns[name] for name in names])
+
+        if (self._data_loaded or self._file is None or
+                isinstance(selected, _AsciiColDefs)):
+            # Either the data may have been modified in memory, or it is an
+            # ASCII table whose columns are not independent of their
+            # positions in the row, so just copy the columns from the data
+            data = self.data
+            if data is not None:
+                for column in selected:
+                    # The fields of the data hold the current physical values
+                    column.array = data.field(column.name)
+                    column._physical_values = True
+            return FITS_rec.from_columns(selected)
+
+        return self._read_rows(selected, 0, self._nrows)
+
+    def iter_rows(self, chunk_rows=100000, columns=None):
+        """
+        Iterate over the table a block of rows at a time.
+
+        If the table's data has not already been read, each block is only
+        read from the file when it is reached, in order, so that iterating
+        over a table uses memory for just one block of rows at a time.  This
+        works equally well for files that can not be memory mapped, such as
+        compressed files.  Any scaling, and the conversion of bit array and
+        variable-length array columns, is done for each block separately as
+        its columns are accessed; the arrays of variable-length array columns
+        are read from the heap for each block.
+
+        Parameters
+        ----------
+        chunk_rows : int, optional
+            The number of rows in each block (the last block may have fewer)
+
+        columns : sequence of str, optional
+            The names of the columns to include in each block; all the columns
+            of the table by default (see also `read_columns`)
+
+        Returns
+        -------
+        blocks : iterator
+            An iterator over the blocks of rows, each of which is a
+            `FITS_rec` containing the requested columns
+        """
+
+        if chunk_rows < 1:
+            raise ValueError('chunk_rows must be a positive integer.')
+
+        if (self._data_loaded or self._file is None or
+                isinstance(self.columns, _AsciiColDefs)):
+            if columns is None:
+                data = self.data
+            else:
+                data = self.read_columns(columns)
+            return (data[start:start + chunk_rows]
+                    for start in range(0, len(data), chunk_rows))
+
+        if columns is None:
+            columns = self.columns.names
+
+        return self._iter_rows(chunk_rows, columns)
+
+    def _iter_rows(self, chunk_rows, columns):
+        nrows = self._nrows
+        for start in range(0, nrows, chunk_rows):
+            selected = self._columns_type([self.columns[name]
+                                           for name in columns])
+            yield self._read_rows(selected, start,
+                                  min(start + chunk_rows, nrows))
+
+    def _read_rows(self, selected, start, stop):
+        """
+        Reads rows ``start`` to ``stop`` of the columns described by the
+        `ColDefs` ``selected`` (copied from this table's columns) from the
+        file into a new `FITS_rec`.
+
+        The rows are read a block at a time, keeping only the bytes of the
+        selected columns.  If any of them are variable-length array columns,
+        the part of the heap that their arrays of these rows lie in is read
+        as well, and placed right after the rows.
+        """
+
+        dtype = self.columns.dtype.newbyteorder('>')
+        out_dtype = np.dtype([(col.name, dtype.fields[col.name][0])
+                              for col in selected])
+        nrows = stop - start
+        tbsize = nrows * out_dtype.itemsize
+
+        raw_data = np.empty(tbsize, dtype=np.uint8)
+        table = raw_data.view(out_dtype)
+        block_rows = max(_READ_COLUMNS_BLOCK_SIZE // dtype.itemsize, 1)
+        for block_start in range(start, stop, block_rows):
+            block_stop = min(block_start + block_rows, stop)
+            block = self._file.readarray(
+                offset=self._data_offset + block_start * dtype.itemsize,
+                dtype=dtype, shape=(block_stop - block_start,))
+            for name in out_dtype.names:
+                table[name][block_start - start:block_stop - start] = \
+                    block[name]
+
+        # Find the extent of the heap used by the arrays of these rows in
+        # the variable-length array columns, and make their descriptors
+        # relative to its start
+        heap_start = heap_stop = 0
+        if self._data_size is not None and self._data_size > self._theap:
+            extents = []
+            for col in selected:
+                recformat = col.format.recformat
+                if not isinstance(recformat, _FormatP):
+                    continue
+
+                descriptors = table[col.name]
+                itemsize = np.array([], dtype=recformat.dtype).itemsize
+                nonempty = descriptors[:, 0] > 0
+                if nonempty.any():
+                    offsets = descriptors[nonempty, 1].astype(np.int64)
+                    ends = (offsets +
+                            descriptors[nonempty, 0].astype(np.int64) *
+                            itemsize)
+                    extents.append((offsets.min(), ends.max()))
+
+            if extents:
+                heap_start = min(extent[0] for extent in extents)
+                heap_stop = max(extent[1] for extent in extents)
+                for col in selected:
+                    if isinstance(col.format.recformat, _FormatP):
+                        descriptors = table[col.name]
+                        descriptors[:, 1] = np.where(
+                            descriptors[:, 0] > 0,
+                            descriptors[:, 1] - heap_start, 0)
+
+        heapsize = heap_stop - heap_start
+        if heapsize:
+            table_data = raw_data
+            raw_data = np.empty(tbsize + heapsize, dtype=np.uint8)
+            raw_data[:tbsize] = table_data
+            raw_data[tbsize:] = self._file.readarray(
+                offset=self._data_offset + self._theap + heap_start,
+                dtype=np.uint8, shape=(heapsize,))
+        data = raw_data[:tbsize].view(dtype=out_dtype, type=np.rec.recarray)
+
+        # The heap immediately follows the selected columns
+        data._uint = self._uint
+        data._heapoffset = tbsize
+        data._heapsize = heapsize
+        data._gap = 0
+
+        for idx, col in enumerate(selected):
+            col.array = data.field(idx)
+        del selected._arrays
+
+        data = data.view(self._data_type)
+        data._coldefs = selected
+        selected._add_listener(data)
+        return data
+
     @property
     def _nrows(self):
         if not self._data_loaded:
@@ -799,32 +991,65 @@ class BinTableHDU(_TableBaseHDU):
         Calculate the value for the ``DATASUM`` card given the input data
         """
 
-        with _binary_table_byte_swap(self.data) as data:
-            dout = data.view(type=np.ndarray, dtype=np.ubyte)
-            csum = self._compute_checksum(dout, blocking=blocking)
-
-            # Now add in the heap data to the checksum (we can skip any gap
-            # between the table and the heap since it's all zeros and doesn't
+        data = self.data
+        csum = 0
+        offset = 0
+
+        # The rows are summed in the same big-endian (and ASCII-encoded)
+        # blocks that are written to the file; each block but the last is a
+        # whole number of 32-bit words, so the checksum can be accumulated
+        # over the blocks in turn
+        for block in _big_endian_row_blocks(data):
+            dout = block.view(type=np.ndarray, dtype=np.ubyte)
+            csum = self._compute_checksum(dout, csum, blocking=blocking)
+            offset += dout.nbytes
+
+        # Now add in the heap data to the checksum (we can skip any gap
+        # between the table and the heap since it's all zeros and doesn't
+        # contribute to the checksum
+        # TODO: The following code may no longer be necessary since it is
+        # now possible to get a pointer directly to the heap data as a
+        # whole.  That said, it is possible for the heap section to contain
+        # data that is not actually pointed to by the table (i.e. garbage;
+        # this *shouldn't* happen but it is not disallowed either)--need to
+        # double check whether or not the checksum should include such
+        # garbage
+        offset += data._gap
+
+        def add_to_checksum(arr, csum, offset):
+            # Arrays in the heap need not start on a word boundary, so they
+            # are shifted into place with leading zeros, which don't
             # contribute to the checksum
-            # TODO: The following code may no longer be necessary since it is
-            # now possible to get a pointer directly to the heap data as a
-            # whole.  That said, it is possible for the heap section to contain
-            # data that is not actually pointed to by the table (i.e. garbage;
-            # this *shouldn't* happen but it is not disallowed either)--need to
-            # double check whether or not the checksum should include such
-            # garbage
-            for idx in range(data._nfields):
-                if isinstance(data.columns._recformats[idx], _FormatP):
-                    for coldata in data.field(idx):
-                        # coldata should already be byteswapped from the call
-                        # to _binary_table_byte_swap
-                        if not len(coldata):
-                            continue
+            arr = np.ascontiguousarray(_big_endian(arr)).view(np.ubyte)
+            if offset % 4:
+                arr = np.append(np.zeros(offset % 4, dtype=np.ubyte), arr)
+            return self._compute_checksum(arr, csum, blocking=blocking)
+
+        if self._manages_own_heap:
+            # The heap is written out as is
+            heap_data = data._get_heap_data()
+            if len(heap_data):
+                csum = add_to_checksum(heap_data, csum, offset)
+            return csum
 
-                        csum = self._compute_checksum(coldata, csum,
-                                                      blocking=blocking)
+        for idx in range(data._nfields):
+            if isinstance(data.columns._recformats[idx], _FormatP):
+                field = data.field(idx)
+                if isinstance(field, _RaggedVLF):
+                    values = field._flatten()[0]
+                    if len(values):
+                        csum = add_to_checksum(values, csum, offset)
+                        offset += values.nbytes
+                    continue
 
-            return csum
+                for coldata in field:
+                    if not len(coldata):
+                        continue
+
+                    csum = add_to_checksum(coldata, csum, offset)
+                    offset += coldata.nbytes
+
+        return csum
 
     def _calculate_datasum(self, blocking):
         """
@@ -849,65 +1074,59 @@ class BinTableHDU(_TableBaseHDU):
         if self.data is None:
             return size
 
-        with _binary_table_byte_swap(self.data) as data:
-            if _has_unicode_fields(data):
-                # If the raw data was a user-supplied recarray, we can't write
-                # unicode columns directly to the file, so we have to switch
-                # to a slower row-by-row write
-                self._writedata_by_row(fileobj)
-            else:
-                fileobj.writearray(data)
-                # write out the heap of variable length array columns this has
-                # to be done after the "regular" data is written (above)
-                fileobj.write((data._gap * '\0').encode('ascii'))
-
-            nbytes = data._gap
-
-            if not self._manages_own_heap:
-                # Write the heap data one column at a time, in the order
-                # that the data pointers appear in the column (regardless
-                # if that data pointer has a different, previous heap
-                # offset listed)
-                for idx in range(data._nfields):
-                    if not isinstance(data.columns._recformats[idx],
-                                      _FormatP):
-                        continue
+        data = self.data
 
-                    field = self.data.field(idx)
-                    for row in field:
-                        if len(row) > 0:
-                            nbytes += row.nbytes
-                            if not fileobj.simulateonly:
-                                fileobj.writearray(row)
-            else:
-                heap_data = data._get_heap_data()
-                if len(heap_data) > 0:
-                    nbytes += len(heap_data)
-                    if not fileobj.simulateonly:
-                        fileobj.writearray(heap_data)
+        if not fileobj.simulateonly:
+            # The rows are swapped to big-endian a block at a time into a
+            # scratch buffer, leaving the table itself untouched.  If the raw
+            # data was a user-supplied recarray with unicode columns they are
+            # encoded to ASCII along the way
+            for block in _big_endian_row_blocks(data):
+                fileobj.writearray(block)
 
-            data._heapsize = nbytes - data._gap
-            size += nbytes
+        # write out the heap of variable length array columns this has
+        # to be done after the "regular" data is written (above)
+        fileobj.write((data._gap * '\0').encode('ascii'))
 
-        size += self.data.size * self.data._raw_itemsize
+        nbytes = data._gap
 
-        return size
+        if not self._manages_own_heap:
+            # Write the heap data one column at a time, in the order
+            # that the data pointers appear in the column (regardless
+            # if that data pointer has a different, previous heap
+            # offset listed)
+            for idx in range(data._nfields):
+                if not isinstance(data.columns._recformats[idx], _FormatP):
+                    continue
 
-    def _writedata_by_row(self, fileobj):
-        fields = [self.data.field(idx)
-                  for idx in range(len(self.data.columns))]
+                field = data.field(idx)
+                if isinstance(field, _RaggedVLF):
+                    # All the arrays of the column are already in one flat
+                    # array, so they can be written with a single call
+                    values = field._flatten()[0]
+                    nbytes += values.nbytes
+                    if len(values) and not fileobj.simulateonly:
+                        fileobj.writearray(_big_endian(values))
+                    continue
 
-        # Creating Record objects is expensive (as in
-        # `for row in self.data:` so instead we just iterate over the row
-        # indicies and get one field at a time:
-        for idx in range(len(self.data)):
-            for field in fields:
-                item = field[idx]
+                for row in field:
+                    if len(row) > 0:
+                        nbytes += row.nbytes
+                        if not fileobj.simulateonly:
+                            fileobj.writearray(_big_endian(row))
+        else:
+            heap_data = data._get_heap_data()
+            if len(heap_data) > 0:
+                nbytes += len(heap_data)
+                if not fileobj.simulateonly:
+                    fileobj.writearray(heap_data)
 
-                if field.dtype.kind == 'U':
-                    item = np.char.encode(item, 'ascii')
+        data._heapsize = nbytes - data._gap
+        size += nbytes
 
-                fileobj.writearray(item)
+        size += self.data.size * self.data._raw_itemsize
+
+        return size
 
     _tdump_file_format = textwrap.dedent("""
 
@@ -1450,6 +1669,101 @@ def new_table(input, header=None, nrows=0, fill=False, tbtype=BinTableHDU):
     return cls.from_columns(input, header=header, nrows=nrows, fill=fill)
 
 
+def _big_endian_row_blocks(data):
+    """
+    Yields the rows of a binary FITS table (represented as a FITS_rec object)
+    in blocks, with all their fields in big-endian byte order, and any unicode
+    fields encoded to ASCII.
+
+    If the table is already big-endian and has no unicode fields it is yielded
+    whole as a plain array.  Otherwise each block of rows is converted into the
+    same scratch buffer, so the table is never modified, but each block must be
+    consumed before the next one is requested.
+    """
+
+    raw = data.view(type=np.ndarray)
+
+    if _has_unicode_fields(raw):
+        # Unicode columns are written as strings one byte per character, so
+        # the records in the file are packed more tightly than in memory
+        names = raw.dtype.names
+        formats = []
+        for name in names:
+            field_dtype = raw.dtype.fields[name][0]
+            if field_dtype.base.kind == 'U':
+                field_dtype = np.dtype(
+                    ('S{0}'.format(field_dtype.base.itemsize // 4),
+                     field_dtype.shape))
+            formats.append(field_dtype.newbyteorder('>'))
+        dtype = np.dtype(list(zip(names, formats)))
+        encode = True
+    else:
+        dtype = raw.dtype.newbyteorder('>')
+        encode = False
+
+        if dtype == raw.dtype:
+            yield raw
+            return
+
+    # Keep blocks a whole number of 32-bit words long, so that their
+    # checksums may be accumulated
+    nrows = max(_BYTESWAP_BLOCK_SIZE // (dtype.itemsize * 4), 1) * 4
+
+    # Zeroed so that any padding between the fields is written out as zeros
+    scratch = np.zeros(min(nrows, len(raw)), dtype=dtype)
+
+    for start in range(0, len(raw), nrows):
+        block = raw[start:start + nrows]
+        out = scratch[:len(block)]
+        if encode:
+            for name in dtype.names:
+                if block.dtype.fields[name][0].base.kind == 'U':
+                    _encode_ascii_field(block[name], out[name])
+                else:
+                    out[name] = block[name]
+        else:
+            out[...] = block
+        yield out
+
+
+def _encode_ascii_field(field, out):
+    """
+    Encodes the unicode array ``field`` to ASCII into the string array
+    ``out`` of the same shape and number of characters per item.
+
+    Every character is just narrowed to a single byte if they are all ASCII;
+    otherwise this defers to `_ascii_encode`, which raises a
+    `UnicodeEncodeError` identifying the first item that can't be encoded.
+    """
+
+    nchars = field.dtype.itemsize // 4
+    if not nchars:
+        return
+
+    codes = np.ascontiguousarray(field).view(
+        np.dtype('u4').newbyteorder(field.dtype.byteorder))
+
+    if len(codes) and codes.max() > 127:
+        _ascii_encode(field, out=out)
+        return
+
+    out.view((np.uint8, nchars))[...] = codes.reshape(out.shape + (nchars,))
+
+
+def _big_endian(array):
+    """
+    Returns ``array`` if it is already in big-endian byte order, or a
+    big-endian copy of it otherwise.
+    """
+
+    dtype = array.dtype.newbyteorder('>')
+
+    if dtype == array.dtype:
+        return array
+
+    return array.astype(dtype)
+
+
 @contextlib.contextmanager
 def _binary_table_byte_swap(data):
     """
@@ -1497,6 +1811,12 @@ def _binary_table_byte_swap(data):
         recformat = data.columns._recformats[idx]
         if isinstance(recformat, _FormatP):
             coldata = data.field(idx)
+            if isinstance(coldata, _RaggedVLF):
+                values = coldata.values
+                if values.itemsize > 1 and values.dtype.str[0] in swap_types:
+                    to_swap.append(values)
+                continue
+
             for c in coldata:
                 if (not isinstance(c, chararray.chararray) and
                         c.itemsize > 1 and c.dtype.str[0] in swap_types):
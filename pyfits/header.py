@@ -5,8 +5,16 @@ import itertools
 import re
 import warnings
 
+try:
+    from sys import intern
+except ImportError:
+    # Python 2, where intern is a builtin
+    pass
+
 from collections import defaultdict
 
+import numpy as np
+
 from .extern import six
 from .extern.six import string_types, itervalues, iteritems, next
 from .extern.six.moves import zip, range, zip_longest
@@ -32,6 +40,14 @@ HEADER_END_RE = re.compile(encode_ascii(
 VALID_HEADER_CHARS = set(chr(x) for x in range(0x20, 0x7F))
 END_CARD = 'END' + ' ' * 77
 
+# Lookup table of the bytes that may appear in the keyword field of a card
+# whose keyword can be taken verbatim from the card image (upper-case FITS
+# standard compliant keywords, padded with spaces)
+_FSC_KEYWORD_BYTES = np.zeros(256, dtype=bool)
+_FSC_KEYWORD_BYTES[np.frombuffer(
+    encode_ascii('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_- '),
+    dtype=np.uint8)] = True
+
 
 class Header(object):
     """
@@ -317,6 +333,12 @@ class Header(object):
             A new `Header` instance.
         """
 
+        if not sep and len(data) % Card.length == 0:
+            # The common case of a header read directly from a FITS file; the
+            # whole header can be split into cards at once
+            cards, keywords = _parse_header_block(data)
+            return cls._fromcards(cards, keywords)
+
         cards = []
 
         # If the card separator contains characters that may validly appear in
@@ -365,6 +387,36 @@ class Header(object):
 
         return cls(cards)
 
+    @classmethod
+    def _fromcards(cls, cards, keywords=None):
+        """
+        Creates a new `Header` from a list of `Card` objects, like
+        ``Header(cards)``, but without the overhead of appending each card
+        with `Header.append`.
+
+        If given, ``keywords`` is a list of the normalized keyword of each
+        card, which may be `None` for cards whose keyword has to be parsed
+        from the card image.
+        """
+
+        header = cls()
+        header._cards = cards
+        keyword_indices = header._keyword_indices
+        rvkc_indices = header._rvkc_indices
+
+        if keywords is None:
+            keywords = [None] * len(cards)
+
+        for idx, (card, keyword) in enumerate(zip(cards, keywords)):
+            if keyword is None:
+                keyword = Card.normalize_keyword(card.keyword)
+                if card.field_specifier is not None:
+                    rvkc_indices[card.rawkeyword].append(idx)
+            keyword_indices[keyword].append(idx)
+
+        header._modified = False
+        return header
+
     @classmethod
     def fromfile(cls, fileobj, sep='', endcard=True, padding=True):
         """
@@ -442,6 +494,19 @@ class Header(object):
         returned by Header.fromstring on that string.
         """
 
+        header_str = cls._read_header_string(block_iter, is_binary, sep,
+                                             endcard, padding)
+        return header_str, cls.fromstring(header_str, sep=sep)
+
+    @classmethod
+    def _read_header_string(cls, block_iter, is_binary, sep, endcard,
+                            padding):
+        """
+        Reads header blocks from ``block_iter`` (see `Header._from_blocks`)
+        up to and including the block containing the END card, and returns
+        the header string without parsing it into a `Header`.
+        """
+
         actual_block_size = _block_size(sep)
         clen = Card.length + len(sep)
 
@@ -519,7 +584,7 @@ class Header(object):
             raise ValueError('Header size is not multiple of %d: %d'
                              % (BLOCK_SIZE, actual_len))
 
-        return header_str, cls.fromstring(header_str, sep=sep)
+        return header_str
 
     @classmethod
     def _find_end_card(cls, block, card_len):
@@ -531,10 +596,18 @@ class Header(object):
         in case an invalid end card needs to be sanitized.
         """
 
-        for mo in HEADER_END_RE.finditer(block):
+        end = encode_ascii('END')
+        idx = block.find(end)
+        while idx >= 0:
             # Ensure the END card was found, and it started on the
-            # boundary of a new card (see ticket #142)
-            if mo.start() % card_len != 0:
+            # boundary of a new card (see ticket #142); only candidate
+            # positions are tried, since running the regular expression over
+            # the whole block is comparatively slow
+            mo = None
+            if idx % card_len == 0:
+                mo = HEADER_END_RE.match(block, idx)
+            idx = block.find(end, idx + 1)
+            if mo is None:
                 continue
 
             # This must be the last header block, otherwise the
@@ -1981,3 +2054,167 @@ def _block_size(sep):
     """
 
     return BLOCK_SIZE + (len(sep) * (BLOCK_SIZE // Card.length - 1))
+
+
+def _parse_header_block(data):
+    """
+    Split a header string without card separators (as read from a FITS file)
+    into `Card` objects, stopping at the END card.
+
+    Rather than classifying each card image one at a time, the header is
+    viewed as a fixed-width array of 80 byte records, and the cards whose
+    keywords can be taken verbatim from the keyword field (standard keyword =
+    value cards and commentary cards) are identified for the whole header at
+    once.  The cards' values and comments are still only parsed on demand.
+
+    Returns a list of the cards, and a list of their keywords, where the
+    keyword is `None` for cards whose keywords must be parsed by the `Card`
+    (HIERARCH cards, record-valued keyword cards, invalid keywords, etc.).
+    """
+
+    records = _header_records(data)
+    ncards = len(records)
+
+    # The position of the value indicator: cards with '= ' in columns 9-10
+    # and nowhere earlier, with a keyword consisting only of FSC characters
+    value_indicator = (records[:, :9] == ord('=')) & (records[:, 1:10] == 32)
+    early_indicator = value_indicator[:, :8].any(axis=1)
+    fsc = _FSC_KEYWORD_BYTES[records[:, :8]].all(axis=1)
+    standard = fsc & value_indicator[:, 8] & ~early_indicator
+
+    # Cards that might be record-valued keyword cards (a string value
+    # containing ': ') are left for the Card to parse
+    maybe_rvkc = (((records[:, 10:] == ord("'")).any(axis=1)) &
+                  ((records[:, 10:-1] == ord(':')) &
+                   (records[:, 11:] == 32)).any(axis=1))
+    standard &= ~maybe_rvkc
+
+    is_continue = (records[:, :8] ==
+                   np.frombuffer(b'CONTINUE', dtype=np.uint8)).all(axis=1)
+
+    images = [data[idx:idx + Card.length]
+              for idx in range(0, ncards * Card.length, Card.length)]
+    standard = standard.tolist()
+    commentary = (~early_indicator).tolist()
+
+    if is_continue.any():
+        # Join CONTINUE cards to the card preceding them; the keywords of
+        # such long string cards are left for the Card to parse
+        continues = is_continue.tolist()
+        joined_images = []
+        joined_standard = []
+        joined_commentary = []
+        for idx, image in enumerate(images):
+            if continues[idx] and joined_images:
+                joined_images[-1] += image
+                joined_standard[-1] = joined_commentary[-1] = False
+            else:
+                joined_images.append(image)
+                joined_standard.append(standard[idx])
+                joined_commentary.append(commentary[idx])
+        images = joined_images
+        standard = joined_standard
+        commentary = joined_commentary
+
+    commentary_keywords = Card._commentary_keywords
+    cards = []
+    keywords = []
+
+    for image, is_standard, is_commentary in zip(images, standard,
+                                                 commentary):
+        card = Card.fromstring(image)
+        keyword = None
+
+        if is_standard:
+            keyword = image[:KEYWORD_LENGTH].strip()
+        elif is_commentary:
+            keyword = image[:KEYWORD_LENGTH].strip()
+            if keyword not in commentary_keywords:
+                keyword = None
+
+        if keyword is not None:
+            # Keywords are interned so that the many headers with the same
+            # keywords (e.g. when reading a large number of files) share them
+            keyword = intern(keyword)
+            card._keyword = keyword
+
+        cards.append(card)
+        keywords.append(keyword)
+
+    return cards, keywords
+
+
+def _header_records(data):
+    """
+    Returns a read-only ``(ncards, 80)`` array of bytes viewing the cards of
+    a header string without card separators, up to (but not including) the
+    END card.  Any trailing partial card is ignored.
+    """
+
+    ncards = len(data) // Card.length
+
+    if isinstance(data, bytes):
+        raw = data
+    else:
+        # Non-ASCII characters are replaced by one byte each; this does not
+        # affect the card boundaries, and such cards are not valid FITS anyway
+        raw = data.encode('latin1', 'replace')
+
+    records = np.frombuffer(raw, dtype=np.uint8,
+                            count=ncards * Card.length)
+    records = records.reshape((ncards, Card.length))
+
+    end = np.flatnonzero(
+        records.view('S%d' % Card.length)[:, 0] == encode_ascii(END_CARD))
+    if len(end):
+        records = records[:end[0]]
+
+    return records
+
+
+def _parse_selected_cards(data, keywords):
+    """
+    Returns a list of `Card` objects for only those cards in a header string
+    without card separators (as read from a FITS file) whose keywords are in
+    ``keywords``, which should be a collection of upper-case keywords.
+
+    The cards with the requested keywords are located using a fixed-width
+    array view of the header; no `Card` objects are created for any other
+    cards.  HIERARCH keywords may be given without the ``HIERARCH`` prefix.
+    """
+
+    records = _header_records(data)
+    keywords = set(Card.normalize_keyword(k) for k in keywords)
+
+    # Standard keywords are matched against the (space padded) keyword field
+    # of each card; HIERARCH cards have to be parsed to get their keywords
+    wanted = [encode_ascii(k.ljust(KEYWORD_LENGTH)) for k in keywords
+              if len(k) <= KEYWORD_LENGTH]
+    wanted.append(encode_ascii('HIERARCH'))
+
+    keyword_field = records[:, :KEYWORD_LENGTH].copy().view(
+        'S%d' % KEYWORD_LENGTH)[:, 0]
+    candidates = np.flatnonzero(np.in1d(keyword_field, wanted)).tolist()
+    is_continue = set(np.flatnonzero(
+        keyword_field == encode_ascii('CONTINUE')).tolist())
+
+    cards = []
+
+    for idx in candidates:
+        if idx in is_continue:
+            continue
+
+        start = idx * Card.length
+        end = start + Card.length
+        # Include any CONTINUE cards following this card
+        while (end // Card.length) in is_continue:
+            end += Card.length
+
+        card = Card.fromstring(data[start:end])
+        keyword = Card.normalize_keyword(card.keyword)
+        if (keyword in keywords or keyword.upper() in keywords or
+                (card.field_specifier is not None and
+                 card.rawkeyword in keywords)):
+            cards.append(card)
+
+    return cards
@@ -40,16 +40,25 @@ Example uses of fitscheck:
 7. Delete checksum keywords::
 
     $ fitscheck --checksum none --write *.fits
+
+8. Verify checksums using 8 worker processes, writing a summary of the
+   result for each HDU as JSON lines::
+
+    $ fitscheck --jobs 8 --json *.fits > summary.json
 """
 
 
+import json
 import logging
 import optparse
 import sys
 import textwrap
+import time
 import warnings
 
 import pyfits
+from pyfits.py3compat import OrderedDict
+from pyfits.util import _map_parallel
 
 
 log = logging.getLogger('fitscheck')
@@ -104,6 +113,19 @@ def handle_options(args):
         '-v', '--verbose', dest='verbose', help='Generate extra output.',
         default=False, action='store_true')
 
+    parser.add_option(
+        '-j', '--jobs', dest='jobs', type='int', metavar='N',
+        help='Check N files at a time in parallel worker processes; 0 uses '
+             'one process per CPU.  Defaults 1.',
+        default=1)
+
+    parser.add_option(
+        '--json', dest='json',
+        help='Print a summary of the result for each HDU to standard output '
+             'as JSON lines, with the filename, HDU index, status, size in '
+             'bytes, and elapsed time in seconds.',
+        default=False, action='store_true')
+
     global OPTIONS
     OPTIONS, fits_files = parser.parse_args(args)
 
@@ -124,44 +146,70 @@ def setup_logging():
     log.addHandler(handler)
 
 
-def verify_checksums(filename):
+def verify_checksums(filename, results=None):
     """
     Prints a message if any HDU in `filename` has a bad checksum or datasum.
+
+    If ``results`` is given, a summary of the result for each HDU is
+    appended to it.
     """
 
     errors = 0
-    try:
-        hdulist = pyfits.open(filename, checksum=OPTIONS.checksum_kind)
-    except UserWarning as w:
-        remainder = '.. ' + ' '.join(str(w).split(' ')[1:]).strip()
-        # if "Checksum" in str(w) or "Datasum" in str(w):
-        log.warn('BAD %r %s' % (filename, remainder))
-        return 1
-    if not OPTIONS.ignore_missing:
-        for i, hdu in enumerate(hdulist):
-            if not hdu._checksum:
-                log.warn('MISSING %r .. Checksum not found in HDU #%d' %
-                         (filename, i))
-                return 1
-            if not hdu._datasum:
-                log.warn('MISSING %r .. Datasum not found in HDU #%d' %
-                         (filename, i))
-                return 1
+    with pyfits.open(filename) as hdulist:
+        for idx, hdu in enumerate(hdulist):
+            start = time.time()
+            status, message = _verify_hdu_checksums(hdu, idx)
+            if status != 'OK':
+                log.warn('%s %r .. %s' % (status, filename, message))
+                errors = 1
+
+            if results is not None:
+                results.append(_result(filename, idx, status,
+                                       _hdu_nbytes(hdu), start))
+
     if not errors:
         log.info('OK %r' % filename)
     return errors
 
 
-def verify_compliance(filename):
+def _verify_hdu_checksums(hdu, idx):
+    """
+    Returns the status of the checksums of a single HDU, and a message
+    describing any problem with them.
+    """
+
+    kind = OPTIONS.checksum_kind
+    if 'CHECKSUM' in hdu._header:
+        if kind and not hdu.verify_checksum(kind):
+            return 'BAD', 'Checksum verification failed for HDU #%d' % idx
+    elif not OPTIONS.ignore_missing:
+        return 'MISSING', 'Checksum not found in HDU #%d' % idx
+
+    if 'DATASUM' in hdu._header:
+        if kind and not hdu.verify_datasum(kind):
+            return 'BAD', 'Datasum verification failed for HDU #%d' % idx
+    elif not OPTIONS.ignore_missing:
+        return 'MISSING', 'Datasum not found in HDU #%d' % idx
+
+    return 'OK', ''
+
+
+def verify_compliance(filename, results=None):
     """Check for FITS standard compliance."""
 
+    start = time.time()
     hdulist = pyfits.open(filename)
     try:
         hdulist.verify('exception')
     except pyfits.VerifyError as exc:
         log.warn('NONCOMPLIANT %r .. %s' %
-                 (filename), str(exc).replace('\n', ' '))
+                 (filename, str(exc).replace('\n', ' ')))
+        if results is not None:
+            results.append(_result(filename, None, 'NONCOMPLIANT', None,
+                                   start))
         return 1
+    finally:
+        hdulist.close()
     return 0
 
 
@@ -183,16 +231,20 @@ def update(filename):
         hdulist.close()
 
 
-def process_file(filename):
+def process_file(filename, results=None):
     """
     Handle a single .fits file,  returning the count of checksum and compliance
     errors.
+
+    If ``results`` is given, a summary of the result for each HDU (and of
+    any error in the file as a whole) is appended to it.
     """
 
+    start = time.time()
     try:
-        checksum_errors = verify_checksums(filename)
+        checksum_errors = verify_checksums(filename, results)
         if OPTIONS.compliance:
-            compliance_errors = verify_compliance(filename)
+            compliance_errors = verify_compliance(filename, results)
         else:
             compliance_errors = 0
         if OPTIONS.write_file and checksum_errors == 0 or OPTIONS.force:
@@ -200,20 +252,69 @@ def process_file(filename):
         return checksum_errors + compliance_errors
     except Exception as exc:
         log.error('EXCEPTION %r .. %s' % (filename, exc))
+        if results is not None:
+            results.append(_result(filename, None, 'EXCEPTION', None, start))
         return 1
 
 
-def main():
+def _process_file(args):
+    """
+    Calls `process_file` with the given filename and options in a worker
+    process, returning the error count and the per-HDU results.
+    """
+
+    filename, options = args
+
+    global OPTIONS
+    OPTIONS = options
+    if not log.handlers:
+        setup_logging()
+
+    results = []
+    errors = process_file(filename, results)
+    return errors, results
+
+
+def _result(filename, hdu, status, nbytes, start):
+    """A single entry in the ``--json`` summary."""
+
+    return OrderedDict([('filename', filename), ('hdu', hdu),
+                        ('status', status), ('bytes', nbytes),
+                        ('elapsed', round(time.time() - start, 6))])
+
+
+def _hdu_nbytes(hdu):
+    """The size of an HDU in the file, including its header and padding."""
+
+    if hdu._header_offset is None or hdu._data_offset is None:
+        return None
+    return hdu._data_offset - hdu._header_offset + hdu._data_size
+
+
+def main(args=None):
     """
     Processes command line parameters into options and files,  then checks
     or update FITS DATASUM and CHECKSUM keywords for the specified files.
     """
 
     errors = 0
-    fits_files = handle_options(sys.argv[1:])
+    if args is None:
+        args = sys.argv[1:]
+    fits_files = handle_options(args)
     setup_logging()
-    for filename in fits_files:
-        errors += process_file(filename)
+
+    # Files are handed out to the workers one at a time, and their results
+    # are reported as soon as each one is finished
+    work = ((filename, OPTIONS) for filename in fits_files)
+    for file_errors, results in _map_parallel(_process_file, work,
+                                              jobs=OPTIONS.jobs,
+                                              ordered=False):
+        errors += file_errors
+        if OPTIONS.json:
+            for result in results:
+                sys.stdout.write(json.dumps(result) + '\n')
+            sys.stdout.flush()
+
     if errors:
         log.warn('%d errors' % errors)
     return int(bool(errors))
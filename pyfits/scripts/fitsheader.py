@@ -27,6 +27,10 @@ Example uses of fitsheader:
 
     $ fitsheader --keyword NAXIS* filename.fits
 
+6. Print the headers of many files, reading four files at a time in parallel::
+
+    $ fitsheader --jobs 4 *.fits
+
 Note that compressed images (HDUs of type
 :class:`~pyfits.CompImageHDU`) really have two headers: a real
 BINTABLE header to describe the compressed data, and a fake IMAGE header
@@ -44,6 +48,8 @@ import optparse
 import logging
 import pyfits
 
+from pyfits.util import _map_parallel
+
 log = logging.getLogger('fitscheck')
 
 
@@ -203,25 +209,46 @@ def print_headers_traditional(args):
 
     Parameters
     ----------
-    args : argparse.Namespace
+    args : optparse.Values
         Arguments passed from the command-line as defined below.
     """
-    for idx, filename in enumerate(args.filename):  # support wildcards
+    jobs = getattr(args, 'jobs', 1)
+    formatted = _map_parallel(_format_file,
+                              ((filename, args.extensions, args.keywords,
+                                args.compressed)
+                               for filename in args.filename),
+                              jobs=jobs)
+
+    for idx, (output, error) in enumerate(formatted):  # support wildcards
         if idx > 0 and not args.keywords:
             print()  # print a newline between different files
-        try:
-            formatter = HeaderFormatter(filename)
-            print(formatter.parse(args.extensions,
-                                  args.keywords,
-                                  args.compressed), end='')
-        except IOError as e:
-            log.error(str(e))
+        if error is not None:
+            log.error(error)
+        else:
+            print(output, end='')
+
+
+def _format_file(args):
+    """Formats the headers of a single file for `print_headers_traditional`;
+    a module-level function so that files can be formatted by worker
+    processes.
+
+    Returns the formatted headers, and the error message if the file could
+    not be read (or `None`).
+    """
+    filename, extensions, keywords, compressed = args
+    try:
+        formatter = HeaderFormatter(filename)
+        return formatter.parse(extensions, keywords, compressed), None
+    except IOError as e:
+        return '', str(e)
 
 
 def main(args=None):
     """This is the main function called by the `fitsheader` script."""
 
-    parser = argparse.OptionParser(
+    parser = optparse.OptionParser(
+        usage='fitsheader [options] <.fits files...>',
         description=('Print the header(s) of a FITS file. '
                      'Optional arguments allow the desired extension(s), '
                      'keyword(s), and output format to be specified. '
@@ -241,10 +268,17 @@ def main(args=None):
                       help='for compressed image data, '
                            'show the true header which describes '
                            'the compression rather than the data')
-    parser.add_option('filename', nargs='+',
-                      help='path to one or more files; '
-                           'wildcards are supported')
-    args = parser.parse_args(args)
+    parser.add_option('-j', '--jobs', metavar='N', type='int', default=1,
+                      help='read N files at a time in parallel worker '
+                           'processes; 0 uses one process per CPU '
+                           '(default: 1)')
+    args, filenames = parser.parse_args(args)
+
+    if not filenames:
+        parser.error('at least one file must be specified')
+
+    # path to one or more files; wildcards are supported by the shell
+    args.filename = filenames
 
     # Now print the desired headers
     try:
@@ -1,12 +1,16 @@
 from __future__ import division, with_statement  # confidence high
 
 import contextlib
+import gzip
+import json
+import os
 import sys
 import warnings
 
 import numpy as np
 
 import pyfits as fits
+from ..extern.six import StringIO
 from ..hdu.base import _ValidHDU
 from . import PyfitsTestCase
 from .test_table import comparerecords
@@ -65,6 +69,119 @@ class TestChecksumFunctions(PyfitsTestCase):
                 assert hdul[0].header['CHECKSUM'] == 'jD4Am942jC48j948'
                 assert hdul[0].header['DATASUM'] == '4164005614'
 
+    def test_compute_checksum_blocks(self):
+        """
+        Checks that checksumming a whole buffer at once gives the same
+        results as summing it one block at a time with
+        `_compute_hdu_checksum`.
+        """
+
+        hdu = fits.PrimaryHDU()
+
+        def blockwise_checksum(data, sum32, blocklen):
+            sum32 = np.uint32(sum32)
+            for idx in range(0, len(data), blocklen):
+                sum32 = hdu._compute_hdu_checksum(data[idx:idx + blocklen],
+                                                  sum32)
+            return sum32
+
+        rng = np.random.RandomState(42)
+        buffers = [np.zeros(5760, dtype=np.uint8),
+                   np.zeros(5760, dtype=np.uint8) + 0xFF,
+                   np.zeros(7, dtype=np.uint8) + 0xFF]
+        for size in (1, 2, 3, 5, 2879, 2880, 2881, 5763, 100001):
+            buffers.append(rng.randint(0, 256, size).astype(np.uint8))
+
+        for data in buffers:
+            for sum32 in (0, 1, 0x12345678, 0xFFFFFFFF):
+                expected = blockwise_checksum(data, sum32, 2880)
+                assert hdu._compute_checksum(data, sum32) == expected
+                expected = blockwise_checksum(data, sum32, len(data))
+                assert hdu._compute_checksum(
+                    data, sum32, blocking='nonstandard') == expected
+
+        assert hdu._compute_checksum(np.zeros(0, dtype=np.uint8)) == 0
+
+    def test_streaming_datasum(self):
+        """
+        Checks that the datasum computed by reading the data from the file a
+        chunk at a time matches the datasum of the loaded data, including
+        for gzip-compressed files.
+        """
+
+        data = np.arange(10 ** 6, dtype=np.float64).reshape((1000, 1000))
+        fits.PrimaryHDU(data).writeto(self.temp('tmp.fits'), checksum=True)
+
+        with open(self.temp('tmp.fits'), 'rb') as f:
+            with gzip.GzipFile(self.temp('tmp.fits.gz'), 'wb') as g:
+                g.write(f.read())
+
+        for filename in ('tmp.fits', 'tmp.fits.gz'):
+            for memmap in (True, False):
+                with fits.open(self.temp(filename), checksum=True,
+                               memmap=memmap) as hdul:
+                    hdu = hdul[0]
+                    datasum = hdu._calculate_datasum('standard')
+                    assert not hdu._data_loaded
+                    assert datasum == int(hdu.header['DATASUM'])
+                    assert (hdu.data == data).all()
+                    assert hdu._calculate_datasum('standard') == datasum
+
+        with fits.open(self.temp('tmp.fits.gz')) as hdul:
+            hdu = hdul[0]
+            chunks = list(hdul._file.readchunks(hdu._data_size,
+                                                hdu._data_offset,
+                                                chunksize=2880 * 7))
+            assert all(len(chunk) == 2880 * 7 for chunk in chunks[:-1])
+            assert sum(len(chunk) for chunk in chunks) == hdu._data_size
+            assert (np.concatenate(chunks).view('>f8')[:data.size] ==
+                    data.ravel()).all()
+
+    def test_fitscheck_json(self):
+        """
+        Tests the per-HDU JSON lines summary from ``fitscheck --json``, with
+        files checked in parallel.
+        """
+
+        from ..scripts import fitscheck
+
+        self.copy_file('checksum.fits')
+        self.copy_file('test0.fits')
+        hdu = fits.PrimaryHDU(np.arange(100, dtype=np.int32))
+        hdu.writeto(self.temp('bad.fits'), checksum=True)
+        with open(self.temp('bad.fits'), 'rb+') as f:
+            f.seek(2880 + 42)
+            f.write(b'X')
+
+        filenames = [self.temp(name)
+                     for name in ('checksum.fits', 'test0.fits', 'bad.fits',
+                                  'missing.fits')]
+        stdout = sys.stdout
+        sys.stdout = output = StringIO()
+        try:
+            assert fitscheck.main(['--json', '--jobs', '2'] + filenames) == 1
+        finally:
+            sys.stdout = stdout
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        statuses = dict(((os.path.basename(r['filename']), r['hdu']),
+                         r['status']) for r in results)
+        assert statuses == {('checksum.fits', 0): 'OK',
+                            ('checksum.fits', 1): 'OK',
+                            ('test0.fits', 0): 'MISSING',
+                            ('test0.fits', 1): 'MISSING',
+                            ('test0.fits', 2): 'MISSING',
+                            ('test0.fits', 3): 'MISSING',
+                            ('test0.fits', 4): 'MISSING',
+                            ('bad.fits', 0): 'BAD',
+                            ('missing.fits', None): 'EXCEPTION'}
+
+        for result in results:
+            assert sorted(result) == ['bytes', 'elapsed', 'filename', 'hdu',
+                                      'status']
+            if result['hdu'] is not None:
+                assert result['bytes'] % 2880 == 0
+
     def test_scaled_data(self):
         with fits.open(self.data('scale.fits')) as hdul:
             orig_data = hdul[0].data.copy()
@@ -334,6 +334,75 @@ class TestCore(PyfitsTestCase):
         assert_raises(TypeError, _getext, self.data('test0.fits'), 'readonly',
                       extver=1)
 
+    def test_scanheader(self):
+        """
+        Tests reading headers with `pyfits.scanheader`, which reads headers
+        directly from the file without opening an `HDUList`.
+        """
+
+        for filename in ['test0.fits', 'tb.fits', 'random_groups.fits',
+                         'zerowidth.fits']:
+            with fits.open(self.data(filename)) as hdul:
+                for idx, hdu in enumerate(hdul):
+                    header = fits.scanheader(self.data(filename), idx)
+                    assert header.tostring() == hdu.header.tostring()
+
+                header = fits.scanheader(self.data(filename), -1)
+                assert header.tostring() == hdul[-1].header.tostring()
+
+        filename = self.data('test0.fits')
+        assert fits.scanheader(filename, 'sci', 3)['EXTVER'] == 3
+        assert fits.scanheader(filename, ext=('SCI', 2))['EXTVER'] == 2
+        assert fits.scanheader(filename, extname='sci')['EXTVER'] == 1
+        assert fits.scanheader(filename, 'PRIMARY')['NAXIS'] == 0
+        assert_raises(KeyError, fits.scanheader, filename, 'sci', 5)
+        assert_raises(IndexError, fits.scanheader, filename, 5)
+        assert_raises(TypeError, fits.scanheader, filename, foo=1)
+
+        header = fits.scanheader(filename, 'sci', 2,
+                                 keywords=['extver', 'NAXIS1', 'FOO'])
+        assert list(header.keys()) == ['NAXIS1', 'EXTVER']
+        assert header['EXTVER'] == fits.getval(filename, 'EXTVER', 'sci', 2)
+
+        header = fits.scanheader(self.data('zerowidth.fits'),
+                                 keywords='HISTORY')
+        assert len(header) == 48
+        assert (list(header['HISTORY']) ==
+                list(fits.getheader(self.data('zerowidth.fits'))['HISTORY']))
+
+        with open(filename, 'rb') as fileobj:
+            assert fits.scanheader(fileobj, 2)['EXTVER'] == 2
+            assert not fileobj.closed
+
+    def test_harvest_headers(self):
+        """
+        Tests reading keyword values from the headers of multiple files with
+        `pyfits.harvest_headers`, serially and in parallel.
+        """
+
+        self.copy_file('test0.fits')
+        self.copy_file('tb.fits')
+        pattern = self.temp('*.fits')
+
+        for jobs in (1, 2):
+            with catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                cols = fits.harvest_headers(pattern, ['naxis', 'EXTVER'],
+                                            ext=[0, ('SCI', 2)], jobs=jobs)
+                messages = [str(x.message) for x in w
+                            if 'not found' in str(x.message)]
+                assert messages == [
+                    "%s: Extension ('SCI', 2) not found." %
+                    self.temp('tb.fits')]
+
+            assert list(cols.keys()) == ['FILENAME', 'EXT', 'NAXIS', 'EXTVER']
+            assert cols['FILENAME'] == [self.temp('tb.fits'),
+                                        self.temp('test0.fits'),
+                                        self.temp('test0.fits')]
+            assert cols['EXT'] == [0, 0, ('SCI', 2)]
+            assert cols['NAXIS'] == [0, 0, 2]
+            assert cols['EXTVER'] == [None, None, 2]
+
     def test_extension_name_case_sensitive(self):
         """
         Tests that setting fits.EXTENSION_NAME_CASE_SENSITIVE at runtime
@@ -1081,6 +1150,82 @@ class TestStreamingFunctions(PyfitsTestCase):
             shdu = self._make_streaming_hdu(f)
             shdu.write(arr)
 
+    def test_streaming_table(self):
+        """Test streaming blocks of rows to a binary table."""
+
+        columns = [fits.Column('A', format='J'),
+                   fits.Column('B', format='I', bscale=0.5, bzero=10),
+                   fits.Column('C', format='8A'),
+                   fits.Column('D', format='PJ()')]
+        header = fits.Header([('EXTNAME', 'EVENTS')])
+        arrays = [np.arange(n % 5) for n in range(20)]
+
+        with fits.StreamingTableHDU(self.temp('new.fits'), columns,
+                                    header=header) as shdu:
+            # As a dict of arrays
+            shdu.write({'A': np.arange(8), 'B': np.arange(8) / 2.0,
+                        'C': ['row%d' % idx for idx in range(8)],
+                        'D': arrays[:8]})
+
+            # As a record array
+            data = np.zeros(6, dtype=[('A', 'i4'), ('B', 'f8'), ('C', 'S8'),
+                                      ('D', object)])
+            data['A'] = np.arange(8, 14)
+            data['B'] = np.arange(8, 14) / 2.0
+            data['C'] = ['row%d' % idx for idx in range(8, 14)]
+            for idx, arr in enumerate(arrays[8:14]):
+                data['D'][idx] = arr
+            shdu.write(data)
+
+            # With the arrays of the VLA column given as values and offsets
+            offsets = np.cumsum([0] + [len(arr) for arr in arrays[14:]])
+            shdu.write({'A': np.arange(14, 20), 'B': np.arange(14, 20) / 2.0,
+                        'C': ['row%d' % idx for idx in range(14, 20)],
+                        'D': (np.concatenate(arrays[14:]), offsets)})
+            assert not shdu.writecomplete
+
+            assert_raises(ValueError, shdu.write,
+                          {'A': [1], 'B': [1, 2], 'C': ['a'], 'D': [[1]]})
+
+        assert shdu.writecomplete
+        assert_raises(IOError, shdu.write, data)
+
+        with fits.open(self.temp('new.fits'), checksum=True) as hdul:
+            assert len(hdul) == 2
+            hdu = hdul['EVENTS']
+            assert hdu.header['NAXIS2'] == 20
+            assert hdu.header['TFORM4'] == 'PJ(4)'
+            assert (hdu.data['A'] == np.arange(20)).all()
+            assert (hdu.data['B'] == np.arange(20) / 2.0).all()
+            assert hdu.data['C'][0] == 'row0'
+            assert hdu.data['C'][19] == 'row19'
+            for row, arr in zip(hdu.data['D'], arrays):
+                assert (row == arr).all()
+
+    def test_streaming_table_heap_overflow(self):
+        """
+        Tests that rows whose arrays would be stored past the offsets that P
+        format array descriptors can hold are not written.
+        """
+
+        columns = [fits.Column('A', format='PJ()'),
+                   fits.Column('B', format='QJ()')]
+        with fits.StreamingTableHDU(self.temp('new.fits'), columns) as shdu:
+            shdu.write({'A': [[1, 2]], 'B': [[3]]})
+            heapsize = shdu._heapsize
+            # Pretend that nearly 2 GB of arrays have been written already
+            shdu._heapsize = 2 ** 31 - 8
+            assert_raises(ValueError, shdu.write,
+                          {'A': [[1, 2], [3]], 'B': [[4], [5]]})
+            assert shdu._nrows == 1
+            shdu._heapsize = heapsize
+            shdu.write({'A': [[], [4]], 'B': [[5], []]})
+
+        with fits.open(self.temp('new.fits'), checksum=True) as hdul:
+            assert hdul[1].header['NAXIS2'] == 3
+            assert [list(row) for row in hdul[1].data['A']] == [[1, 2], [],
+                                                                 [4]]
+
     def test_fix_invalid_extname(self):
         phdu = fits.PrimaryHDU()
         ihdu = fits.ImageHDU()
@@ -9,6 +9,7 @@ import numpy as np
 from ..extern.six import BytesIO
 
 import pyfits as fits
+from ..hdu.hdulist import _HDU_INDEX_CACHE
 from ..verify import VerifyError
 from . import PyfitsTestCase
 from .util import ignore_warnings
@@ -784,3 +785,168 @@ class TestHDUListFunctions(PyfitsTestCase):
         assert ('a', 2) not in hdulist
         assert ('b', 1) not in hdulist
         assert ('b', 2) not in hdulist
+
+    def test_lazy_load_hdus(self):
+        """
+        Tests that HDUs are only read from the file as they are accessed when
+        opening a file with ``lazy_load_hdus=True``.
+        """
+
+        # Use a copy of the file so that no HDU index has been recorded for it
+        self.copy_file('test0.fits')
+
+        with fits.open(self.temp('test0.fits'), lazy_load_hdus=True) as hdul:
+            assert list.__len__(hdul) == 1
+            assert hdul[2].name == 'SCI'
+            assert hdul[2].ver == 2
+            assert list.__len__(hdul) == 3
+            assert ('SCI', 3) in hdul
+            assert list.__len__(hdul) == 4
+            assert len(hdul) == 5
+            assert list.__len__(hdul) == 5
+
+        with fits.open(self.temp('test0.fits'), lazy_load_hdus=True) as hdul:
+            assert hdul[-1].ver == 4
+            assert list.__len__(hdul) == 5
+
+        with fits.open(self.temp('test0.fits'), lazy_load_hdus=True) as hdul:
+            assert [hdu.ver for hdu in hdul[1:]] == [1, 2, 3, 4]
+            assert [hdu.name for hdu in hdul] == ['PRIMARY'] + ['SCI'] * 4
+
+        with fits.open(self.temp('test0.fits'), lazy_load_hdus=False) as hdul:
+            assert list.__len__(hdul) == 5
+
+    def test_lazy_load_hdus_after_close(self):
+        """
+        Tests that closing a lazily loaded HDUList first reads the HDUs that
+        have not been accessed yet, so that the list is still complete.
+        """
+
+        self.copy_file('test0.fits')
+
+        with fits.open(self.temp('test0.fits'), lazy_load_hdus=True) as hdul:
+            assert list.__len__(hdul) == 1
+
+        assert len(hdul) == 5
+        assert hdul[-1].ver == 4
+        assert hdul['SCI', 2].ver == 2
+
+        hdul = fits.open(self.temp('test0.fits'), lazy_load_hdus=True)
+        hdul.close()
+        assert len(hdul) == 5
+        assert hdul[-1].name == 'SCI'
+
+    def test_lazy_load_hdus_slices(self):
+        """
+        Tests that slicing a lazily loaded HDUList, including with negative
+        indices and steps, reads all the HDUs in the slice.
+        """
+
+        self.copy_file('test0.fits')
+
+        slices = [slice(1, 3), slice(None, 2), slice(3, None), slice(-2, None),
+                  slice(None, -3), slice(3, 0, -1), slice(4, 1, -2),
+                  slice(None, 2, -1), slice(-1, 0, -1), slice(2, -5, -1),
+                  slice(None, None, -1), slice(0, 0), slice(3, 10)]
+        with fits.open(self.temp('test0.fits'),
+                       lazy_load_hdus=False) as hdul:
+            expected = [[(hdu.name, hdu.ver) for hdu in hdul[key]]
+                        for key in slices]
+        # Don't look HDUs up through the index recorded when reading the file
+        os.utime(self.temp('test0.fits'), (0, 0))
+
+        for key, names in zip(slices, expected):
+            with fits.open(self.temp('test0.fits'),
+                           lazy_load_hdus=True) as hdul:
+                assert [(hdu.name, hdu.ver) for hdu in hdul[key]] == names
+
+    def test_lazy_load_hdus_modify(self):
+        """
+        Tests that modifying a lazily loaded HDUList first reads all remaining
+        HDUs, so that none of them are lost when the file is updated.
+        """
+
+        self.copy_file('test0.fits')
+        with fits.open(self.temp('test0.fits'), mode='update') as hdul:
+            hdul.append(fits.ImageHDU(name='NEW'))
+
+        with fits.open(self.temp('test0.fits')) as hdul:
+            assert len(hdul) == 6
+            assert hdul[-1].name == 'NEW'
+            assert hdul['SCI', 4].data.shape == (40, 40)
+
+        with fits.open(self.temp('test0.fits'), mode='update') as hdul:
+            del hdul[1]
+            assert hdul.pop().name == 'NEW'
+
+        with fits.open(self.temp('test0.fits')) as hdul:
+            assert len(hdul) == 4
+            assert [hdu.ver for hdu in hdul[1:]] == [2, 3, 4]
+
+    def test_hdu_index(self):
+        """
+        Tests looking up HDUs directly through the offset index built with
+        `pyfits.build_hdu_index`, without reading the preceding headers.
+        """
+
+        self.copy_file('test0.fits')
+        self.copy_file('tb.fits')
+        assert (fits.build_hdu_index(self.temp_dir) ==
+                [self.temp('tb.fits'), self.temp('test0.fits')])
+
+        with fits.open(self.temp('test0.fits')) as hdul:
+            assert hdul['SCI', 3].ver == 3
+            # Only the primary HDU and the requested HDU have been read
+            assert list.__len__(hdul) == 4
+            assert list.__getitem__(hdul, 1) is None
+            assert list.__getitem__(hdul, 2) is None
+            assert np.all(hdul['SCI', 3].data == hdul[3].data)
+
+            with fits.open(self.data('test0.fits'),
+                           lazy_load_hdus=False) as hdul2:
+                assert np.all(hdul[3].data == hdul2[3].data)
+
+            assert_raises(KeyError, hdul.index_of, 'SCI')
+            assert [hdu.ver for hdu in hdul[1:3]] == [1, 2]
+            assert [hdu.ver for hdu in hdul] == [1, 1, 2, 3, 4]
+            assert len(hdul) == 5
+
+        # Modifying the file invalidates the index
+        with fits.open(self.temp('test0.fits'), mode='update') as hdul:
+            del hdul[1]
+
+        with fits.open(self.temp('test0.fits')) as hdul:
+            assert list.__len__(hdul) == 1
+            assert hdul['SCI', 3].ver == 3
+            assert hdul[2].ver == 3
+            assert len(hdul) == 4
+
+    def test_hdu_index_cache_size(self):
+        """
+        Tests that only the HDU offset indices of the
+        ``pyfits.HDU_INDEX_CACHE_SIZE`` most recently used files are kept.
+        """
+
+        for name in ('test0.fits', 'tb.fits', 'checksum.fits'):
+            self.copy_file(name)
+
+        fits.HDU_INDEX_CACHE_SIZE = 2
+        fits.build_hdu_index(self.temp('test0.fits'))
+        fits.build_hdu_index(self.temp('tb.fits'))
+
+        # Using the index of test0.fits makes the tb.fits index the least
+        # recently used one
+        with fits.open(self.temp('test0.fits')) as hdul:
+            assert hdul['SCI', 3].ver == 3
+            assert list.__getitem__(hdul, 1) is None
+
+        fits.build_hdu_index(self.temp('checksum.fits'))
+        indexed = [path for path in _HDU_INDEX_CACHE
+                   if path.startswith(os.path.abspath(self.temp_dir))]
+        assert indexed == [os.path.abspath(self.temp('test0.fits')),
+                           os.path.abspath(self.temp('checksum.fits'))]
+
+        fits.HDU_INDEX_CACHE_SIZE = 0
+        assert fits.build_hdu_index(self.temp('tb.fits')) == []
+        assert not [path for path in _HDU_INDEX_CACHE
+                    if path.startswith(os.path.abspath(self.temp_dir))]
@@ -2,6 +2,7 @@
 
 from __future__ import division, with_statement
 
+import copy
 import warnings
 
 import numpy as np
@@ -12,7 +13,7 @@ from warnings import catch_warnings
 
 from ..extern import six
 from ..extern.six import u, b, iterkeys, itervalues, iteritems, StringIO, PY3
-from ..extern.six.moves import zip, range
+from ..extern.six.moves import zip, range, cPickle as pickle
 
 from ..card import _pad
 from ..util import encode_ascii, _pad_length, BLOCK_SIZE
@@ -2091,6 +2092,75 @@ class TestHeaderFunctions(PyfitsTestCase):
             else:
                 c.verify('exception')
 
+    def test_fromstring_block_parser(self):
+        """
+        Tests that parsing a raw header block (without card separators) gives
+        the same cards as parsing the header one card at a time.
+        """
+
+        images = [
+            "SIMPLE  =                    T",
+            "BITPIX  =                   16 / comment",
+            "NAXIS   =                    0",
+            "EXTEND  =                    T",
+            "STR     = 'a string'           / with comment",
+            "LONGSTR = 'abcdefghijklmnopqrstuvwxyz abcdefghijklmnopqrstuvwxyz&'",
+            "CONTINUE  'abcdefghijklmnopqrstuvwxyz'",
+            "DP1     = 'AXIS.1: 1'",
+            "DP1     = 'AXIS.2: 2.5'        / RVKC comment",
+            "date-obs= '2016-01-01'",
+            "HIERARCH ESO DET CHIP1 ID = 'CCD-1'",
+            "COMMENT this is a comment; with an = sign",
+            "HISTORY some history",
+            "HISTORY = not a value",
+            "        blank keyword commentary",
+            "KEY_A-1 =                  1.5",
+            "",
+            "",
+        ]
+        images = [_pad(image) for image in images]
+        header_str = ''.join(images) + _pad('END')
+
+        with ignore_warnings():
+            header = fits.Header.fromstring(header_str)
+            expected = fits.Header.fromstring('\n'.join(images), sep='\n')
+
+        assert len(header) == len(expected) == len(images) - 1
+        assert list(header.keys()) == list(expected.keys())
+        assert list(header.values()) == list(expected.values())
+        assert dict(header._keyword_indices) == dict(expected._keyword_indices)
+        assert dict(header._rvkc_indices) == dict(expected._rvkc_indices)
+        assert header['DP1.AXIS.2'] == 2.5
+        assert header['ESO DET CHIP1 ID'] == 'CCD-1'
+        assert header['DATE-OBS'] == '2016-01-01'
+        assert header['LONGSTR'].endswith('xyz')
+        assert header['HISTORY'][1] == '= not a value'
+        assert header.tostring() == expected.tostring()
+
+    def test_card_slots(self):
+        """
+        Cards do not have an instance ``__dict__``, but can still be copied
+        and pickled.
+        """
+
+        header = fits.Header.fromstring(
+            _pad("HIERARCH ESO DET CHIP1 ID = 'CCD-1'") +
+            _pad("DP1     = 'AXIS.1: 1'") +
+            _pad("KEY     =                    1 / comment") + _pad('END'))
+
+        for card in header.cards:
+            assert not hasattr(card, '__dict__')
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            header2 = pickle.loads(pickle.dumps(header, protocol))
+            assert header2.tostring() == header.tostring()
+            assert header2['ESO DET CHIP1 ID'] == 'CCD-1'
+            assert header2['DP1.AXIS.1'] == 1
+
+        card = copy.copy(header.cards[0])
+        assert card.keyword == 'ESO DET CHIP1 ID'
+        assert str(card) == str(header.cards[0])
+
 
 class TestRecordValuedKeywordCards(PyfitsTestCase):
     """
@@ -1016,6 +1016,297 @@ class TestCompressedImage(PyfitsTestCase):
         with fits.open(self.temp('test.fits')) as hdul:
             assert (hdul['SCI'].data == cube).all()
 
+    def test_comp_image_section(self):
+        """
+        Tests that slices of CompImageHDU.section match the same slices of
+        the full image, without the full image being decompressed.
+        """
+
+        cube = np.arange(3 * 70 * 90, dtype=np.int32).reshape((3, 70, 90))
+        hdu = fits.CompImageHDU(cube, tile_size=[16, 16, 1])
+        hdu.header['BSCALE'] = 2.0
+        hdu.header['BZERO'] = 10.0
+        hdu.writeto(self.temp('test.fits'))
+
+        with fits.open(self.temp('test.fits')) as hdul:
+            expected = hdul[1].data.copy()
+
+        keys = [0, -1, (1, 69, 89), (1, slice(5, 50), slice(3, 80, 7)),
+                (Ellipsis, 5), (slice(None, None, -1), slice(60, 2, -3), 3),
+                (2, [3, 1, 50]), (np.array([True, False, True]), 0),
+                slice(1, 1), Ellipsis]
+
+        with fits.open(self.temp('test.fits')) as hdul:
+            section = hdul[1].section
+            for key in keys:
+                data = section[key]
+                assert data.dtype == expected[key].dtype
+                assert data.shape == expected[key].shape
+                assert (data == expected[key]).all()
+            assert not hdul[1]._data_loaded
+
+            assert_raises(IndexError, section.__getitem__, (3, 0, 0))
+            assert_raises(IndexError, section.__getitem__, (0, 0, 0, 0))
+
+            # Once the data is loaded the section uses it directly
+            hdul[1].data[0, 0, 0] = 42
+            assert section[0, 0, 0] == 42
+
+    def test_comp_image_section_tile_cache(self):
+        """
+        Tests slices of CompImageHDU.section with the decompressed tile cache
+        enabled.
+        """
+
+        cube = np.arange(3 * 70 * 90, dtype=np.int32).reshape((3, 70, 90))
+        hdu = fits.CompImageHDU(cube, tile_size=[16, 16, 1])
+        hdu.header['BSCALE'] = 2.0
+        hdu.header['BZERO'] = 10.0
+        hdu.writeto(self.temp('test.fits'))
+
+        with fits.open(self.temp('test.fits')) as hdul:
+            expected = hdul[1].data.copy()
+
+        keys = [(1, slice(5, 50), slice(3, 80, 7)), -1, (1, 69, 89),
+                (Ellipsis, 5), (slice(None, None, -1), slice(60, 2, -3), 3),
+                (2, [3, 1, 50]), (slice(None), slice(None, None, 20), 0),
+                slice(1, 1), Ellipsis, (1, slice(5, 50), slice(3, 80, 7))]
+
+        # Each tile is 16 x 16 int32 pixels
+        tile_nbytes = 16 * 16 * 4
+
+        fits.COMPRESSION_TILE_CACHE_SIZE = 10 * tile_nbytes
+        with fits.open(self.temp('test.fits')) as hdul:
+            hdu = hdul[1]
+            assert hdu.tile_cache_size == 10 * tile_nbytes
+            for key in keys:
+                data = hdu.section[key]
+                assert data.dtype == expected[key].dtype
+                assert data.shape == expected[key].shape
+                assert (data == expected[key]).all()
+                assert 0 < hdu._tile_cache.nbytes <= hdu.tile_cache_size
+            assert not hdu._data_loaded
+
+            # Only the tiles containing selected pixels are decompressed
+            hdu.tile_cache_size = 0
+            hdu.tile_cache_size = 100 * tile_nbytes
+            hdu.section[:, 0, ::20]
+            assert sorted(hdu._tile_cache._tiles) == [
+                (0, 0, 0), (0, 0, 1), (0, 0, 2), (0, 0, 3), (0, 0, 5),
+                (1, 0, 0), (1, 0, 1), (1, 0, 2), (1, 0, 3), (1, 0, 5),
+                (2, 0, 0), (2, 0, 1), (2, 0, 2), (2, 0, 3), (2, 0, 5)]
+
+            # The least recently used tiles are evicted first
+            hdu.section[0, 0, 0]
+            hdu.tile_cache_size = 2 * tile_nbytes
+            assert sorted(hdu._tile_cache._tiles) == [(0, 0, 0), (2, 0, 5)]
+
+            # Replacing the compressed data clears the cache
+            hdu.compressed_data = fits.CompImageHDU(
+                cube[::-1], tile_size=[16, 16, 1]).compressed_data
+            assert hdu.section[0, 0, 0] == 2 * cube[2, 0, 0] + 10
+            assert sorted(hdu._tile_cache._tiles) == [(0, 0, 0)]
+
+    def test_comp_image_decompress_out(self):
+        """
+        Tests decompressing images into a preallocated output array with
+        CompImageHDU.decompress_data.
+        """
+
+        from ..hdu import compressed
+
+        rng = np.random.RandomState(0)
+        data = (rng.rand(50, 70) * 1000).astype(np.int16)
+        data[3, 4:9] = -1
+        hdul = fits.HDUList([fits.PrimaryHDU()])
+        hdul.append(fits.CompImageHDU(data, tile_size=[70, 4]))
+        hdu = fits.CompImageHDU(data, tile_size=[70, 4])
+        hdu.header['BSCALE'] = 2.0
+        hdu.header['BZERO'] = 0.5
+        hdu.header['BLANK'] = -1
+        hdul.append(hdu)
+        data8 = (rng.rand(50, 70) * 255).astype(np.uint8)
+        hdul.append(fits.CompImageHDU(data8, tile_size=[70, 4]))
+        hdul.writeto(self.temp('test.fits'))
+
+        orig_chunk_size = compressed._DECOMPRESS_CHUNK_SIZE
+        try:
+            # Decompress scaled images in several bands of tiles
+            compressed._DECOMPRESS_CHUNK_SIZE = 70 * 10 * 2
+            with fits.open(self.temp('test.fits')) as hdul:
+                for hdu, dtype in ((hdul[1], np.int16),
+                                   (hdul[2], np.float32),
+                                   (hdul[3], np.uint8)):
+                    cube = np.zeros((3,) + data.shape, dtype=dtype)
+                    out = cube[1]
+                    assert hdu.decompress_data(out) is out
+                    assert not hdu._data_loaded
+                    assert (cube[[0, 2]] == 0).all()
+                    expected = hdu.data
+                    assert expected.dtype == dtype
+                    for result in (out, hdu.decompress_data()):
+                        assert ((result == expected) |
+                                (np.isnan(result) & np.isnan(expected))).all()
+
+                assert np.isnan(hdul[2].data[3, 4:9]).all()
+                assert (hdul[3].data == data8).all()
+
+                assert_raises(TypeError, hdul[2].decompress_data,
+                              np.empty(data.shape, dtype=np.float64))
+                assert_raises(ValueError, hdul[2].decompress_data,
+                              np.empty((50, 71), dtype=np.float32))
+                assert_raises(ValueError, hdul[2].decompress_data,
+                              np.empty((70, 50), dtype=np.float32).T)
+        finally:
+            compressed._DECOMPRESS_CHUNK_SIZE = orig_chunk_size
+
+    def test_comp_image_threads(self):
+        """
+        Tests that compressing an image in multiple threads gives exactly the
+        same file as compressing it in one.
+        """
+
+        rng = np.random.RandomState(0)
+        ints = (rng.rand(61, 5, 70) * 1000).astype(np.int32)
+        floats = rng.rand(203, 100).astype(np.float32)
+        argslist = [
+            (ints, dict(compression_type='RICE_1', tile_size=[16, 5, 4])),
+            (ints, dict(compression_type='GZIP_1', tile_size=[70, 1, 1])),
+            (floats, dict(compression_type='RICE_1', tile_size=[32, 7],
+                          quantize_method=SUBTRACTIVE_DITHER_1,
+                          dither_seed=9999)),
+            (floats, dict(compression_type='HCOMPRESS_1',
+                          tile_size=[100, 10]))
+        ]
+
+        for data, kwargs in argslist:
+            output = []
+            for threads in (1, 3, 100):
+                fits.COMPRESSION_THREADS = threads
+                hdu = fits.CompImageHDU(data, **kwargs)
+                hdu.writeto(self.temp('test.fits'), clobber=True)
+                with open(self.temp('test.fits'), 'rb') as f:
+                    output.append(f.read())
+            assert output[0] == output[1] == output[2]
+
+            with fits.open(self.temp('test.fits')) as hdul:
+                if data.dtype.kind == 'i':
+                    assert (hdul[1].data == data).all()
+                else:
+                    assert np.allclose(hdul[1].data, data, atol=0.05)
+
+    def test_comp_image_threads_decompress(self):
+        """
+        Tests that decompressing an image in multiple threads gives the same
+        data as decompressing it in one.
+        """
+
+        rng = np.random.RandomState(0)
+        argslist = [
+            ((rng.rand(61, 5, 70) * 1000).astype(np.int32),
+             dict(compression_type='RICE_1', tile_size=[16, 5, 4])),
+            ((rng.rand(61, 70) * 1000).astype(np.int16),
+             dict(compression_type='PLIO_1', tile_size=[70, 3])),
+            (rng.rand(203, 100).astype(np.float32),
+             dict(compression_type='GZIP_1', tile_size=[32, 7],
+                  quantize_method=SUBTRACTIVE_DITHER_1, dither_seed=42)),
+            (rng.rand(203, 100).astype(np.float32),
+             dict(compression_type='HCOMPRESS_1', tile_size=[100, 10])),
+            ((rng.rand(61, 70) * 255).astype(np.uint8),
+             dict(compression_type='RICE_1', tile_size=[70, 3]))
+        ]
+
+        for data, kwargs in argslist:
+            fits.CompImageHDU(data, **kwargs).writeto(self.temp('test.fits'),
+                                                      clobber=True)
+            output = []
+            for threads in (1, 3, 100):
+                fits.COMPRESSION_THREADS = threads
+                with fits.open(self.temp('test.fits')) as hdul:
+                    output.append(hdul[1].data.copy())
+            assert output[0].dtype == output[1].dtype == output[2].dtype
+            assert (output[0] == output[1]).all()
+            assert (output[0] == output[2]).all()
+
+        # BITPIX 8 images are lossless
+        assert output[0].dtype == np.uint8
+        assert (output[0] == data).all()
+
+    def test_streaming_comp_image(self):
+        """
+        Tests that streaming an image in strips of rows to a
+        StreamingCompImageHDU gives the same compressed data as compressing
+        the whole image with a CompImageHDU.
+        """
+
+        rng = np.random.RandomState(0)
+        argslist = [
+            ((rng.rand(61, 5, 70) * 1000).astype(np.int32),
+             dict(compression_type='RICE_1', tile_size=[16, 5, 4])),
+            ((rng.rand(61, 70) * 1000).astype(np.int16),
+             dict(compression_type='PLIO_1', tile_size=[70, 3])),
+            (rng.rand(203, 100).astype(np.float32),
+             dict(compression_type='GZIP_1', tile_size=[32, 7],
+                  quantize_method=SUBTRACTIVE_DITHER_1,
+                  dither_seed=DITHER_SEED_CHECKSUM))
+        ]
+
+        for data, kwargs in argslist:
+            hdu = fits.CompImageHDU(data, **kwargs)
+            hdu.writeto(self.temp('test.fits'), clobber=True)
+
+            for threads in (1, 3):
+                fits.COMPRESSION_THREADS = threads
+                header = fits.ImageHDU(data).header
+                shdu = fits.StreamingCompImageHDU(self.temp('stream.fits'),
+                                                  header, **kwargs)
+                # Write the rows in big-endian order, in strips that don't
+                # line up with the tiles
+                swapped = data.byteswap().newbyteorder()
+                for start in range(0, len(data), 11):
+                    assert not shdu.writecomplete
+                    shdu.write(swapped[start:start + 11])
+                assert shdu.writecomplete
+                assert_raises(IOError, shdu.write, data[:1])
+                shdu.close()
+
+                with fits.open(self.temp('test.fits')) as hdul1:
+                    with fits.open(self.temp('stream.fits')) as hdul2:
+                        assert len(hdul2) == 2
+                        for key in ('PCOUNT', 'NAXIS2', 'ZDITHER0', 'TFORM1',
+                                    'TFORM2'):
+                            assert (hdul1[1]._header.get(key) ==
+                                    hdul2[1]._header.get(key))
+                        # The length of the longest compressed tile
+                        assert hdul2[1]._header['TFORM1'].endswith(')')
+                        assert (hdul1[1].compressed_data.tostring() ==
+                                hdul2[1].compressed_data.tostring())
+                        assert (hdul1[1].data == hdul2[1].data).all()
+                os.remove(self.temp('stream.fits'))
+
+    def test_streaming_comp_image_wrong_data(self):
+        """
+        Tests that data of the wrong shape or type can't be written to a
+        StreamingCompImageHDU.
+        """
+
+        header = fits.ImageHDU(np.zeros((10, 20), dtype=np.int16)).header
+        with fits.StreamingCompImageHDU(self.temp('stream.fits'),
+                                        header) as shdu:
+            assert_raises(ValueError, shdu.write,
+                          np.zeros((2, 10), dtype=np.int16))
+            assert_raises(TypeError, shdu.write,
+                          np.zeros((2, 20), dtype=np.int32))
+            assert_raises(IOError, shdu.write,
+                          np.zeros((11, 20), dtype=np.int16))
+            # A single row may be written without the first axis
+            shdu.write(np.arange(20, dtype=np.int16))
+            assert shdu.write(np.ones((9, 20), dtype=np.int16))
+
+        with fits.open(self.temp('stream.fits')) as hdul:
+            assert (hdul[1].data[0] == np.arange(20)).all()
+            assert (hdul[1].data[1:] == 1).all()
+
     def test_subtractive_dither_seed(self):
         """
         Regression test for https://github.com/spacetelescope/PyFITS/issues/32
@@ -1,7 +1,7 @@
 from __future__ import division, with_statement
 
 from distutils.version import LooseVersion as V
-from warnings import catch_warnings
+from warnings import catch_warnings, simplefilter
 
 import contextlib
 import copy
@@ -23,6 +23,7 @@ from ..extern.six.moves import cPickle as pickle
 
 import pyfits as fits
 from ..column import Delayed, NUMPY2FITS
+from ..fitsrec import _common_record_array, _FILL_BLOCK_SIZE
 from ..util import decode_ascii
 from ..verify import VerifyError
 from . import PyfitsTestCase
@@ -2159,6 +2160,118 @@ class TestTableFunctions(PyfitsTestCase):
                 "the header may be missing the necessary TNULL1 "
                 "keyword or the table contains invalid data")
 
+    def test_ascii_table_numeric_columns(self):
+        """
+        Tests parsing numeric ASCII table columns in various forms, and
+        formatting numeric columns back to ASCII.
+        """
+
+        c1 = fits.Column('I1', 'A6', null='***', ascii=True,
+                         array=np.array(['  12', '-345', '+7', ' 0012',
+                                         '***', '0']))
+        c2 = fits.Column('D1', 'A10', ascii=True,
+                         array=np.array(['1.5D3', '-2.25', '1E-2', '  7.',
+                                         '0', '3.0D+00']))
+        table = fits.TableHDU.from_columns([c1, c2])
+        table.writeto(self.temp('test.fits'))
+
+        with fits.open(self.temp('test.fits'), mode='update') as h:
+            h[1].header['TFORM1'] = 'I6'
+            h[1].header['TFORM2'] = 'D10.3'
+
+        with fits.open(self.temp('test.fits')) as h:
+            assert h[1].data['I1'].dtype == np.int32
+            assert (h[1].data['I1'] == [12, -345, 7, 12, 0, 0]).all()
+            assert (h[1].data['D1'] ==
+                    [1500.0, -2.25, 0.01, 7.0, 0.0, 3.0]).all()
+
+        c1 = fits.Column('I1', 'I5', array=[1, -23, 456, 0, -9999])
+        c2 = fits.Column('F1', 'F6.0', array=[3., -12., 4.4, 0., 5.])
+        table = fits.TableHDU.from_columns([c1, c2])
+        table.writeto(self.temp('test2.fits'))
+        raw = table.data._get_raw_field('I1')
+        assert (np.char.strip(raw) ==
+                [b'1', b'-23', b'456', b'0', b'-9999']).all()
+        raw = table.data._get_raw_field('F1')
+        assert (np.char.strip(raw) == [b'3.', b'-12.', b'4.', b'0.',
+                                       b'5.']).all()
+
+        with fits.open(self.temp('test2.fits')) as h:
+            assert (h[1].data['I1'] == [1, -23, 456, 0, -9999]).all()
+            assert (h[1].data['F1'] == [3., -12., 4., 0., 5.]).all()
+
+        # Values too wide for the column
+        table.data['I1'][0] = 123456
+        assert_raises(ValueError, table.writeto, self.temp('test3.fits'))
+
+    def test_from_columns_record_array(self):
+        """
+        Tests creating a table from the columns of an existing record array,
+        which copies the records wholesale, against the same table built
+        with ``np.rec.fromarrays``.
+        """
+
+        a = np.arange(10, dtype=np.int16)
+        b = np.array(['a%d' % idx for idx in range(10)], dtype='S5')
+        c = np.arange(30, dtype=np.float64).reshape(10, 3)
+        dtype = [('a', 'i2'), ('b', 'S5'), ('c', 'f8', (3,))]
+        arr = np.rec.fromarrays([a, b, c], dtype=dtype)
+
+        # The records are copied wholesale
+        assert _common_record_array(fits.ColDefs(arr)) is not None
+
+        data = fits.FITS_rec.from_columns(arr)
+        expected = np.rec.fromarrays([a, b, c], dtype=dtype)
+        assert comparerecords(data, expected)
+        assert not np.may_share_memory(data, arr)
+
+        # Modifying the new table leaves the original alone
+        data['a'][0] = 100
+        assert arr['a'][0] == 0
+
+        # Columns from a slice of the array, into a longer table
+        data = fits.FITS_rec.from_columns(arr[2:5], nrows=5)
+        assert (data['a'] == [2, 3, 4, 0, 0]).all()
+        assert (data['b'] == ['a2', 'a3', 'a4', '', '']).all()
+        assert (data['c'][:3] == c[2:5]).all()
+        assert (data['c'][3:] == 0).all()
+
+        # Columns that need conversion still go column by column
+        arr = np.rec.fromarrays([a, a.astype(np.uint16), a > 4],
+                                names='a,u,l')
+        assert _common_record_array(fits.ColDefs(arr)) is None
+        hdu = fits.BinTableHDU.from_columns(arr)
+        assert hdu.columns['u'].bzero == 32768
+        assert (hdu.data['u'] == a).all()
+        assert (hdu.data['l'] == (a > 4)).all()
+
+    def test_from_columns_separate_arrays(self):
+        """
+        Tests creating a table from separate column arrays spanning several
+        of the blocks of rows they are copied in.
+        """
+
+        nrows = 3 * (_FILL_BLOCK_SIZE // 22) + 17
+        a = np.arange(nrows, dtype=np.int16)
+        b = np.arange(2 * nrows, dtype=np.float64).reshape(nrows, 2)
+        c = np.arange(nrows, dtype=np.float32) / 2
+        cols = [fits.Column(name='a', format='I', array=a),
+                fits.Column(name='b', format='2D', array=b),
+                fits.Column(name='c', format='E', array=c)]
+
+        data = fits.FITS_rec.from_columns(cols)
+        assert data.itemsize == 22
+        assert (data['a'] == a).all()
+        assert (data['b'] == b).all()
+        assert (data['c'] == c).all()
+
+        # A shorter column is padded out to the length of the table
+        cols[2] = fits.Column(name='c', format='E', array=c[:100])
+        data = fits.FITS_rec.from_columns(cols)
+        assert (data['a'] == a).all()
+        assert (data['c'][:100] == c[:100]).all()
+        assert (data['c'][100:] == 0).all()
+
     def test_column_array_type_mismatch(self):
         """Regression test for https://aeon.stsci.edu/ssb/trac/pyfits/ticket/218"""
 
@@ -2166,6 +2279,26 @@ class TestTableFunctions(PyfitsTestCase):
         col = fits.Column('mag', format='E', array=arr)
         assert (arr == col.array).all()
 
+    def test_scaled_float_column(self):
+        """
+        Tests that floating point values given for an integer column with
+        TSCALn/TZEROn are scaled to the stored integers when the table is
+        written, rather than truncated to integers first.
+        """
+
+        values = np.arange(6) / 2.0 + 10
+        col = fits.Column('B', format='I', bscale=0.5, bzero=10,
+                          array=values)
+        assert (col.array == values).all()
+
+        tbhdu = fits.BinTableHDU.from_columns([col])
+        assert (tbhdu.data['B'] == values).all()
+        tbhdu.writeto(self.temp('test.fits'))
+
+        with fits.open(self.temp('test.fits')) as h:
+            assert (h[1].data._get_raw_field('B') == np.arange(6)).all()
+            assert (h[1].data['B'] == values).all()
+
     def test_table_none(self):
         """Regression test
         for https://github.com/spacetelescope/PyFITS/issues/27
@@ -2394,6 +2527,241 @@ class TestTableFunctions(PyfitsTestCase):
             assert hdul[1].header['TDIM1'] == '(3,3,2)'
             assert np.all(hdul[1].data['a'][0] == expected)
 
+    def test_packed_bit_columns(self):
+        """
+        Tests reading, updating and copying X format columns both unpacked to
+        Boolean arrays and, with pyfits.PACK_BIT_COLUMNS, kept packed.
+        """
+
+        bits = np.random.RandomState(0).randint(0, 2, (10, 21)).astype(bool)
+        c = fits.Column('flags', format='21X', array=bits)
+        tbhdu = fits.BinTableHDU.from_columns([c])
+        assert (tbhdu.data['flags'] == bits).all()
+        raw = tbhdu.data._get_raw_field('flags')
+        assert raw.shape == (10, 3)
+        assert (raw == np.packbits(bits, axis=1)).all()
+        tbhdu.writeto(self.temp('test.fits'))
+
+        fits.PACK_BIT_COLUMNS = True
+        try:
+            with fits.open(self.temp('test.fits'), mode='update') as h:
+                flags = h[1].data['flags']
+                assert isinstance(flags, fits.column._PackedBits)
+                assert (flags[:] == bits).all()
+                assert (flags[3] == bits[3]).all()
+                assert (flags[2:5, 7] == bits[2:5, 7]).all()
+                assert (h[1].data[4]['flags'] == bits[4]).all()
+                assert (h[1].data[1:3]['flags'][1] == bits[2]).all()
+
+                # The packed column behaves like the unpacked Boolean array
+                assert flags.shape == bits.shape
+                assert h[1].data[1:3]['flags'].shape == (2, 21)
+                assert (flags == bits).all()
+                assert not (flags != bits).any()
+                assert flags.sum() == bits.sum()
+
+                flags[3, 20] = not bits[3, 20]
+                h[1].data[5]['flags'] = ~bits[5]
+                bits[3, 20] = not bits[3, 20]
+                bits[5] = ~bits[5]
+                assert (flags[:] == bits).all()
+
+                # In-place operations pack their results into the table
+                flags ^= np.eye(10, 21, dtype=bool)
+                bits ^= np.eye(10, 21, dtype=bool)
+                assert (flags == bits).all()
+
+                # Copying the column copies its packed bits verbatim
+                tbhdu2 = fits.BinTableHDU.from_columns(h[1].columns)
+                assert (tbhdu2.data['flags'][:] == bits).all()
+        finally:
+            fits.PACK_BIT_COLUMNS = False
+
+        with fits.open(self.temp('test.fits')) as h:
+            assert (h[1].data['flags'] == bits).all()
+
+    def test_read_columns(self):
+        """
+        Tests reading only some of the columns of a table, with
+        ``BinTableHDU.read_columns`` and ``getdata(columns=...)``.
+        """
+
+        nrows = 50
+        arrays = [np.arange(n % 4) for n in range(nrows)]
+        c1 = fits.Column('A', format='J', array=np.arange(nrows))
+        c2 = fits.Column('B', format='I', bscale=0.5, bzero=10,
+                         array=np.arange(nrows) / 2.0 + 10)
+        c3 = fits.Column('C', format='10A',
+                         array=['row %d' % idx for idx in range(nrows)])
+        c4 = fits.Column('D', format='PJ()', array=arrays)
+        tbhdu = fits.BinTableHDU.from_columns([c1, c2, c3, c4])
+        tbhdu.writeto(self.temp('test.fits'))
+        tbhdu.writeto(self.temp('test.fits.gz'))
+
+        def check(data):
+            assert data.names == ['D', 'B', 'A']
+            assert (data['A'] == np.arange(nrows)).all()
+            assert (data['B'] == np.arange(nrows) / 2.0 + 10).all()
+            for row, arr in zip(data['D'], arrays):
+                assert (row == arr).all()
+
+        block_size = fits.hdu.table._READ_COLUMNS_BLOCK_SIZE
+        try:
+            # Read the table in several blocks of rows
+            fits.hdu.table._READ_COLUMNS_BLOCK_SIZE = 100
+            for filename in ('test.fits', 'test.fits.gz'):
+                for memmap in (True, False):
+                    data = fits.getdata(self.temp(filename), memmap=memmap,
+                                        columns=['D', 'b', 'A'])
+                    check(data)
+        finally:
+            fits.hdu.table._READ_COLUMNS_BLOCK_SIZE = block_size
+
+        with fits.open(self.temp('test.fits')) as h:
+            data = h[1].read_columns(['D', 'B', 'A'])
+            assert not h[1]._data_loaded
+            check(data)
+
+            # Changes to the loaded data are included
+            h[1].data['C'][0] = 'changed'
+            h[1].data['B'][1] = 12.5
+            data = h[1].read_columns(['C', 'B'])
+            assert data['C'][0] == 'changed'
+            assert data['B'][1] == 12.5
+
+            assert_raises(KeyError, h[1].read_columns, ['E'])
+
+        assert_raises(TypeError, fits.getdata, self.data('test0.fits'),
+                      columns=['A'])
+
+    def test_iter_rows(self):
+        """
+        Tests iterating over a table in blocks of rows with
+        ``BinTableHDU.iter_rows``.
+        """
+
+        nrows = 50
+        arrays = [np.arange(n % 4) + n for n in range(nrows)]
+        bits = np.arange(nrows * 3).reshape((nrows, 3)) % 2 == 0
+        c1 = fits.Column('A', format='J', array=np.arange(nrows))
+        c2 = fits.Column('B', format='I', bscale=0.5, bzero=10,
+                         array=np.arange(nrows) / 2.0 + 10)
+        c3 = fits.Column('C', format='3X', array=bits)
+        c4 = fits.Column('D', format='PJ()', array=arrays)
+        tbhdu = fits.BinTableHDU.from_columns([c1, c2, c3, c4])
+        tbhdu.writeto(self.temp('test.fits'))
+        tbhdu.writeto(self.temp('test.fits.gz'))
+
+        def check(hdu, columns=None):
+            start = 0
+            for block in hdu.iter_rows(chunk_rows=7, columns=columns):
+                stop = start + len(block)
+                assert len(block) == min(7, nrows - start)
+                assert (block['A'] == np.arange(start, stop)).all()
+                if columns is None:
+                    assert (block['B'] ==
+                            np.arange(start, stop) / 2.0 + 10).all()
+                    assert (block['C'] == bits[start:stop]).all()
+                for row, arr in zip(block['D'], arrays[start:stop]):
+                    assert (row == arr).all()
+                start = stop
+            assert start == nrows
+
+        for filename in ('test.fits', 'test.fits.gz'):
+            with fits.open(self.temp(filename), memmap=False) as h:
+                check(h[1])
+                check(h[1], columns=['D', 'A'])
+                assert not h[1]._data_loaded
+                h[1].data
+                check(h[1])
+
+        with fits.open(self.temp('test.fits')) as h:
+            assert_raises(ValueError, h[1].iter_rows, 0)
+
+    def test_write_native_table_unmodified(self):
+        """
+        Tests that writing a table in native byte order swaps it to
+        big-endian a block of rows at a time without modifying the table.
+        """
+
+        nrows = 50
+        arrays = [np.arange(n % 4, dtype=np.int32) for n in range(nrows)]
+        c1 = fits.Column('A', format='J', array=np.arange(nrows))
+        c2 = fits.Column('B', format='2D',
+                         array=np.arange(nrows * 2.0).reshape(nrows, 2))
+        c3 = fits.Column('C', format='5A',
+                         array=['r%d' % idx for idx in range(nrows)])
+        c4 = fits.Column('D', format='PJ()', array=arrays)
+        tbhdu = fits.BinTableHDU.from_columns([c1, c2, c3, c4])
+        raw = tbhdu.data.view(np.ndarray).copy()
+
+        block_size = fits.hdu.table._BYTESWAP_BLOCK_SIZE
+        try:
+            fits.hdu.table._BYTESWAP_BLOCK_SIZE = 100
+            tbhdu.writeto(self.temp('test.fits'), checksum=True)
+        finally:
+            fits.hdu.table._BYTESWAP_BLOCK_SIZE = block_size
+
+        assert tbhdu.data.dtype == raw.dtype
+        assert (tbhdu.data.view(np.ndarray).view(np.uint8) ==
+                raw.view(np.uint8)).all()
+        for row, arr in zip(tbhdu.data['D'], arrays):
+            assert row.dtype == arr.dtype
+            assert (row == arr).all()
+
+        with catch_warnings(record=True) as w:
+            simplefilter('always')
+            with fits.open(self.temp('test.fits'), checksum=True) as h:
+                assert 'CHECKSUM' in h[1].header
+                assert (h[1].data['A'] == np.arange(nrows)).all()
+                assert (h[1].data['B'] ==
+                        np.arange(nrows * 2.0).reshape(nrows, 2)).all()
+                assert (h[1].data['C'] == tbhdu.data['C']).all()
+                for row, arr in zip(h[1].data['D'], arrays):
+                    assert (row == arr).all()
+
+        assert not [x for x in w if 'verification failed' in str(x.message)]
+
+    def test_write_unicode_columns(self):
+        """
+        Tests writing a table from a record array with unicode columns, which
+        are encoded to ASCII a block of rows at a time.
+        """
+
+        nrows = 50
+        arr = np.zeros(nrows, dtype=[('A', 'i4'), ('B', 'U5'), ('C', 'f8'),
+                                     ('D', 'U3')])
+        arr['A'] = np.arange(nrows)
+        arr['B'] = ['r%d' % idx for idx in range(nrows)]
+        arr['C'] = np.arange(nrows) / 2.0
+        arr['D'] = 'xyz'
+        tbhdu = fits.BinTableHDU(data=arr)
+
+        block_size = fits.hdu.table._BYTESWAP_BLOCK_SIZE
+        try:
+            fits.hdu.table._BYTESWAP_BLOCK_SIZE = 100
+            tbhdu.writeto(self.temp('test.fits'), checksum=True)
+        finally:
+            fits.hdu.table._BYTESWAP_BLOCK_SIZE = block_size
+
+        assert (arr['B'][:2] == ['r0', 'r1']).all()
+
+        with catch_warnings(record=True) as w:
+            simplefilter('always')
+            with fits.open(self.temp('test.fits'), checksum=True) as h:
+                assert h[1].header['NAXIS1'] == 20
+                assert (h[1].data['A'] == np.arange(nrows)).all()
+                assert (h[1].data['B'] == arr['B']).all()
+                assert (h[1].data['C'] == np.arange(nrows) / 2.0).all()
+                assert (h[1].data['D'] == arr['D']).all()
+
+        assert not [x for x in w if 'verification failed' in str(x.message)]
+
+        arr['B'][10] = u'r\xe91'
+        tbhdu = fits.BinTableHDU(data=arr)
+        assert_raises(UnicodeEncodeError, tbhdu.writeto,
+                      self.temp('test2.fits'))
+
     if HAVE_OBJGRAPH:
         def test_reference_leak(self):
             """Regression test for https://github.com/astropy/astropy/pull/520"""
@@ -2687,6 +3055,124 @@ class TestVLATables(PyfitsTestCase):
             for idx in range(1, 3):
                 assert comparerecords(new_hdul[idx].data, t2.data)
 
+    def test_vla_ragged_field(self):
+        """
+        Tests reading VLA columns, including scaled columns, both as object
+        arrays and as flat values and offsets with FITS_rec.ragged_field.
+        """
+
+        arrays = [np.arange(n) for n in (3, 0, 5, 1, 0, 2)]
+        c1 = fits.Column('A', format='PJ()', array=arrays)
+        c2 = fits.Column('B', format='PI()', array=arrays)
+        c3 = fits.Column('C', format='J', array=np.arange(6))
+        fits.BinTableHDU.from_columns([c1, c2, c3]).writeto(
+            self.temp('test.fits'))
+
+        with fits.open(self.temp('test.fits'), mode='update') as h:
+            h[1].header['TSCAL2'] = 2
+            h[1].header['TZERO2'] = 10
+
+        expected = np.concatenate(arrays)
+        with fits.open(self.temp('test.fits')) as h:
+            values, offsets = h[1].data.ragged_field('A')
+            assert offsets.tolist() == [0, 3, 3, 8, 9, 9, 11]
+            assert (values == expected).all()
+            values, offsets = h[1].data.ragged_field('B')
+            assert offsets.tolist() == [0, 3, 3, 8, 9, 9, 11]
+            assert (values == expected * 2 + 10).all()
+            assert_raises(TypeError, h[1].data.ragged_field, 'C')
+
+            assert h[1].data['A'].max == 5
+            for row, arr in zip(h[1].data['B'], arrays):
+                assert (row == arr * 2 + 10).all()
+
+            # Now the values come from the already converted column
+            values, offsets = h[1].data.ragged_field('B')
+            assert offsets.tolist() == [0, 3, 3, 8, 9, 9, 11]
+            assert (values == expected * 2 + 10).all()
+
+        # Arrays stored out of order in the heap
+        with fits.open(self.temp('test.fits')) as h:
+            raw_field = h[1].data._get_raw_field('A')
+            raw_field[:] = raw_field[::-1].copy()
+            for row, arr in zip(h[1].data['A'], arrays[::-1]):
+                assert (row == arr).all()
+            values, offsets = h[1].data.ragged_field('B')
+            assert (values == expected * 2 + 10).all()
+
+    def test_vla_slice(self):
+        """
+        Tests reading VLA columns from a slice of a table whose VLA columns
+        have not been converted yet.
+        """
+
+        arrays = [np.arange(n % 4) + n for n in range(10)]
+        c1 = fits.Column('A', format='J', array=np.arange(10))
+        c2 = fits.Column('B', format='PJ()', array=arrays)
+        fits.BinTableHDU.from_columns([c1, c2]).writeto(self.temp('test.fits'))
+
+        with fits.open(self.temp('test.fits')) as h:
+            data = h[1].data[3:7]
+            for row, arr in zip(data['B'], arrays[3:7]):
+                assert (row == arr).all()
+
+            fits.BinTableHDU(data=h[1].data[5:]).writeto(
+                self.temp('test2.fits'))
+
+        with fits.open(self.temp('test2.fits')) as h:
+            for row, arr in zip(h[1].data['B'], arrays[5:]):
+                assert (row == arr).all()
+
+    def test_vla_from_values_and_offsets(self):
+        """
+        Tests creating VLA columns from flat values and offsets, and writing
+        them to the heap in bulk.
+        """
+
+        values = np.arange(11, dtype=np.int32)
+        offsets = np.array([0, 3, 3, 8, 9, 9, 11])
+        arrays = [values[start:stop]
+                  for start, stop in zip(offsets[:-1], offsets[1:])]
+
+        c1 = fits.Column('A', format='PJ()', array=(values, offsets))
+        c2 = fits.Column('B', format='QD()', array=(values, offsets))
+        c3 = fits.Column('C', format='PJ()', array=arrays)
+        tbhdu = fits.BinTableHDU.from_columns([c1, c2, c3])
+        assert tbhdu.data['A'].max == 5
+        for row, arr in zip(tbhdu.data['B'], arrays):
+            assert row.dtype == np.float64
+            assert (row == arr).all()
+
+        arrays[2] = np.array([5, 4, 3, 2, 1])
+        for name in ('A', 'B', 'C'):
+            tbhdu.data[name][2] = arrays[2]
+        assert_raises(ValueError, tbhdu.data['A'].__setitem__, 2, [1, 2])
+
+        tbhdu.writeto(self.temp('test.fits'), checksum=True)
+        with fits.open(self.temp('test.fits'), checksum=True) as h:
+            assert h[1].header['TFORM1'] == 'PJ(5)'
+            for name in ('A', 'B', 'C'):
+                vals, offs = h[1].data.ragged_field(name)
+                assert offs.tolist() == offsets.tolist()
+                assert (vals == np.concatenate(arrays)).all()
+
+            # Rows past the end of the input are filled with zeros, and a
+            # slice of the table keeps the flat values
+            tbhdu2 = fits.BinTableHDU.from_columns(
+                [fits.Column('A', format='PJ()',
+                             array=h[1].data.ragged_field('A'))], nrows=8)
+            tbhdu2.data = tbhdu2.data[1:]
+            tbhdu2.writeto(self.temp('test2.fits'))
+
+        with fits.open(self.temp('test2.fits')) as h:
+            for row, arr in zip(h[1].data['A'], arrays[1:] + [[0] * 5] * 2):
+                assert (row == arr).all()
+
+        assert_raises(ValueError, fits.Column, 'A', format='PJ()',
+                      array=(values, np.array([0, 3, 2])))
+        assert_raises(ValueError, fits.Column, 'A', format='PJ()',
+                      array=(values, np.array([0, 12])))
+
 
 # These are tests that solely test the Column and ColDefs interfaces and
 # related functionality without directly involving full tables; currently there
@@ -6,6 +6,7 @@ import gzip
 import itertools
 import io
 import mmap
+import multiprocessing
 import os
 import platform
 import signal
@@ -1304,3 +1305,47 @@ def _get_array_mmap(array):
         if isinstance(base.base, mmap.mmap):
             return base.base
         base = base.base
+
+
+def _map_parallel(func, iterable, jobs=1, chunksize=1, ordered=True):
+    """
+    Like ``itertools.imap(func, iterable)``, but if ``jobs`` is greater than
+    one, ``func`` is called in a pool of ``jobs`` worker processes.  If
+    ``jobs`` is `None` or 0 the number of CPUs is used.  The results are
+    yielded in the same order as their arguments, unless ``ordered`` is
+    `False` in which case they are yielded as soon as they are ready.
+
+    ``func`` and its arguments must be picklable in the parallel case (so
+    ``func`` should be a module-level function).
+    """
+
+    if not jobs:
+        jobs = multiprocessing.cpu_count()
+
+    if jobs == 1:
+        for args in iterable:
+            yield func(args)
+        return
+
+    pool = multiprocessing.Pool(jobs)
+    finished = False
+    try:
+        if ordered:
+            imap = pool.imap
+        else:
+            imap = pool.imap_unordered
+
+        for result in imap(func, iterable, chunksize):
+            yield result
+        pool.close()
+        finished = True
+    except Exception:
+        pool.terminate()
+        finished = True
+        raise
+    finally:
+        if not finished:
+            # Interrupted (for example by KeyboardInterrupt), or the caller
+            # stopped iterating before all the results were read
+            pool.terminate()
+        pool.join()
@@ -26,6 +26,8 @@ class _Verify(object):
     Shared methods for verification.
     """
 
+    __slots__ = ()
+
     def run_option(self, option='warn', err_text='', fix_text='Fixed.',
                    fix=None, fixable=True):
         """
@@ -166,7 +166,7 @@ void bitpix_to_datatypes(int bitpix, int* datatype, int* npdatatype) {
     switch (bitpix) {
         case BYTE_IMG:
             *datatype = TBYTE;
-            *npdatatype = NPY_INT8;
+            *npdatatype = NPY_UINT8;
             break;
         case SHORT_IMG:
             *datatype = TSHORT;
@@ -872,7 +872,7 @@ PyObject* compression_compress_hdu(PyObject* self, PyObject* args)
     void* outbuf;
     size_t outbufsize;
 
-    PyArrayObject* indata;
+    PyArrayObject* indata = NULL;
     PyArrayObject* tmp;
     npy_intp znaxis;
     int datatype;
@@ -913,8 +913,19 @@ PyObject* compression_compress_hdu(PyObject* self, PyObject* args)
 
     indata = (PyArrayObject*) PyObject_GetAttrString(hdu, "data");
 
-    fits_write_img(fileptr, datatype, 1, PyArray_SIZE(indata), indata->data,
-                   &status);
+    // Release the GIL while compressing so that separate parts of an image
+    // may be compressed concurrently in multiple threads; the exception is
+    // HCOMPRESS, as CFITSIO's implementation of it keeps its state in static
+    // variables
+    if (Fptr->compress_type == HCOMPRESS_1) {
+        fits_write_img(fileptr, datatype, 1, PyArray_SIZE(indata),
+                       indata->data, &status);
+    } else {
+        Py_BEGIN_ALLOW_THREADS
+        fits_write_img(fileptr, datatype, 1, PyArray_SIZE(indata),
+                       indata->data, &status);
+        Py_END_ALLOW_THREADS
+    }
     if (status != 0) {
         process_status_err(status);
         goto fail;
@@ -1041,8 +1052,17 @@ PyObject* compression_decompress_hdu(PyObject* self, PyObject* args)
     /* Create and allocate a new array for the decompressed data */
     outdata = (PyArrayObject*) PyArray_SimpleNew(zndim, znaxis, npdatatype);
 
-    fits_read_img(fileptr, datatype, 1, arrsize, NULL, outdata->data, &anynul,
-                  &status);
+    // As in compression_compress_hdu the GIL is released while decompressing
+    // except for HCOMPRESS, which is not thread-safe
+    if (fileptr->Fptr->compress_type == HCOMPRESS_1) {
+        fits_read_img(fileptr, datatype, 1, arrsize, NULL, outdata->data,
+                      &anynul, &status);
+    } else {
+        Py_BEGIN_ALLOW_THREADS
+        fits_read_img(fileptr, datatype, 1, arrsize, NULL, outdata->data,
+                      &anynul, &status);
+        Py_END_ALLOW_THREADS
+    }
     if (status != 0) {
         process_status_err(status);
         outdata = NULL;
@@ -1078,6 +1098,172 @@ fail:
 }
 
 
+int get_pixel_sequence(PyObject* seq, int ndim, long* values) {
+    // Converts a Python sequence of ndim integers into the array *values,
+    // returning 0 on success or -1 (with an exception set) on failure.
+
+    PyObject* fast = NULL;
+    int idx;
+
+    fast = PySequence_Fast(seq, "pixel coordinates must be a sequence");
+    if (fast == NULL) {
+        return -1;
+    }
+
+    if (PySequence_Fast_GET_SIZE(fast) != ndim) {
+        PyErr_Format(PyExc_ValueError,
+                     "expected %d pixel coordinates, got %d", ndim,
+                     (int) PySequence_Fast_GET_SIZE(fast));
+        Py_DECREF(fast);
+        return -1;
+    }
+
+    for (idx = 0; idx < ndim; idx++) {
+        values[idx] = PyInt_AsLong(PySequence_Fast_GET_ITEM(fast, idx));
+        if (values[idx] == -1 && PyErr_Occurred()) {
+            Py_DECREF(fast);
+            return -1;
+        }
+    }
+
+    Py_DECREF(fast);
+    return 0;
+}
+
+
+PyObject* compression_decompress_hdu_section(PyObject* self, PyObject* args)
+{
+    // Like compression_decompress_hdu, but only decompresses the section of
+    // the image from the first pixel to the last pixel (inclusive, one-based,
+    // and in FITS axis order) taking every inc-th pixel along each axis.
+    // Only the tiles that overlap the section are decompressed.  If an output
+    // array is given the section is decompressed directly into it; otherwise
+    // a new array is returned.
+    PyObject* hdu;
+    PyObject* first_pixel;
+    PyObject* last_pixel;
+    PyObject* increment;
+    PyObject* out = Py_None;
+    tcolumn* columns = NULL;
+
+    void* inbuf;
+    size_t inbufsize;
+
+    PyArrayObject* outdata = NULL;
+    int datatype;
+    int npdatatype;
+    int zndim;
+    npy_intp shape[MAX_COMPRESS_DIM];
+    long fpixel[MAX_COMPRESS_DIM];
+    long lpixel[MAX_COMPRESS_DIM];
+    long inc[MAX_COMPRESS_DIM];
+    int idx;
+
+    fitsfile* fileptr = NULL;
+    int anynul = 0;
+    int status = 0;
+
+    if (!PyArg_ParseTuple(args, "OOOO|O:compression.decompress_hdu_section",
+                          &hdu, &first_pixel, &last_pixel, &increment, &out))
+    {
+        PyErr_SetString(PyExc_TypeError, "Couldn't parse arguments");
+        return NULL;
+    }
+
+    get_hdu_data_base(hdu, &inbuf, &inbufsize);
+    if (PyErr_Occurred()) {
+        return NULL;
+    } else if (inbufsize == 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    open_from_hdu(&fileptr, &inbuf, &inbufsize, hdu, &columns, READONLY);
+    if (PyErr_Occurred()) {
+        goto fail;
+    }
+
+    bitpix_to_datatypes(fileptr->Fptr->zbitpix, &datatype, &npdatatype);
+    if (PyErr_Occurred()) {
+        goto fail;
+    }
+
+    zndim = fileptr->Fptr->zndim;
+    if (get_pixel_sequence(first_pixel, zndim, fpixel) ||
+            get_pixel_sequence(last_pixel, zndim, lpixel) ||
+            get_pixel_sequence(increment, zndim, inc)) {
+        goto fail;
+    }
+
+    for (idx = 0; idx < zndim; idx++) {
+        if (fpixel[idx] < 1 || lpixel[idx] < fpixel[idx] ||
+                lpixel[idx] > fileptr->Fptr->znaxis[idx] || inc[idx] < 1) {
+            PyErr_SetString(PyExc_IndexError,
+                            "image section out of range");
+            goto fail;
+        }
+        shape[zndim - idx - 1] =
+            (npy_intp) ((lpixel[idx] - fpixel[idx]) / inc[idx] + 1);
+    }
+
+    if (out == Py_None) {
+        outdata = (PyArrayObject*) PyArray_SimpleNew(zndim, shape,
+                                                     npdatatype);
+        if (outdata == NULL) {
+            goto fail;
+        }
+    } else {
+        if (!PyArray_Check(out) ||
+                !PyArray_EquivTypenums(PyArray_TYPE((PyArrayObject*) out),
+                                       npdatatype) ||
+                !PyArray_ISCARRAY((PyArrayObject*) out) ||
+                !PyArray_ISNOTSWAPPED((PyArrayObject*) out) ||
+                PyArray_NDIM((PyArrayObject*) out) != zndim ||
+                !PyArray_CompareLists(PyArray_DIMS((PyArrayObject*) out),
+                                      shape, zndim)) {
+            PyErr_SetString(PyExc_ValueError,
+                            "output array must be a writeable C-contiguous "
+                            "array of the same shape and type as the image "
+                            "section");
+            goto fail;
+        }
+        Py_INCREF(out);
+        outdata = (PyArrayObject*) out;
+    }
+
+    if (fileptr->Fptr->compress_type == HCOMPRESS_1) {
+        fits_read_subset(fileptr, datatype, fpixel, lpixel, inc, NULL,
+                         PyArray_DATA(outdata), &anynul, &status);
+    } else {
+        Py_BEGIN_ALLOW_THREADS
+        fits_read_subset(fileptr, datatype, fpixel, lpixel, inc, NULL,
+                         PyArray_DATA(outdata), &anynul, &status);
+        Py_END_ALLOW_THREADS
+    }
+    if (status != 0) {
+        process_status_err(status);
+        Py_DECREF(outdata);
+        outdata = NULL;
+    }
+
+fail:
+    if (fileptr != NULL) {
+        status = 1;// Disable header-related errors
+        fits_close_file(fileptr, &status);
+        if (status != 1) {
+            process_status_err(status);
+            Py_XDECREF(outdata);
+            outdata = NULL;
+        }
+    }
+
+    // Clear any messages remaining in CFITSIO's error stack
+    fits_clear_errmsg();
+
+    return (PyObject*) outdata;
+}
+
+
 /* CFITSIO version float as returned by fits_get_version() */
 static double cfitsio_version;
 
@@ -1100,6 +1286,11 @@ void compression_module_init(PyObject* module) {
     PyObject_SetAttrString(module, "CFITSIO_VERSION", tmp);
     Py_XDECREF(tmp);
 
+    /* Initialize the table of random numbers used for dithering up front,
+       rather than lazily the first time it is needed, since the latter is not
+       safe when compressing in multiple threads */
+    fits_init_randoms();
+
     return;
 }
 
@@ -1109,6 +1300,8 @@ static PyMethodDef compression_methods[] =
 {
    {"compress_hdu", compression_compress_hdu, METH_VARARGS},
    {"decompress_hdu", compression_decompress_hdu, METH_VARARGS},
+   {"decompress_hdu_section", compression_decompress_hdu_section,
+    METH_VARARGS},
    {NULL, NULL}
 };
 